@@ -7,7 +7,13 @@ from collections import deque
 import networkx
 from . import Analysis
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from ..errors import SimEngineError, SimMemoryError
+from ..misc.fork_pool import ForkPool
 
 # todo include an explanation of the algorithm
 # todo include a method that detects any change other than constants
@@ -60,22 +66,79 @@ def _get_closest_matches(input_attributes, target_attributes):
     :returns:                   A dictionary of objects in the input_attributes to the closest objects in the
                                 target_attributes.
     """
+    if not target_attributes:
+        return {a: [] for a in input_attributes}
+
+    # many objects share the same attributes, so only compute distances between distinct attribute vectors
+    input_vectors = {}
+    for a, attrs in input_attributes.items():
+        input_vectors.setdefault(attrs, []).append(a)
+    target_vectors = {}
+    for b, attrs in target_attributes.items():
+        target_vectors.setdefault(attrs, []).append(b)
+
+    if numpy is not None and len(input_vectors) * len(target_vectors) >= _NUMPY_MATCHING_THRESHOLD:
+        closest_vectors = _get_closest_vectors_numpy(list(input_vectors), list(target_vectors))
+    else:
+        closest_vectors = _get_closest_vectors(list(input_vectors), list(target_vectors))
+
     closest_matches = {}
+    for vector_a, objects_a in input_vectors.items():
+        best_matches = [b for vector_b in closest_vectors[vector_a] for b in target_vectors[vector_b]]
+        for a in objects_a:
+            closest_matches[a] = list(best_matches)
+
+    return closest_matches
+
+
+# the number of vector pairs above which distances are computed with numpy, if it is available
+_NUMPY_MATCHING_THRESHOLD = 1024
+# the maximum number of elements of the distance tensor computed by numpy at once
+_NUMPY_BATCH_ELEMENTS = 1 << 22
 
-    # for each object in the first set find the objects with the closest target attributes
-    for a in input_attributes:
-        best_dist = float('inf')
+
+def _get_closest_vectors(input_vectors, target_vectors):
+    """
+    :param input_vectors:   A list of distinct attribute tuples.
+    :param target_vectors:  A non-empty list of distinct attribute tuples.
+    :returns:               A dictionary of each input vector to the list of target vectors closest to it.
+    """
+    closest = {}
+    for vector_a in input_vectors:
+        best_dist = None
         best_matches = []
-        for b in target_attributes:
-            dist = _euclidean_dist(input_attributes[a], target_attributes[b])
-            if dist < best_dist:
-                best_matches = [b]
+        for vector_b in target_vectors:
+            # squared distances are exact for integer attributes, and order the same as the distances themselves
+            dist = sum((x - y) * (x - y) for x, y in zip(vector_a, vector_b))
+            if best_dist is None or dist < best_dist:
+                best_matches = [vector_b]
                 best_dist = dist
             elif dist == best_dist:
-                best_matches.append(b)
-        closest_matches[a] = best_matches
+                best_matches.append(vector_b)
+        closest[vector_a] = best_matches
+    return closest
 
-    return closest_matches
+
+def _get_closest_vectors_numpy(input_vectors, target_vectors):
+    """
+    The same as _get_closest_vectors(), but computes the distances with numpy, a batch of input vectors at a time.
+    """
+    # |a - b|^2 = |a|^2 + |b|^2 - 2ab, which turns most of the work into a matrix product. attributes are small
+    # integers, so this is still exact in double precision.
+    matrix_a = numpy.array(input_vectors, dtype=numpy.float64)
+    matrix_b = numpy.array(target_vectors, dtype=numpy.float64)
+    norms_a = (matrix_a * matrix_a).sum(axis=1)
+    norms_b = (matrix_b * matrix_b).sum(axis=1)
+    batch_size = max(1, _NUMPY_BATCH_ELEMENTS // matrix_b.shape[0])
+
+    closest = {}
+    for start in range(0, len(input_vectors), batch_size):
+        batch = matrix_a[start:start + batch_size]
+        dists = norms_a[start:start + batch_size, None] + norms_b[None, :] - 2 * batch.dot(matrix_b.T)
+        rows, cols = numpy.nonzero(dists == dists.min(axis=1)[:, None])
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            closest.setdefault(input_vectors[start + i], []).append(target_vectors[j])
+    return closest
 
 
 # from http://rosettacode.org/wiki/Levenshtein_distance
@@ -343,11 +406,15 @@ class FunctionDiff(object):
     """
     This class computes the a diff between two functions.
     """
-    def __init__(self, function_a, function_b, bindiff=None):
+    def __init__(self, function_a, function_b, bindiff=None, block_matches=None):
         """
-        :param function_a: The first angr Function object to diff.
-        :param function_b: The second angr Function object.
-        :param bindiff:    An optional Bindiff object. Used for some extra normalization during basic block comparison.
+        :param function_a:      The first angr Function object to diff.
+        :param function_b:      The second angr Function object.
+        :param bindiff:         An optional Bindiff object. Used for some extra normalization during basic block
+                                comparison.
+        :param block_matches:   An optional list of matched block addresses, as pairs of (address in function_a,
+                                address in function_b), from a diff of the same two functions that was computed
+                                elsewhere. If given, the diff is not computed again.
         """
         self._function_a = NormalizedFunction(function_a)
         self._function_b = NormalizedFunction(function_b)
@@ -362,7 +429,10 @@ class FunctionDiff(object):
         self._unmatched_blocks_from_a = set()
         self._unmatched_blocks_from_b = set()
 
-        self._compute_diff()
+        if block_matches is None:
+            self._compute_diff()
+        else:
+            self._load_block_matches(block_matches)
 
     @property
     def probably_identical(self):
@@ -712,6 +782,22 @@ class FunctionDiff(object):
         self._unmatched_blocks_from_a = set(x for x in self._function_a.graph.nodes() if x not in matched_a)
         self._unmatched_blocks_from_b = set(x for x in self._function_b.graph.nodes() if x not in matched_b)
 
+    def _load_block_matches(self, block_matches):
+        """
+        Sets the result of the diff from a list of matched block addresses.
+        """
+        self.attributes_a = self._compute_block_attributes(self._function_a)
+        self.attributes_b = self._compute_block_attributes(self._function_b)
+
+        nodes_a = {n.addr: n for n in self._function_a.graph.nodes()}
+        nodes_b = {n.addr: n for n in self._function_b.graph.nodes()}
+        self._block_matches = set((nodes_a[x], nodes_b[y]) for (x, y) in block_matches)
+
+        matched_a = set(x for (x, _) in self._block_matches)
+        matched_b = set(y for (_, y) in self._block_matches)
+        self._unmatched_blocks_from_a = set(x for x in self._function_a.graph.nodes() if x not in matched_a)
+        self._unmatched_blocks_from_b = set(x for x in self._function_b.graph.nodes() if x not in matched_b)
+
     @staticmethod
     def _get_ordered_successors(project, block, succ):
         try:
@@ -837,15 +923,24 @@ class BinDiff(Analysis):
     """
     This class computes the a diff between two binaries represented by angr Projects
     """
-    def __init__(self, other_project, enable_advanced_backward_slicing=False, cfg_a=None, cfg_b=None):
+    def __init__(self, other_project, enable_advanced_backward_slicing=False, cfg_a=None, cfg_b=None,
+                 fast_cfg=False, workers=None):
         """
-        :param other_project: The second project to diff
+        :param other_project:   The second project to diff
+        :param fast_cfg:        Recover the CFGs with CFGFast instead of CFGEmulated, if they are not provided.
+        :param workers:         The number of worker processes used to compute function diffs. Function diffs are
+                                computed in this process if it is None or 1, or if worker processes cannot be forked
+                                on this platform.
         """
         l.debug("Computing cfg's")
 
         back_traversal = not enable_advanced_backward_slicing
 
-        if cfg_a is None:
+        if cfg_a is None and fast_cfg:
+            self.cfg_a = self.project.analyses.CFGFast(normalize=True)
+            self.cfg_b = other_project.analyses.CFGFast(normalize=True)
+
+        elif cfg_a is None:
             #self.cfg_a = self.project.analyses.CFG(resolve_indirect_jumps=True)
             #self.cfg_b = other_project.analyses.CFG(resolve_indirect_jumps=True)
             self.cfg_a = self.project.analyses.CFGEmulated(context_sensitivity_level=1,
@@ -868,6 +963,7 @@ class BinDiff(Analysis):
         self._attributes_a = dict()
         self._attributes_a = dict()
 
+        self._workers = workers
         self._function_diffs = dict()
         self.function_matches = set()
         self._unmatched_functions_from_a = set()
@@ -972,6 +1068,47 @@ class BinDiff(Analysis):
             self._function_diffs[pair] = FunctionDiff(function_a, function_b, self)
         return self._function_diffs[pair]
 
+    def compute_function_diffs(self, pairs):
+        """
+        Compute the diffs of several function pairs at once, using worker processes if this BinDiff was created with
+        more than one worker. The diffs are then returned by get_function_diff() without being computed again.
+
+        :param pairs:   An iterable of (function address in the first binary, function address in the second binary).
+        """
+        pairs = [pair for pair in pairs if pair not in self._function_diffs]
+        if not pairs:
+            return
+
+        if self._workers is None or self._workers <= 1 or len(pairs) <= 1:
+            for function_addr_a, function_addr_b in pairs:
+                self.get_function_diff(function_addr_a, function_addr_b)
+            return
+
+        # the workers are forked, so they inherit both projects and CFGs instead of having to unpickle them
+        with ForkPool(self, workers=min(self._workers, len(pairs))) as pool:
+            chunksize = max(1, len(pairs) // (self._workers * 4))
+            results = list(pool.map(_compute_function_diff_in_worker, pairs, chunksize=chunksize))
+
+        for (function_addr_a, function_addr_b), block_matches in results:
+            if (function_addr_a, function_addr_b) in self._function_diffs:
+                # computed in this process, as forking is not supported
+                continue
+            function_a = self.cfg_a.kb.functions.function(function_addr_a)
+            function_b = self.cfg_b.kb.functions.function(function_addr_b)
+            self._function_diffs[(function_addr_a, function_addr_b)] = FunctionDiff(function_a, function_b, self,
+                                                                                    block_matches=block_matches)
+
+    def _diffable(self, func_a, func_b):
+        """
+        Whether _compute_diff() will compute the diff of a pair of functions when processing it.
+        """
+        if not self.project.loader.main_object.contains_addr(func_a) or \
+                not self._p2.loader.main_object.contains_addr(func_b):
+            return False
+        f_a = self.cfg_a.kb.functions.function(func_a)
+        f_b = self.cfg_b.kb.functions.function(func_b)
+        return f_a is not None and f_b is not None and f_a.startpoint is not None and f_b.startpoint is not None
+
     @staticmethod
     def _compute_function_attributes(cfg):
         """
@@ -1102,6 +1239,11 @@ class BinDiff(Analysis):
 
         # while queue is not empty
         while to_process:
+            if self._workers is not None and self._workers > 1 and to_process[-1] not in self._function_diffs and \
+                    self._diffable(*to_process[-1]):
+                # the diffs of the queued pairs do not depend on each other, so compute them all at once
+                self.compute_function_diffs([pair for pair in reversed(to_process) if self._diffable(*pair)])
+
             (func_a, func_b) = to_process.pop()
             l.debug("Processing (%#x, %#x)", func_a, func_b)
 
@@ -1167,6 +1309,9 @@ class BinDiff(Analysis):
             if (x, y) not in self.function_matches:
                 del self._function_diffs[(x, y)]
 
+        if self._workers is not None and self._workers > 1:
+            self.compute_function_diffs([pair for pair in self.function_matches if self._diffable(*pair)])
+
     @staticmethod
     def _get_function_matches(attributes_a, attributes_b, filter_set_a=None, filter_set_b=None):
         """
@@ -1204,5 +1349,15 @@ class BinDiff(Analysis):
 
         return matches
 
+
+def _compute_function_diff_in_worker(bindiff, pair):
+    """
+    Computes the diff of a pair of functions in a worker process.
+
+    :returns: The pair, and its block matches as pairs of block addresses.
+    """
+    fd = bindiff.get_function_diff(*pair)
+    return pair, [(a.addr, b.addr) for (a, b) in fd.block_matches]
+
 from angr.analyses import AnalysesHub
 AnalysesHub.register_default('BinDiff', BinDiff)
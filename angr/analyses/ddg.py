@@ -2,6 +2,7 @@ import logging
 from collections import defaultdict
 
 import networkx
+from sortedcontainers import SortedDict
 import pyvex
 from . import Analysis
 
@@ -92,21 +93,175 @@ class DDGJob(object):
         return "<DDGJob %s, call_depth %d>" % (self.cfg_node, self.call_depth)
 
 
+class DefinitionRangeMap(object):
+    """
+    A mapping from disjoint ranges of offsets (register offsets or memory addresses) to the code locations that define
+    them. Each range is stored as a single entry, and copies share their storage until one of them is modified.
+    """
+
+    __slots__ = ('_ranges', '_shared', )
+
+    def __init__(self):
+        # start -> (end, frozenset of code locations)
+        self._ranges = SortedDict()
+        self._shared = False
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def copy(self):
+        """
+        Make a copy-on-write copy of this map.
+
+        :return: A new DefinitionRangeMap instance.
+        :rtype: DefinitionRangeMap
+        """
+
+        m = DefinitionRangeMap()
+        m._ranges = self._ranges
+        m._shared = True
+        self._shared = True
+        return m
+
+    def overwrite(self, start, end, location):
+        """
+        Make `location` the only definition of every offset in [start, end).
+
+        :param int start:               The first offset.
+        :param int end:                 The offset after the last one.
+        :param CodeLocation location:   The defining location.
+        :return: None
+        """
+
+        self._make_writable()
+        self._split(start)
+        self._split(end)
+
+        for key in list(self._ranges.irange(start, end, inclusive=(True, False))):
+            del self._ranges[key]
+        self._ranges[start] = (end, frozenset((location, )))
+
+    def add(self, start, end, location):
+        """
+        Add `location` to the definitions of every offset in [start, end).
+
+        :param int start:               The first offset.
+        :param int end:                 The offset after the last one.
+        :param CodeLocation location:   The defining location.
+        :return: True if any of the offsets was not defined by `location` before, False otherwise.
+        :rtype: bool
+        """
+
+        if self._covered_by(start, end, location):
+            return False
+
+        self._make_writable()
+        self._split(start)
+        self._split(end)
+
+        updates = { }
+        pos = start
+        for key in self._ranges.irange(start, end, inclusive=(True, False)):
+            range_end, locs = self._ranges[key]
+            if pos < key:
+                # a gap without any definition
+                updates[pos] = (key, frozenset((location, )))
+            if location not in locs:
+                updates[key] = (range_end, locs | { location })
+            pos = range_end
+        if pos < end:
+            updates[pos] = (end, frozenset((location, )))
+
+        self._ranges.update(updates)
+        return True
+
+    def lookup(self, start, end):
+        """
+        Get all definitions of any offset in [start, end).
+
+        :param int start:   The first offset.
+        :param int end:     The offset after the last one.
+        :return:            A set of code locations.
+        :rtype:             set
+        """
+
+        defs = set()
+        for _, locs in self._overlapping(start, end):
+            defs |= locs
+        return defs
+
+    #
+    # Private methods
+    #
+
+    def _make_writable(self):
+        if self._shared:
+            self._ranges = self._ranges.copy()
+            self._shared = False
+
+    def _overlapping(self, start, end):
+        """
+        Iterate over (range end, locations) of all ranges overlapping with [start, end).
+        """
+
+        for key in self._ranges.irange(maximum=start, reverse=True):
+            range_end, locs = self._ranges[key]
+            if range_end > start:
+                yield range_end, locs
+            break
+        for key in self._ranges.irange(start, end, inclusive=(False, False)):
+            yield self._ranges[key]
+
+    def _covered_by(self, start, end, location):
+        """
+        Check if every offset in [start, end) is already defined by `location`.
+        """
+
+        pos = start
+        for key in self._ranges.irange(maximum=start, reverse=True):
+            range_end, locs = self._ranges[key]
+            if range_end > start:
+                if location not in locs:
+                    return False
+                pos = range_end
+            break
+        for key in self._ranges.irange(start, end, inclusive=(False, False)):
+            range_end, locs = self._ranges[key]
+            if key > pos or location not in locs:
+                return False
+            pos = range_end
+        return pos >= end
+
+    def _split(self, offset):
+        """
+        Make sure no range crosses `offset`.
+        """
+
+        for key in self._ranges.irange(maximum=offset, reverse=True, inclusive=(True, False)):
+            range_end, locs = self._ranges[key]
+            if range_end > offset:
+                self._ranges[key] = (offset, locs)
+                self._ranges[offset] = (range_end, locs)
+            break
+
+
 class LiveDefinitions(object):
     """
     A collection of live definitions with some handy interfaces for definition killing and lookups.
+
+    Definitions of registers and memory are kept as ranges. Branches and copies share all storage with the original
+    until either of them is modified.
     """
     def __init__(self):
         """
         Constructor.
         """
 
-        # byte-to-byte mappings
-        # TODO: make it copy-on-write in order to save memory.
-        # TODO: options are either cooldict.COWDict or a modified version of simuvex.SimPagedMemory
-        self._memory_map = defaultdict(set)
-        self._register_map = defaultdict(set)
-        self._defs = defaultdict(set)
+        self._memory_map = DefinitionRangeMap()
+        self._register_map = DefinitionRangeMap()
+        # variable -> frozenset of code locations
+        self._defs = { }
+        self._defs_shared = False
 
     #
     # Overridden methods
@@ -130,24 +285,21 @@ class LiveDefinitions(object):
         ld = LiveDefinitions()
         ld._memory_map = self._memory_map.copy()
         ld._register_map = self._register_map.copy()
-        ld._defs = self._defs.copy()
+        ld._defs = self._defs
+        ld._defs_shared = True
+        self._defs_shared = True
 
         return ld
 
     def copy(self):
         """
-        Make a hard copy of `self`.
+        Make a copy of `self`. The copy shares its storage with `self` until either of them is modified.
 
         :return: A new LiveDefinition instance.
         :rtype: angr.analyses.ddg.LiveDefinitions
         """
 
-        ld = LiveDefinitions()
-        ld._memory_map = self._memory_map.copy()
-        ld._register_map = self._register_map.copy()
-        ld._defs = self._defs.copy()
-
-        return ld
+        return self.branch()
 
     def add_def(self, variable, location, size_threshold=32):
         """
@@ -168,25 +320,17 @@ class LiveDefinitions(object):
                 return new_defs_added
 
             size = min(variable.size, size_threshold)
-            offset = variable.reg
-            while offset < variable.reg + size:
-                if location not in self._register_map[offset]:
-                    new_defs_added = True
-                self._register_map[offset].add(location)
-                offset += 1
+            if size > 0:
+                new_defs_added = self._register_map.add(variable.reg, variable.reg + size, location)
 
-            self._defs[variable].add(location)
+            self._add_to_defs(variable, location)
 
         elif isinstance(variable, SimMemoryVariable):
             size = min(variable.size, size_threshold)
-            offset = variable.addr
-            while offset < variable.addr + size:
-                if location not in self._memory_map[offset]:
-                    new_defs_added = True
-                self._memory_map[offset].add(location)
-                offset += 1
+            if size > 0:
+                new_defs_added = self._memory_map.add(variable.addr, variable.addr + size, location)
 
-            self._defs[variable].add(location)
+            self._add_to_defs(variable, location)
 
         else:
             l.error('Unsupported variable type "%s".', type(variable))
@@ -227,21 +371,17 @@ class LiveDefinitions(object):
                 return None
 
             size = min(variable.size, size_threshold)
-            offset = variable.reg
-            while offset < variable.reg + size:
-                self._register_map[offset] = { location }
-                offset += 1
+            if size > 0:
+                self._register_map.overwrite(variable.reg, variable.reg + size, location)
 
-            self._defs[variable] = { location }
+            self._set_defs(variable, frozenset((location, )))
 
         elif isinstance(variable, SimMemoryVariable):
             size = min(variable.size, size_threshold)
-            offset = variable.addr
-            while offset < variable.addr + size:
-                self._memory_map[offset] = { location }
-                offset += 1
+            if size > 0:
+                self._memory_map.overwrite(variable.addr, variable.addr + size, location)
 
-            self._defs[variable] = { location }
+            self._set_defs(variable, frozenset((location, )))
 
         else:
             l.error('Unsupported variable type "%s".', type(variable))
@@ -266,19 +406,13 @@ class LiveDefinitions(object):
                 return live_def_locs
 
             size = min(variable.size, size_threshold)
-            offset = variable.reg
-            while offset < variable.reg + size:
-                if offset in self._register_map:
-                    live_def_locs |= self._register_map[offset]
-                offset += 1
+            if size > 0:
+                live_def_locs = self._register_map.lookup(variable.reg, variable.reg + size)
 
         elif isinstance(variable, SimMemoryVariable):
             size = min(variable.size, size_threshold)
-            offset = variable.addr
-            while offset < variable.addr + size:
-                if offset in self._memory_map:
-                    live_def_locs |= self._memory_map[offset]
-                offset += 1
+            if size > 0:
+                live_def_locs = self._memory_map.lookup(variable.addr, variable.addr + size)
 
         else:
             # umm unsupported variable type
@@ -306,6 +440,23 @@ class LiveDefinitions(object):
 
         return self._defs.keys()
 
+    #
+    # Private methods
+    #
+
+    def _set_defs(self, variable, locations):
+        if self._defs_shared:
+            self._defs = self._defs.copy()
+            self._defs_shared = False
+        self._defs[variable] = locations
+
+    def _add_to_defs(self, variable, location):
+        locs = self._defs.get(variable, None)
+        if locs is None:
+            self._set_defs(variable, frozenset((location, )))
+        elif location not in locs:
+            self._set_defs(variable, locs | { location })
+
 
 class DDGViewItem(object):
     def __init__(self, ddg, variable, simplified=False):
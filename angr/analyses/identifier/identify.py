@@ -13,6 +13,7 @@ from .runner import Runner
 from .. import Analysis
 from ... import options
 from ...errors import AngrError, SimSegfaultError, SimEngineError, SimMemoryError, SimError
+from ...misc.fork_pool import ForkPool
 
 l = logging.getLogger(name=__name__)
 
@@ -36,11 +37,52 @@ class FuncInfo(object):
         self.preamble_sp_change = None
 
 
+_signature_shapes = None
+
+
+def _signatures_by_shape():
+    """
+    Group the function signatures by their number of arguments and whether they take varargs, keeping the order of
+    Functions within each group.
+    """
+    global _signature_shapes # pylint:disable=global-statement
+    if _signature_shapes is None:
+        _signature_shapes = defaultdict(list)
+        for name, cls in Functions.items():
+            f = cls()
+            _signature_shapes[(f.num_args(), f.var_args())].append((name, cls))
+        _signature_shapes = dict(_signature_shapes)
+    return _signature_shapes
+
+
+def _identify_func_in_worker(identifier, addr):
+    """
+    Run identify_func() on a function in a worker process.
+
+    :return: The function address and the matching signature object, or None. The object is sent back as is, since
+             matching may have set attributes on it (whether atoi allows negative numbers, the base of based_atoi, ...)
+             that get_name() and the callers of run() rely on.
+    """
+    match = identifier.identify_func(identifier._cfg.functions.function(addr))
+    if match is not None and '_runner' in vars(match):
+        # the runner holds the whole project. the parent process puts its own back.
+        match._runner = None
+    return addr, match
+
+
 class Identifier(Analysis):
 
     _special_case_funcs = ["free"]
 
-    def __init__(self, cfg=None, require_predecessors=True, only_find=None):
+    def __init__(self, cfg=None, require_predecessors=True, only_find=None, workers=None):
+        """
+        :param cfg:                     A CFG of the binary. A CFGFast is generated if it is not provided.
+        :param require_predecessors:    Only consider functions that are called by other functions.
+        :param only_find:               An optional set of names of functions to look for.
+        :param workers:                 The number of worker processes used to test functions in run(). Functions
+                                        are tested in this process if it is None or 1, or if worker processes cannot
+                                        be forked on this platform.
+        """
         # self.project = project
         if not isinstance(self.project.loader.main_object, CGC):
             l.critical("The identifier currently works only on CGC binaries. Results may be completely unexpected.")
@@ -53,6 +95,7 @@ class Identifier(Analysis):
 
         # only find if in this set
         self.only_find = only_find
+        self._workers = workers
 
         # reg list
         a = self.project.arch
@@ -117,10 +160,7 @@ class Identifier(Analysis):
             l.warning("Too large")
             return
 
-        for f in self._cfg.functions.values():
-            if f.is_syscall:
-                continue
-            match = self.identify_func(f)
+        for f, match in self._identify_funcs():
             if match is not None:
                 match_func = match
                 match_name = match_func.get_name()
@@ -181,6 +221,28 @@ class Identifier(Analysis):
         for f in to_remove:
             del self.matches[f]
 
+    def _identify_funcs(self):
+        """
+        Run identify_func() on every function, in worker processes if possible.
+
+        :return: A generator of (function, match or None), in the order of the functions in the CFG.
+        """
+        funcs = [f for f in self._cfg.functions.values() if not f.is_syscall]
+
+        if self._workers is None or self._workers <= 1 or len(funcs) <= 1:
+            for f in funcs:
+                yield f, self.identify_func(f)
+            return
+
+        # set up the base state once, so the forked workers inherit it instead of each building their own
+        self._runner._get_prepared_state()
+
+        with ForkPool(self, workers=self._workers) as pool:
+            for addr, match in pool.map(_identify_func_in_worker, [f.addr for f in funcs]):
+                if match is not None and '_runner' in vars(match):
+                    match._runner = self._runner
+                yield self._cfg.functions.function(addr), match
+
     def can_call_same_name(self, addr, name):
         if addr not in self._cfg.functions.callgraph.nodes():
             return False
@@ -230,7 +292,9 @@ class Identifier(Analysis):
         except NetworkXError:
             calls_other_funcs = False
 
-        for name, f in Functions.items():
+        # only signatures with the right number of arguments and use of varargs can possibly match
+        candidates = _signatures_by_shape().get((len(func_info.stack_args), func_info.var_args), ())
+        for name, f in candidates:
             # check if we should be finding it
             if self.only_find is not None and name not in self.only_find:
                 continue
@@ -240,8 +304,6 @@ class Identifier(Analysis):
             # generate an object of the class
             f = f()
             # test it
-            if f.num_args() != len(func_info.stack_args) or f.var_args() != func_info.var_args:
-                continue
             if calls_other_funcs and not f.can_call_other_funcs():
                 continue
 
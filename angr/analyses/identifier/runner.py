@@ -35,6 +35,8 @@ class Runner(object):
         self.project = project
         self.cfg = cfg
         self.base_state = None
+        # base_state with everything setup_state() does that does not depend on the test, keyed by concrete_rand
+        self._prepared_states = { }
 
     def _get_recv_state(self):
         try:
@@ -102,15 +104,53 @@ class Runner(object):
             l.warning("AngrError in get recv state %s", e)
             return self.project.factory.entry_state()
 
+    def _prepare_state(self, state, concrete_rand=False):
+        """
+        Apply the parts of the test setup which do not depend on the test data to a state, in place.
+        """
+        state.options.add(so.STRICT_PAGE_ACCESS)
+
+        # make sure unicorn will run
+        for k in dir(state.regs):
+            r = getattr(state.regs, k)
+            if r.symbolic:
+                setattr(state.regs, k, 0)
+
+        # syscall hook
+        state.inspect.b(
+            'syscall',
+            BP_BEFORE,
+            action=self.syscall_hook
+        )
+
+        if concrete_rand:
+            state.inspect.b(
+                'syscall',
+                BP_AFTER,
+                action=self.syscall_hook_concrete_rand
+            )
+
+    def _get_prepared_state(self, concrete_rand=False):
+        """
+        Get the base state with the test-independent setup already applied. It is built once and copied for every
+        test, instead of redoing the setup each time.
+        """
+        if concrete_rand not in self._prepared_states:
+            if self.base_state is None:
+                self.base_state = self._get_recv_state()
+            state = self.base_state.copy()
+            self._prepare_state(state, concrete_rand=concrete_rand)
+            self._prepared_states[concrete_rand] = state
+        return self._prepared_states[concrete_rand]
+
     def setup_state(self, function, test_data, initial_state=None, concrete_rand=False):
         # FIXME fdwait should do something concrete...
 
         if initial_state is None:
-            if self.base_state is None:
-                self.base_state = self._get_recv_state()
-            entry_state = self.base_state.copy()
+            entry_state = self._get_prepared_state(concrete_rand=concrete_rand).copy()
         else:
             entry_state = initial_state.copy()
+            self._prepare_state(entry_state, concrete_rand=concrete_rand)
 
         stdin = SimFile('stdin', content=test_data.preloaded_stdin)
         stdout = SimFile('stdout')
@@ -118,14 +158,6 @@ class Runner(object):
         fd = {0: SimFileDescriptor(stdin, 0), 1: SimFileDescriptor(stdout, 0), 2: SimFileDescriptor(stderr, 0)}
         entry_state.register_plugin('posix', SimSystemPosix(stdin=stdin, stdout=stdout, stderr=stderr, fd=fd))
 
-        entry_state.options.add(so.STRICT_PAGE_ACCESS)
-
-        # make sure unicorn will run
-        for k in dir(entry_state.regs):
-            r = getattr(entry_state.regs, k)
-            if r.symbolic:
-                setattr(entry_state.regs, k, 0)
-
         entry_state.unicorn._register_check_count = 100
         entry_state.unicorn._runs_since_symbolic_data = 100
         entry_state.unicorn._runs_since_unicorn = 100
@@ -136,20 +168,6 @@ class Runner(object):
         entry_state.unicorn.cooldown_nonunicorn_blocks = 1
         entry_state.unicorn.max_steps = 10000
 
-        # syscall hook
-        entry_state.inspect.b(
-            'syscall',
-            BP_BEFORE,
-            action=self.syscall_hook
-        )
-
-        if concrete_rand:
-            entry_state.inspect.b(
-                'syscall',
-                BP_AFTER,
-                action=self.syscall_hook_concrete_rand
-            )
-
         # solver timeout
         entry_state.solver._solver.timeout = 500
 
@@ -3,8 +3,11 @@ import logging
 import re
 import string
 import struct
+import heapq
+import io
+from bisect import bisect_right
 from collections import defaultdict
-from itertools import count
+from itertools import count, accumulate
 
 import capstone
 import cffi
@@ -127,6 +130,72 @@ def is_hex(s):
 fill_reg_map()
 
 
+class RegionIndex(object):
+    """
+    A sorted index over a list of (start, end) address ranges, answering membership and proximity queries in
+    logarithmic time.
+    """
+    def __init__(self, regions):
+        """
+        :param list regions: A list of (start, end) tuples. End addresses are exclusive.
+        """
+
+        self.regions = regions
+
+        by_start = sorted(range(len(regions)), key=lambda i: regions[i][0])
+        self._starts = [ regions[i][0] for i in by_start ]
+        self._start_indices = by_start
+        # the largest end address of all regions starting at or before each start address
+        self._max_ends = list(accumulate((regions[i][1] for i in by_start), max))
+
+        by_end = sorted(range(len(regions)), key=lambda i: regions[i][1])
+        self._ends = [ regions[i][1] for i in by_end ]
+        self._end_indices = by_end
+
+    def contains(self, addr):
+        """
+        Check if an address is inside any of the regions.
+
+        :param int addr: The address to check.
+        :return: True if the address is inside a region, False otherwise.
+        :rtype: bool
+        """
+
+        pos = bisect_right(self._starts, addr)
+        return pos > 0 and addr < self._max_ends[pos - 1]
+
+    def limbos_contain(self, addr, tolerance_before, tolerance_after):
+        """
+        Find the region boundary closest to an address that is at most `tolerance_before` bytes before the beginning
+        of a region, or less than `tolerance_after` bytes after the end of a region. Ties are broken in favor of the
+        region that comes first in the region list, and then in favor of region beginnings.
+
+        :param int addr: The address to check.
+        :param int tolerance_before: How far before the beginning of a region the address may be.
+        :param int tolerance_after: How far after the end of a region the address may be.
+        :return: A 2-tuple of (bool, the closest base address)
+        :rtype: tuple
+        """
+
+        candidates = [ ]
+
+        lo = bisect_right(self._starts, addr)
+        hi = bisect_right(self._starts, addr + tolerance_before)
+        for pos in range(lo, hi):
+            start = self._starts[pos]
+            candidates.append((start - addr, self._start_indices[pos], 0, start))
+
+        lo = bisect_right(self._ends, addr - tolerance_after)
+        hi = bisect_right(self._ends, addr)
+        for pos in range(lo, hi):
+            end = self._ends[pos]
+            candidates.append((addr - end, self._end_indices[pos], 1, end))
+
+        if not candidates:
+            return False, None
+        return True, min(candidates)[3]
+
+
 class Label(object):
     g_label_ctr = count()
 
@@ -1050,7 +1119,19 @@ class Procedure(object):
         :rtype: list
         """
 
-        assembly = [ ]
+        assembly = [ (self.addr, self.assembly_header()) ]
+        assembly.extend(self._assembly_blocks(comments=comments, symbolized=symbolized))
+
+        return assembly
+
+    def assembly_header(self):
+        """
+        Get the section directives and the function label that precede the procedure. Generating the header may
+        create the function label.
+
+        :return: The header.
+        :rtype: str
+        """
 
         header = "\t.section\t{section}\n\t.align\t{alignment}\n".format(section=self.section,
                                                  alignment=self.binary.section_alignment(self.section)
@@ -1068,17 +1149,20 @@ class Procedure(object):
                 function_label = self.binary.symbol_manager.new_label(None, name=procedure_name, is_function=True)
             header += str(function_label) + "\n"
 
-        assembly.append((self.addr, header))
+        return header
+
+    def _assembly_blocks(self, comments=False, symbolized=True):
+        """
+        Lazily generate the assembly of the procedure body.
+
+        :return: A generator of tuples (address, basic block assembly), ordered by basic block addresses
+        """
 
         if self.asm_code:
-            s = self.asm_code
-            assembly.append((self.addr, s))
+            yield self.addr, self.asm_code
         elif self.blocks:
             for b in sorted(self.blocks, key=lambda x:x.addr):  # type: BasicBlock
-                s = b.assembly(comments=comments, symbolized=symbolized)
-                assembly.append((b.addr, s))
-
-        return assembly
+                yield b.addr, b.assembly(comments=comments, symbolized=symbolized)
 
     def instruction_addresses(self):
         """
@@ -1671,6 +1755,8 @@ class Reassembler(Analysis):
 
         self._main_executable_regions = None
         self._main_nonexecutable_regions = None
+        self._main_executable_region_index_ = None
+        self._main_nonexecutable_region_index_ = None
 
         self._symbolization_needed = True
 
@@ -1792,6 +1878,18 @@ class Reassembler(Analysis):
 
         return self._main_nonexecutable_regions
 
+    @property
+    def _main_executable_region_index(self):
+        if self._main_executable_region_index_ is None:
+            self._main_executable_region_index_ = RegionIndex(self.main_executable_regions)
+        return self._main_executable_region_index_
+
+    @property
+    def _main_nonexecutable_region_index(self):
+        if self._main_nonexecutable_region_index_ is None:
+            self._main_nonexecutable_region_index_ = RegionIndex(self.main_nonexecutable_regions)
+        return self._main_nonexecutable_region_index_
+
     #
     # Public methods
     #
@@ -1813,10 +1911,8 @@ class Reassembler(Analysis):
         :param addr:
         :return:
         """
-        for start, end in self.main_executable_regions:
-            if start <= addr < end:
-                return True
-        return False
+
+        return self._main_executable_region_index.contains(addr)
 
     def main_executable_region_limbos_contain(self, addr):
         """
@@ -1830,22 +1926,7 @@ class Reassembler(Analysis):
 
         TOLERANCE = 64
 
-        closest_region = None
-        least_limbo = None
-
-        for start, end in self.main_executable_regions:
-            if start - TOLERANCE <= addr < start:
-                if least_limbo is None or start - addr < least_limbo:
-                    closest_region = (True, start)
-                    least_limbo = start - addr
-            if end <= addr < end + TOLERANCE:
-                if least_limbo is None or addr - end < least_limbo:
-                    closest_region = (True, end)
-                    least_limbo = addr - end
-
-        if closest_region is not None:
-            return closest_region
-        return (False, None)
+        return self._main_executable_region_index.limbos_contain(addr, TOLERANCE, TOLERANCE)
 
     def main_nonexecutable_regions_contain(self, addr):
         """
@@ -1854,10 +1935,8 @@ class Reassembler(Analysis):
         :return: True if the address is inside a non-executable region, False otherwise.
         :rtype: bool
         """
-        for start, end in self.main_nonexecutable_regions:
-            if start <= addr < end:
-                return True
-        return False
+
+        return self._main_nonexecutable_region_index.contains(addr)
 
     def main_nonexecutable_region_limbos_contain(self, addr, tolerance_before=64, tolerance_after=64):
         """
@@ -1869,22 +1948,7 @@ class Reassembler(Analysis):
         :rtype: tuple
         """
 
-        closest_region = None
-        least_limbo = None
-
-        for start, end in self.main_nonexecutable_regions:
-            if start - tolerance_before <= addr < start:
-                if least_limbo is None or start - addr < least_limbo:
-                    closest_region = (True, start)
-                    least_limbo = start - addr
-            if end <= addr < end + tolerance_after:
-                if least_limbo is None or addr - end < least_limbo:
-                    closest_region = (True, end)
-                    least_limbo = addr - end
-
-        if closest_region is not None:
-            return closest_region
-        return False, None
+        return self._main_nonexecutable_region_index.limbos_contain(addr, tolerance_before, tolerance_after)
 
     def register_instruction_reference(self, insn_addr, ref_addr, sort, insn_size):
 
@@ -2092,25 +2156,33 @@ class Reassembler(Analysis):
 
     def assembly(self, comments=False, symbolized=True):
 
+        output = io.StringIO()
+        self.write_assembly(output, comments=comments, symbolized=symbolized)
+        return output.getvalue()
+
+    def write_assembly(self, f, comments=False, symbolized=True):
+        """
+        Write the assembly of the binary to a file-like object. Procedures and data are generated and written one piece
+        at a time, so the complete assembly is never held in memory. The output is identical to `assembly()`.
+
+        :param f:               A file-like object opened in text mode.
+        :param bool comments:   Output debugging comments.
+        :param bool symbolized: Output symbolized assembly.
+        :return: None
+        """
+
         if symbolized and self._symbolization_needed:
             self.symbolize()
 
         if self._remove_cgc_attachments:
             self._cgc_attachments_removed = self.remove_cgc_attachments()
 
-        s = ""
-
-        if self.syntax == 'intel':
-            s += "\t.intel_syntax noprefix\n"
-
-        all_assembly_lines = [ ]
-
-        addr_and_assembly = [ ]
-        for proc in self.procedures:
-            addr_and_assembly.extend(proc.assembly(comments=comments, symbolized=symbolized))
-        # sort it by the address - must be a stable sort!
-        addr_and_assembly = sorted(addr_and_assembly, key=lambda x: x[0] if x[0] is not None else -1)
-        all_assembly_lines.extend(line for _, line in addr_and_assembly)
+        first = True
+        for line in self._procedure_assembly(comments, symbolized):
+            if not first:
+                f.write("\n")
+            f.write(line)
+            first = False
 
         last_section = None
 
@@ -2123,15 +2195,70 @@ class Reassembler(Analysis):
         for data in all_data:
             if last_section is None or data.section_name != last_section:
                 last_section = data.section_name
-                all_assembly_lines.append("\t.section {section}\n\t.align {alignment}".format(
+                if not first:
+                    f.write("\n")
+                f.write("\t.section {section}\n\t.align {alignment}".format(
                     section=(last_section if last_section != '.init_array' else '.data'),
                     alignment=self.section_alignment(last_section)
                 ))
-            all_assembly_lines.append(data.assembly(comments=comments, symbolized=symbolized))
-
-        s = "\n".join(all_assembly_lines)
-
-        return s
+                first = False
+            if not first:
+                f.write("\n")
+            f.write(data.assembly(comments=comments, symbolized=symbolized))
+            first = False
+
+    def _procedure_assembly(self, comments, symbolized):
+        """
+        Generate the assembly of all procedures, ordered by address. Ties are ordered by the position of the procedure
+        in self.procedures, then by the position inside the procedure. Procedures are only rendered once the output
+        reaches their lowest address, so at any time only overlapping procedures are being rendered.
+
+        :return: A generator of assembly strings.
+        """
+
+        def _key(addr):
+            return addr if addr is not None else -1
+
+        def _lines(proc, header):
+            # the header goes in front of the first block that does not start before the procedure
+            header_key = _key(proc.addr)
+            for addr, line in proc._assembly_blocks(comments=comments, symbolized=symbolized):
+                if header is not None and _key(addr) >= header_key:
+                    yield header_key, header
+                    header = None
+                yield _key(addr), line
+            if header is not None:
+                yield header_key, header
+
+        # generate all headers in order first, since they might create labels
+        pending = [ ]
+        for proc_idx, proc in enumerate(self.procedures):
+            min_key = _key(proc.addr)
+            if not proc.asm_code and proc.blocks:
+                min_key = min(min_key, _key(min(b.addr for b in proc.blocks)))
+            pending.append((min_key, proc_idx, proc.assembly_header()))
+        pending.sort(key=lambda x: (x[0], x[1]))
+        pending.reverse()
+
+        heap = [ ]
+
+        while heap or pending:
+            # activate all procedures that may have lines in front of the current smallest line
+            while pending and (not heap or pending[-1][0] <= heap[0][0]):
+                _, proc_idx, header = pending.pop()
+                it = enumerate(_lines(self.procedures[proc_idx], header))
+                entry = next(it, None)
+                if entry is not None:
+                    pos, (key, line) = entry
+                    heapq.heappush(heap, (key, proc_idx, pos, line, it))
+
+            key, proc_idx, pos, line, it = heapq.heappop(heap)
+            yield line
+
+            entry = next(it, None)
+            if entry is not None:
+                pos, (key, line) = entry
+                heapq.heappush(heap, (key, proc_idx, pos, line, it))
 
     def remove_cgc_attachments(self):
         """
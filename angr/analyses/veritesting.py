@@ -7,6 +7,7 @@ import networkx
 from .. import SIM_PROCEDURES
 from .. import options as o
 from ..knowledge_base import KnowledgeBase
+from ..knowledge_plugins.veritesting_regions import VeritestingRegion
 from ..errors import AngrError, AngrCFGError
 from ..sim_manager import SimulationManager
 from ..utils.graph import shallow_reverse
@@ -164,8 +165,6 @@ class Veritesting(Analysis):
     An exploration technique made for condensing chunks of code to single (nested) if-then-else constraints via CFG
     accurate to conduct Static Symbolic Execution SSE (conversion to single constraint)
     """
-    # A cache for CFG we generated before
-    cfg_cache = { }
     # Names of all stashes we will return from Veritesting
     all_stashes = ('successful', 'errored', 'deadended', 'deviated', 'unconstrained')
 
@@ -204,7 +203,8 @@ class Veritesting(Analysis):
         self._deviation_filter = deviation_filter
 
         # set up the cfg stuff
-        self._cfg, self._loop_graph = self._make_cfg()
+        self._region = self._make_region()
+        self._cfg, self._loop_graph = self._region.cfg, self._region.graph_with_loops
         self._loop_backedges = self._cfg._loop_back_edges
         self._loop_heads = {dst.addr for _, dst in self._loop_backedges}
 
@@ -268,7 +268,9 @@ class Veritesting(Analysis):
         """
 
         # Find all merge points
-        merge_points = self._get_all_merge_points(self._cfg, self._loop_graph)
+        if self._region.merge_points is None:
+            self._region.merge_points = self._get_all_merge_points(self._cfg, self._loop_graph)
+        merge_points = self._region.merge_points
         l.debug('Merge points: %s', [ hex(i[0]) for i in merge_points ])
 
         #
@@ -517,10 +519,33 @@ class Veritesting(Analysis):
     # Merge point determination
     #
 
+    def _make_region(self):
+        """
+        Get the region that starts at the current state, building its CFG if it has not been built yet. Regions are
+        stored in the `veritesting_regions` plugin of the knowledge base, so they are shared by all Veritesting analyses
+        that use the same knowledge base.
+
+        returns VeritestingRegion: The region
+        """
+
+        state = self._input_state
+        ip_int = state.addr
+
+        regions = self.kb.veritesting_regions
+        region_key = (ip_int, state.history.jumpkind, self._loop_unrolling_limit, self._enable_function_inlining)
+        region = regions.get(region_key)
+        if region is None:
+            cfg, cfg_graph_with_loops = self._make_cfg()
+            region = VeritestingRegion(cfg, cfg_graph_with_loops)
+            regions.add(region_key, region)
+        else:
+            l.debug('Loading CFG from the region cache')
+
+        return region
+
     def _make_cfg(self):
         """
         Builds a CFG from the current function.
-        Saved in cfg_cache.
 
         returns (CFGEmulated, networkx.DiGraph): Tuple of the CFG and networkx representation of it
         """
@@ -528,40 +553,35 @@ class Veritesting(Analysis):
         state = self._input_state
         ip_int = state.addr
 
-        cfg_key = (ip_int, state.history.jumpkind)
-        if cfg_key in self.cfg_cache:
-            cfg, cfg_graph_with_loops = self.cfg_cache[cfg_key]
+        if self._enable_function_inlining:
+            call_tracing_filter = CallTracingFilter(self.project, depth=0)
+            filter = call_tracing_filter.filter #pylint:disable=redefined-builtin
         else:
-            if self._enable_function_inlining:
-                call_tracing_filter = CallTracingFilter(self.project, depth=0)
-                filter = call_tracing_filter.filter #pylint:disable=redefined-builtin
-            else:
-                filter = None
-
-            # To better handle syscalls, we make a copy of all registers if they are not symbolic
-            cfg_initial_state = self.project.factory.blank_state(mode='fastpath')
-
-            # FIXME: This is very hackish
-            # FIXME: And now only Linux-like syscalls are supported
-            if self.project.arch.name == 'X86':
-                if not state.solver.symbolic(state.regs.eax):
-                    cfg_initial_state.regs.eax = state.regs.eax
-            elif self.project.arch.name == 'AMD64':
-                if not state.solver.symbolic(state.regs.rax):
-                    cfg_initial_state.regs.rax = state.regs.rax
-
-            cfg = self.project.analyses.CFGEmulated(
-                starts=((ip_int, state.history.jumpkind),),
-                context_sensitivity_level=0,
-                call_depth=1,
-                call_tracing_filter=filter,
-                initial_state=cfg_initial_state,
-                normalize=True,
-                kb=KnowledgeBase(self.project, self.project.loader.main_object)
-            )
-            cfg_graph_with_loops = networkx.DiGraph(cfg.graph)
-            cfg.force_unroll_loops(self._loop_unrolling_limit)
-            self.cfg_cache[cfg_key] = (cfg, cfg_graph_with_loops)
+            filter = None
+
+        # To better handle syscalls, we make a copy of all registers if they are not symbolic
+        cfg_initial_state = self.project.factory.blank_state(mode='fastpath')
+
+        # FIXME: This is very hackish
+        # FIXME: And now only Linux-like syscalls are supported
+        if self.project.arch.name == 'X86':
+            if not state.solver.symbolic(state.regs.eax):
+                cfg_initial_state.regs.eax = state.regs.eax
+        elif self.project.arch.name == 'AMD64':
+            if not state.solver.symbolic(state.regs.rax):
+                cfg_initial_state.regs.rax = state.regs.rax
+
+        cfg = self.project.analyses.CFGEmulated(
+            starts=((ip_int, state.history.jumpkind),),
+            context_sensitivity_level=0,
+            call_depth=1,
+            call_tracing_filter=filter,
+            initial_state=cfg_initial_state,
+            normalize=True,
+            kb=KnowledgeBase(self.project, self.project.loader.main_object)
+        )
+        cfg_graph_with_loops = networkx.DiGraph(cfg.graph)
+        cfg.force_unroll_loops(self._loop_unrolling_limit)
 
         return cfg, cfg_graph_with_loops
 
@@ -609,10 +629,13 @@ class Veritesting(Analysis):
 
         nodes = [ n for n in sorted_nodes if graph.in_degree(n) > 1 and n.looping_times == 0 ]
 
-        # Reorder nodes based on post-dominance relations
+        # Reorder nodes based on post-dominance relations. The dominator tree of each node is only computed once instead
+        # of once per comparison, and n1 post-dominates n2 iff n2 is in the dominator tree rooted at n1 in the reversed
+        # graph (see _post_dominate()).
+        dominated = { n: networkx.immediate_dominators(reversed_cyclic_graph, n) for n in nodes }
         nodes = sorted(nodes, key=cmp_to_key(lambda n1, n2: (
-            1 if self._post_dominate(reversed_cyclic_graph, n1, n2)
-            else (-1 if self._post_dominate(reversed_cyclic_graph, n2, n1) else 0)
+            1 if n2 in dominated[n1]
+            else (-1 if n1 in dominated[n2] else 0)
         )))
 
         return [ (n.addr, n.looping_times) for n in nodes ]
@@ -1,5 +1,5 @@
 import logging
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 import angr
 import archinfo
@@ -43,6 +43,8 @@ class VFGJob(CFGJobBase):
         self.call_function_key = None  # type: FunctionKey
 
         self.call_task = None  # type: CallAnalysis
+        # if the call is skipped because a function summary applies, the state at the return site
+        self.call_summary = None  # type: SimState
 
     @property
     def block_id(self):
@@ -134,6 +136,11 @@ class CallAnalysis(AnalysisTask):
         self.skipped = False
         self._final_jobs = [ ]
 
+        # (function address, input state) of the call, used for storing a function summary once the call is analyzed
+        self.summary_input = None
+        # function summaries are not used for calls with more than one target
+        self.summarizable = True
+
     def __repr__(self):
         s = "<Call @ %#08x with %d function tasks>" % (self.address, len(self.function_analysis_tasks))
         return s
@@ -176,6 +183,117 @@ class CallAnalysis(AnalysisTask):
         return job
 
 
+class FunctionSummaryCache(object):
+    """
+    A cache of function summaries for VFG.
+
+    A summary maps an abstract input state of a function to the state at the return site after the function returns.
+    A call can use a summary instead of analyzing the callee again if the input state of the summary subsumes the input
+    state of the call, i.e., merging the input state of the call into it does not change it. Summaries are keyed by the
+    function address and the stack pointer of the input state, so that a lookup only merges against the summaries that
+    can subsume the call. The least recently used summaries are evicted once the cache holds more than `max_size`
+    summaries.
+
+    A cache can be shared by multiple VFG analyses on the same project by passing it to each of them.
+    """
+
+    def __init__(self, max_size=256, mergeable_plugins=('memory', 'registers')):
+        """
+        :param int max_size:            The maximum number of summaries to keep.
+        :param tuple mergeable_plugins: State plugins to compare when checking for subsumption.
+        """
+
+        self.max_size = max_size
+        self.project = None
+
+        self._mergeable_plugins = mergeable_plugins
+        # summary ID -> (summary key, input state, final state), in the order they are used
+        self._summaries = OrderedDict()
+        # summary key -> IDs of the summaries stored under it
+        self._function_summaries = defaultdict(list)
+        self._next_id = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._summaries)
+
+    def __repr__(self):
+        return "<FunctionSummaryCache with %d summaries>" % len(self._summaries)
+
+    def lookup(self, function_address, input_state):
+        """
+        Find a summary of a function that applies to the given input state.
+
+        :param int function_address:    Address of the function.
+        :param SimState input_state:    Input state of the function.
+        :return:                        A copy of the state at the return site, or None if no summary applies.
+        :rtype:                         SimState or None
+        """
+
+        for summary_id in reversed(self._function_summaries.get(self._key(function_address, input_state), [ ])):
+            _, summary_input, summary_final = self._summaries[summary_id]
+            _, _, merging_occurred = summary_input.merge(input_state, plugin_whitelist=self._mergeable_plugins)
+            if not merging_occurred:
+                self._summaries.move_to_end(summary_id)
+                self.hits += 1
+                return summary_final.copy()
+
+        self.misses += 1
+        return None
+
+    def store(self, function_address, input_state, final_state):
+        """
+        Store a summary of a function.
+
+        :param int function_address:    Address of the function.
+        :param SimState input_state:    Input state of the function.
+        :param SimState final_state:    State at the return site after the function returns.
+        :return:                        None
+        """
+
+        summary_id = self._next_id
+        self._next_id += 1
+
+        key = self._key(function_address, input_state)
+        self._summaries[summary_id] = (key, input_state, final_state)
+        self._function_summaries[key].append(summary_id)
+
+        while len(self._summaries) > self.max_size:
+            evicted_id, (evicted_key, _, _) = self._summaries.popitem(last=False)
+            self._function_summaries[evicted_key].remove(evicted_id)
+            if not self._function_summaries[evicted_key]:
+                del self._function_summaries[evicted_key]
+
+    def clear(self):
+        """
+        Remove all summaries.
+
+        :return: None
+        """
+
+        self._summaries.clear()
+        self._function_summaries.clear()
+
+    def _key(self, function_address, state):
+        """
+        Get the key to store the summaries of a function with a given input state under. Merging two states whose stack
+        pointers differ always changes the registers, so only summaries with the same stack pointer can subsume each
+        other.
+
+        :param int function_address:    Address of the function.
+        :param SimState state:          Input state of the function.
+        :return:                        A hashable key.
+        """
+
+        if 'registers' not in self._mergeable_plugins:
+            return function_address, None
+        sp = state.registers.load(state.arch.sp_offset, state.arch.bytes, endness=state.arch.register_endness,
+                                  inspect=False, disable_actions=True)
+        return function_address, sp.cache_key
+
+
 class VFGNode(object):
     """
     A descriptor of nodes in a Value-Flow Graph
@@ -269,7 +387,8 @@ class VFG(ForwardAnalysis, Analysis):   # pylint:disable=abstract-method
                  widening_interval=3,
                  final_state_callback=None,
                  status_callback=None,
-                 record_function_final_states=False
+                 record_function_final_states=False,
+                 function_summaries=None,
                  ):
         """
         :param cfg: The control-flow graph to base this analysis on. If none is provided, we will
@@ -283,6 +402,9 @@ class VFG(ForwardAnalysis, Analysis):   # pylint:disable=abstract-method
         :param remove_options: State options to remove from the initial state. It only works when `initial_state` is
                                 None
         :param int timeout:
+        :param function_summaries:  A FunctionSummaryCache to reuse function summaries from and to store them in, or
+                                    True to use a new cache for this analysis. A callee is not analyzed again when a
+                                    summary of it applies to the call. None to disable function summaries.
         """
 
         ForwardAnalysis.__init__(self, order_jobs=True, allow_merging=True, allow_widening=True,
@@ -315,6 +437,15 @@ class VFG(ForwardAnalysis, Analysis):   # pylint:disable=abstract-method
 
         self._record_function_final_states = record_function_final_states
 
+        if function_summaries is True:
+            function_summaries = FunctionSummaryCache()
+        if function_summaries is not None:
+            if function_summaries.project is None:
+                function_summaries.project = self.project
+            elif function_summaries.project is not self.project:
+                raise AngrVFGError("The function summary cache belongs to another project.")
+        self._function_summaries = function_summaries
+
         self._nodes = {}            # all the vfg nodes, keyed on block IDs
         self._normal_states = { }   # Last available state for each program point without widening
         self._widened_states = { }  # States on which widening has occurred
@@ -814,6 +945,23 @@ class VFG(ForwardAnalysis, Analysis):   # pylint:disable=abstract-method
 
                 return [ ]
 
+            if self._function_summaries is not None and job.call_task.summarizable:
+                summary = self._function_summaries.lookup(successor_addr, successor)
+                if summary is not None:
+                    l.debug('Applying a function summary of %#08x instead of tracing into it', successor_addr)
+
+                    job.dbg_exit_status[successor] = "Summarized"
+
+                    job.call_skipped = True
+                    job.call_function_key = new_function_key
+                    job.call_summary = summary
+
+                    job.call_task.skipped = True
+
+                    return [ ]
+
+                job.call_task.summary_input = (successor_addr, successor.copy())
+
         elif jumpkind == 'Ijk_Ret':
             # Pop the current function out from the call stack
             new_call_stack = self._create_callstack(job, successor_addr, jumpkind, fakeret_successor)
@@ -887,6 +1035,9 @@ class VFG(ForwardAnalysis, Analysis):   # pylint:disable=abstract-method
                       MAX_NUMBER_OF_CONCRETE_VALUES)
             return [ ]
 
+        if job.is_call_jump:
+            job.call_task.summarizable = False
+
         # Call this function to generate a successor for each possible IP
         for ip in all_possible_ips:
             concrete_successor = successor.copy()
@@ -953,6 +1104,11 @@ class VFG(ForwardAnalysis, Analysis):   # pylint:disable=abstract-method
                                 # merge all jobs, and create a new job
                                 new_job = task.merge_jobs()
 
+                                if self._function_summaries is not None and task.summarizable and \
+                                        task.summary_input is not None and len(task.function_analysis_tasks) == 1:
+                                    func_addr, input_state = task.summary_input
+                                    self._function_summaries.store(func_addr, input_state, new_job.state.copy())
+
                                 # register the job to the top task
                                 self._top_task.jobs.append(new_job)
 
@@ -1419,6 +1575,16 @@ class VFG(ForwardAnalysis, Analysis):   # pylint:disable=abstract-method
                 top_si = successor_state.solver.TSI(successor_state.arch.bits)
                 successor_state.registers.store(successor_state.arch.ret_offset, top_si)
 
+            if job.call_skipped and job.call_summary is not None:
+                # the callee is summarized. continue from the state at the return site instead
+                successor_state = job.call_summary
+                successor_state.ip = successor_addr
+
+                if self._record_function_final_states:
+                    # it is the final state of the callee, as if it had been analyzed
+                    self._save_function_final_state(job.call_function_key, job.call_function_key.addr,
+                                                    successor_state)
+
             if job.call_skipped:
 
                 # TODO: Make sure the return values make sense
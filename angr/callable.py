@@ -1,7 +1,10 @@
 
+
 import pycparser
 
 from .calling_conventions import DEFAULT_CC
+from . import sim_options as o
+from .misc.fork_pool import ForkPool
 
 
 class Callable(object):
@@ -51,14 +54,70 @@ class Callable(object):
     def __call__(self, *args):
         self.perform_call(*args)
         if self.result_state is not None:
-            return self.result_state.solver.simplify(self._cc.get_return_val(self.result_state, stack_base=self.result_state.regs.sp - self._cc.STACKARG_SP_DIFF))
+            return self._get_return_val(self.result_state)
         else:
             return None
 
     def perform_call(self, *args):
+        caller = self._run(self._base_state, args)
+
+        self.result_path_group = caller.copy()
+
+        if self._perform_merge:
+            caller.merge()
+            self.result_state = caller.active[0]
+
+    def call_batch(self, arg_tuples, unicorn=True, workers=None, chunksize=16):
+        """
+        Call the function once for each tuple of arguments in `arg_tuples`, and yield the return values in order.
+
+        Unlike calling this Callable repeatedly, the initial state is prepared only once and every call starts from a
+        copy of it. Calls that split into multiple states are merged as usual (or fail, if concrete_only is set). A call
+        that does not return yields None. `result_state` and `result_path_group` are not updated.
+
+        :param arg_tuples:  An iterable of tuples of arguments. It is consumed lazily.
+        :param unicorn:     Execute concrete code with Unicorn when it is available.
+        :param workers:     The number of worker processes to spread the calls across. Arguments and return values must
+                            be picklable.
+        :param chunksize:   The number of calls sent to a worker at a time.
+        :return:            A generator of return values.
+        """
+
+        base_state = self._prepare_batch_state(unicorn)
+
+        if workers is not None and workers > 1:
+            return self._call_batch_parallel(base_state, arg_tuples, workers, chunksize)
+
+        return (self._call_with_base_state(base_state, args) for args in arg_tuples)
+
+    def _call_batch_parallel(self, base_state, arg_tuples, workers, chunksize):
+        with ForkPool((self, base_state), workers=workers) as pool:
+            for r in pool.map(_call_in_worker, arg_tuples, chunksize):
+                yield r
+
+    def _prepare_batch_state(self, unicorn):
+        if self._base_state is not None:
+            state = self._base_state.copy()
+        else:
+            state = self._project.factory.blank_state(addr=self._addr)
+        if unicorn:
+            state.options.update(o.unicorn)
+        return state
+
+    def _call_with_base_state(self, base_state, args):
+        try:
+            caller = self._run(base_state, args)
+        except AngrCallableError:
+            return None
+
+        if self._perform_merge:
+            caller.merge()
+        return self._get_return_val(caller.active[0])
+
+    def _run(self, base_state, args):
         state = self._project.factory.call_state(self._addr, *args,
                     cc=self._cc,
-                    base_state=self._base_state,
+                    base_state=base_state,
                     ret_addr=self._deadend_addr,
                     toc=self._toc)
 
@@ -75,11 +134,10 @@ class Callable(object):
         if len(caller.active) == 0:
             raise AngrCallableError("No paths returned from function")
 
-        self.result_path_group = caller.copy()
+        return caller
 
-        if self._perform_merge:
-            caller.merge()
-            self.result_state = caller.active[0]
+    def _get_return_val(self, state):
+        return state.solver.simplify(self._cc.get_return_val(state, stack_base=state.regs.sp - self._cc.STACKARG_SP_DIFF))
 
     def call_c(self, c_args):
         """
@@ -126,3 +184,8 @@ class Callable(object):
 
 
 from .errors import AngrCallableError, AngrCallableMultistateError
+
+
+def _call_in_worker(shared, args):
+    callable_, base_state = shared
+    return callable_._call_with_base_state(base_state, args)  # pylint:disable=protected-access
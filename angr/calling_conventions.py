@@ -437,6 +437,18 @@ class SimCC:
                 (isinstance(val, claripy.ast.Base) and val.op.startswith('fp')) or \
                 (isinstance(val, claripy.ast.Base) and val.op == 'Reverse' and val.args[0].op.startswith('fp'))
 
+    def _arg_plans(self):
+        """
+        Get the cache of argument locations of this calling convention. Locations only depend on the calling
+        convention, its customized arguments and its prototype, so they are computed once for every combination of
+        argument kinds and sizes. The cache is discarded whenever the customized arguments or the prototype are
+        replaced.
+        """
+        cache = self.__dict__.get('_arg_plan_cache', None)
+        if cache is None or cache[0] is not self.args or cache[1] is not self.func_ty:
+            cache = self._arg_plan_cache = (self.args, self.func_ty, { })
+        return cache[2]
+
     def arg_locs(self, is_fp=None, sizes=None):
         """
         Pass this a list of whether each parameter is floating-point or not, and get back a list of
@@ -444,18 +456,46 @@ class SimCC:
 
         If you've customized this CC, this will sanity-check the provided locations with the given list.
         """
-        session = self.arg_session
         if self.func_ty is None:
             # No function prototype is provided. `is_fp` must be provided.
             if is_fp is None:
                 raise ValueError('"is_fp" must be provided when no function prototype is available.')
+            key = (tuple(is_fp), None if sizes is None else tuple(sizes))
         else:
+            # the prototype decides whether each argument is FP or not
+            key = (None, None if sizes is None else tuple(sizes))
+
+        plans = self._arg_plans()
+        try:
+            plan = plans[key]
+        except KeyError:
+            plan = plans[key] = tuple(self._compute_arg_locs(is_fp, sizes))
+        return list(plan)
+
+    def _compute_arg_locs(self, is_fp, sizes):
+        session = self.arg_session
+        if self.func_ty is not None:
             # let's rely on the func_ty for the number of arguments and whether each argument is FP or not
             is_fp = [ True if isinstance(arg, (SimTypeFloat, SimTypeDouble)) else False for arg in self.func_ty.args ]
 
         if sizes is None: sizes = [self.arch.bytes] * len(is_fp)
         return [session.next_arg(ifp, size=sz) for ifp, sz in zip(is_fp, sizes)]
 
+    def _int_arg_locs(self, count):
+        """
+        Get the locations of the first `count` arguments, assuming that they are all integral and word-sized unless
+        this CC has been customized.
+        """
+        if self.args is not None:
+            return self.args
+
+        plans = self._arg_plans()
+        locs = plans.get('int', None)
+        if locs is None or len(locs) < count:
+            session = self.arg_session
+            locs = plans['int'] = tuple(session.next_arg(False) for _ in range(count))
+        return locs
+
     def arg(self, state, index, stack_base=None):
         """
         Returns a bitvector expression representing the nth argument of a function.
@@ -466,13 +506,18 @@ class SimCC:
         WARNING: this assumes that none of the arguments are floating-point and they're all single-word-sized, unless
         you've customized this CC.
         """
-        session = self.arg_session
-        if self.args is None:
-            arg_loc = [session.next_arg(False) for _ in range(index + 1)][-1]
-        else:
-            arg_loc = self.args[index]
+        return self._int_arg_locs(index + 1)[index].get_value(state, stack_base=stack_base)
 
-        return arg_loc.get_value(state, stack_base=stack_base)
+    def arg_values(self, state, count, stack_base=None):
+        """
+        Returns a list of bitvector expressions representing the first `count` arguments of a function, located the
+        same way as :meth:`arg` locates them.
+
+        `stack_base` is an optional pointer to the top of the stack at the function start. If it is not
+        specified, use the current stack pointer.
+        """
+        locs = self._int_arg_locs(count)
+        return [ locs[i].get_value(state, stack_base=stack_base) for i in range(count) ]
 
     def get_args(self, state, is_fp=None, sizes=None, stack_base=None):
         """
@@ -0,0 +1,244 @@
+import logging
+
+from .errors import SimConcreteMemoryError, SimConcreteRegisterError
+
+l = logging.getLogger(name=__name__)
+
+
+class ConcreteTargetCache(object):
+    """
+    A read cache in front of a concrete target.
+
+    Every read from a concrete target is a round-trip to the process behind it, which costs milliseconds when the target
+    is a remote debugger stub. The cache reads memory by whole pages: a page that is missed is read together with the
+    pages that follow it (the read-ahead window) in a single request, and ranges that are known to be needed can be
+    prefetched with one request per contiguous run of pages. Registers are read once, in a batch if the target supports
+    it.
+
+    What is cached is only valid while the concrete process is stopped: the cache starts a new epoch, and forgets
+    everything, whenever the process is resumed. Use it in place of the concrete target when creating the project::
+
+        target = ConcreteTargetCache(AvatarGDBConcreteTarget(...), read_ahead=8)
+        p = angr.Project(binary, concrete_target=target)
+
+    Any attribute that the cache does not define is looked up on the wrapped target.
+
+    :param target:          The concrete target.
+    :param int page_size:   The size of the pages memory is read by.
+    :param int read_ahead:  The number of pages to read after a missed page, in the same request.
+    :param int max_batch:   The maximum number of pages to read in a single request.
+
+    :ivar int epoch:        The number of times the concrete process was resumed.
+    :ivar int hits:         The number of pages that were served from the cache.
+    :ivar int misses:       The number of pages that had to be read from the target.
+    :ivar int requests:     The number of memory read requests that were sent to the target.
+    """
+
+    def __init__(self, target, page_size=0x1000, read_ahead=4, max_batch=64):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+
+        self.target = target
+        self.page_size = page_size
+        self.read_ahead = read_ahead
+        self.max_batch = max_batch
+
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+
+        # page number -> bytes, or None if the page is not mapped in the concrete process
+        self._pages = { }
+        # register name -> value, or the SimConcreteRegisterError raised when reading it
+        self._registers = { }
+
+    def __getattr__(self, k):
+        if k == 'target':
+            raise AttributeError(k)
+        return getattr(self.target, k)
+
+    def __repr__(self):
+        return "<ConcreteTargetCache of %r: epoch %d, %d pages cached>" % (self.target, self.epoch, len(self._pages))
+
+    #
+    # Epochs
+    #
+
+    def invalidate(self):
+        """
+        Forget everything that was read. This has to be called whenever the concrete process runs.
+        """
+        self._pages.clear()
+        self._registers.clear()
+        self.epoch += 1
+
+    def run(self):
+        """
+        Resume the concrete process, starting a new epoch.
+        """
+        self.invalidate()
+        return self.target.run()
+
+    #
+    # Memory
+    #
+
+    def read_memory(self, address, nbytes, **kwargs):
+        """
+        Read memory from the concrete process, through the cache.
+
+        :param int address: The address to read from.
+        :param int nbytes:  The number of bytes to read.
+        :return:            The bytes read.
+        :rtype:             bytes
+        :raises SimConcreteMemoryError: If any of the memory is not mapped in the concrete process.
+        """
+        if kwargs:
+            # reads that need special handling from the target are not cached
+            return self.target.read_memory(address, nbytes, **kwargs)
+
+        nbytes = int(nbytes)
+        if nbytes <= 0:
+            return b''
+
+        first = address // self.page_size
+        last = (address + nbytes - 1) // self.page_size
+        offset = address - first * self.page_size
+        if first == last:
+            return self._page(first)[offset:offset + nbytes]
+        data = b''.join(self._page(n) for n in range(first, last + 1))
+        return data[offset:offset + nbytes]
+
+    def write_memory(self, address, value, *args, **kwargs):
+        """
+        Write memory in the concrete process, dropping the cached pages that it covers.
+        """
+        r = self.target.write_memory(address, value, *args, **kwargs)
+        if len(value):
+            for n in range(address // self.page_size, (address + len(value) - 1) // self.page_size + 1):
+                self._pages.pop(n, None)
+        return r
+
+    def prefetch(self, ranges):
+        """
+        Read the pages covering some memory ranges that are not cached yet, with one request for each contiguous run of
+        missing pages. Pages that turn out not to be mapped are skipped.
+
+        :param ranges:  An iterable of (start, end) address tuples, with the end excluded.
+        """
+        missing = set()
+        for start, end in ranges:
+            for n in range(start // self.page_size, (end - 1) // self.page_size + 1):
+                if n not in self._pages:
+                    missing.add(n)
+
+        run = [ ]
+        for n in sorted(missing):
+            if run and (n != run[-1] + 1 or len(run) == self.max_batch):
+                self._read_pages(run[0], len(run))
+                run = [ ]
+            run.append(n)
+        if run:
+            self._read_pages(run[0], len(run))
+
+    def _page(self, n):
+        try:
+            data = self._pages[n]
+        except KeyError:
+            data = self._fetch(n)
+        else:
+            self.hits += 1
+
+        if data is None:
+            raise SimConcreteMemoryError("Page %#x is not mapped in the concrete process" % (n * self.page_size))
+        return data
+
+    def _fetch(self, n):
+        # read the missed page along with the pages after it, up to the first one that is already cached
+        count = 1
+        while count <= self.read_ahead and count < self.max_batch and n + count not in self._pages:
+            count += 1
+
+        self._read_pages(n, count)
+        return self._pages[n]
+
+    def _read_pages(self, n, count):
+        self.misses += count
+        self.requests += 1
+        try:
+            data = self.target.read_memory(n * self.page_size, count * self.page_size)
+        except SimConcreteMemoryError:
+            data = None
+
+        if data is not None and len(data) == count * self.page_size:
+            for i in range(count):
+                self._pages[n + i] = data[i * self.page_size:(i + 1) * self.page_size]
+            return
+
+        if count == 1:
+            l.debug("Page %#x is not mapped in the concrete process", n * self.page_size)
+            self._pages[n] = None
+            return
+
+        # the window runs into memory that is not mapped. fall back to reading its pages one by one.
+        self.misses -= count
+        for i in range(count):
+            self._read_pages(n + i, 1)
+
+    #
+    # Registers
+    #
+
+    def read_register(self, register, **kwargs):
+        """
+        Read a register of the concrete process, through the cache.
+
+        :param str register:    The name of the register.
+        :return:                The value of the register.
+        :raises SimConcreteRegisterError: If the register cannot be read.
+        """
+        if kwargs:
+            return self.target.read_register(register, **kwargs)
+
+        try:
+            value = self._registers[register]
+        except KeyError:
+            value = self._read_register(register)
+
+        if isinstance(value, SimConcreteRegisterError):
+            raise value
+        return value
+
+    def read_registers(self, registers):
+        """
+        Read several registers of the concrete process. The registers that are not cached are read in a single request
+        if the target provides a ``read_registers`` method, and one by one otherwise.
+
+        :param registers:   The names of the registers.
+        :return:            A dict of the values of the registers that could be read, by name.
+        """
+        missing = [ r for r in dict.fromkeys(registers) if r not in self._registers ]
+        if len(missing) > 1 and hasattr(self.target, 'read_registers'):
+            try:
+                values = self.target.read_registers(missing)
+            except SimConcreteRegisterError:
+                # one of them cannot be read; find out which one
+                pass
+            else:
+                self._registers.update(zip(missing, values))
+                missing = [ ]
+
+        for r in missing:
+            self._read_register(r)
+
+        return { r: self._registers[r] for r in registers
+                 if not isinstance(self._registers[r], SimConcreteRegisterError) }
+
+    def _read_register(self, register):
+        try:
+            value = self.target.read_register(register)
+        except SimConcreteRegisterError as e:
+            value = e
+        self._registers[register] = value
+        return value
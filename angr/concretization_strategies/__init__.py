@@ -1,11 +1,18 @@
+import claripy
+
 class SimConcretizationStrategy(object):
     """
     Concretization strategies control the resolution of symbolic memory indices
     in SimuVEX. By subclassing this class and setting it as a concretization strategy
     (on state.memory.read_strategies and state.memory.write_strategies), SimuVEX's
     memory index concretization behavior can be modified.
+
+    Strategies whose results only depend on the address and the constraints of the state
+    should set `stateless` to True, which allows their results to be memoized.
     """
 
+    stateless = False
+
     def __init__(self, filter=None, exact=True): #pylint:disable=redefined-builtin
         """
         Initializes the base SimConcretizationStrategy.
@@ -48,6 +55,41 @@ class SimConcretizationStrategy(object):
         """
         return (self._min(memory, addr, **kwargs), self._max(memory, addr, **kwargs))
 
+    @staticmethod
+    def _vsa_range(addr):
+        """
+        Over-approximates the (min, max) range of an address with a strided interval, without looking at any
+        constraints. This does not involve the constraint solver, and returns None if no useful bound can be found.
+        """
+        try:
+            si = claripy.backends.vsa.convert(addr)
+        except claripy.ClaripyError:
+            return None
+        if not isinstance(si, claripy.vsa.StridedInterval) or si.is_empty or si.is_top:
+            return None
+        if si.lower_bound > si.upper_bound:
+            # the interval wraps around
+            return None
+        return si.lower_bound, si.upper_bound
+
+    def _bounded_range(self, memory, addr, limit, **kwargs):
+        """
+        Gets a (min, max) range for an address that is exact unless its width is known to be at most `limit` without
+        consulting the solver, in which case it is an over-approximation.
+        """
+        bounds = self._vsa_range(addr)
+        if bounds is not None and bounds[1] - bounds[0] <= limit:
+            return bounds
+        return self._range(memory, addr, **kwargs)
+
+    @property
+    def cacheable(self):
+        """
+        Whether the result of concretizing an address with this strategy only depends on the address and on the
+        constraints of the state.
+        """
+        return self.stateless and self._filter is None
+
     def concretize(self, memory, addr):
         """
         Concretizes the address into a list of values.
@@ -5,6 +5,8 @@ class SimConcretizationStrategyAny(SimConcretizationStrategy):
     Concretization strategy that returns any single solution.
     """
 
+    stateless = True
+
     def _concretize(self, memory, addr):
         if self._exact:
             return [ self._any(memory, addr) ]
@@ -8,6 +8,8 @@ class SimConcretizationStrategyEval(SimConcretizationStrategy):
     Therefore, should only be used as the fallback strategy.
     """
 
+    stateless = True
+
     def __init__(self, limit, **kwargs):
         super(SimConcretizationStrategyEval, self).__init__(**kwargs)
         self._limit = limit
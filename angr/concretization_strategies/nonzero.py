@@ -5,5 +5,7 @@ class SimConcretizationStrategyNonzero(SimConcretizationStrategy):
     Concretization strategy that returns any non-zero solution.
     """
 
+    stateless = True
+
     def _concretize(self, memory, addr):
         return [ self._any(memory, addr, extra_constraints=[addr != 0]) ]
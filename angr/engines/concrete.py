@@ -3,6 +3,7 @@ import threading
 
 from angr.errors import AngrError
 from .engine import SimEngine
+from ..concrete_cache import ConcreteTargetCache
 from ..errors import SimConcreteMemoryError, SimConcreteRegisterError
 
 l = logging.getLogger("angr.engines.concrete")
@@ -26,7 +27,10 @@ class SimEngineConcrete(SimEngine):
         l.info("Initializing SimEngineConcrete with ConcreteTarget provided.")
         super(SimEngineConcrete, self).__init__()
         self.project = project
-        if isinstance(self.project.concrete_target, ConcreteTarget) and \
+        concrete_target = self.project.concrete_target
+        if isinstance(concrete_target, ConcreteTargetCache):
+            concrete_target = concrete_target.target
+        if isinstance(concrete_target, ConcreteTarget) and \
                 self.check_concrete_target_methods(self.project.concrete_target):
 
             self.target = self.project.concrete_target
@@ -102,6 +106,7 @@ class SimEngineConcrete(SimEngine):
 
         # resuming of the concrete process, if the target won't reach the
         # breakpoint specified by the user the timeout will abort angr execution.
+        # a ConcreteTargetCache forgets what it read from the process as it resumes.
         l.debug("SimEngineConcrete is resuming the concrete process")
         self.target.run()
         l.debug("SimEngineConcrete has successfully resumed the process")
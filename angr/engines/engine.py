@@ -1,4 +1,5 @@
 import sys
+import time
 import logging
 
 from archinfo.arch_soot import SootAddressDescriptor
@@ -27,6 +28,10 @@ class SimEngine(object):
         :param force_addr:  Force execution to pretend that we're working at this concrete address
         :returns:           A SimSuccessors object categorizing the execution's successor states
         """
+        counters = profiling.counters
+        if counters is not None:
+            start = time.perf_counter()
+
         inline = kwargs.pop('inline', False)
         force_addr = kwargs.pop('force_addr', None)
 
@@ -80,6 +85,9 @@ class SimEngine(object):
         for succ in successors.flat_successors:
             succ.history.recent_description = description
 
+        if counters is not None:
+            counters.record_engine(self, addr, time.perf_counter() - start)
+
         return successors
 
     def check(self, state, *args, **kwargs):
@@ -108,3 +116,4 @@ from .. import sim_options as o
 from ..state_plugins.inspect import BP_BEFORE, BP_AFTER
 from .successors import SimSuccessors
 from ..errors import SimException
+from ..misc import profiling
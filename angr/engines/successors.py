@@ -48,6 +48,11 @@ class SimSuccessors(object):
         self.sort = None
         self.artifacts = {}
 
+        # with BATCH_EXIT_FEASIBILITY, the solvers holding the constraints shared by the exits of this run, and the
+        # solver each pending successor is checked against
+        self._exit_solvers = { }
+        self._pending_exit_checks = { }
+
     @classmethod
     def failure(cls):
         return cls(None, None)
@@ -150,6 +155,8 @@ class SimSuccessors(object):
 
         # apply the guard constraint and new program counter to the state
         if add_guard:
+            if self._batches_exit_check(state):
+                self._share_exit_solver(state)
             state.add_constraints(state.scratch.guard)
         # trigger inspect breakpoints here since this statement technically shows up in the IRSB as the "next"
         state.regs.ip = state.scratch.target
@@ -167,6 +174,52 @@ class SimSuccessors(object):
         state.options.discard(o.AST_DEPS)
         state.options.discard(o.AUTO_REFS)
 
+    @staticmethod
+    def _batches_exit_check(state):
+        """
+        Whether the feasibility of a successor should be checked against the solver its exit shares with the other exits
+        of the run, rather than with a solver of its own.
+        """
+        return o.BATCH_EXIT_FEASIBILITY in state.options and \
+               o.LAZY_SOLVES not in state.options and \
+               o.TRACK_CONSTRAINTS in state.options and \
+               o.SYMBOLIC in state.options and \
+               o.ABSTRACT_SOLVER not in state.options and \
+               state._global_condition is None and \
+               state.scratch.guard.symbolic
+
+    def _share_exit_solver(self, state):
+        """
+        Record the solver, holding the constraints of a successor before its guard is added, that the guard will be
+        checked against. Successors that were copied from the same state with the same constraints share one solver, so
+        that the constraints are only handed to the SMT solver once, and every guard is checked as an assumption on top
+        of them.
+
+        :param state: the successor state, before its guard is added
+        """
+        key = frozenset(id(c) for c in state.solver.constraints)
+        solver = self._exit_solvers.get(key, None)
+        if solver is None:
+            solver = state.solver._solver.branch()
+            self._exit_solvers[key] = solver
+        self._pending_exit_checks[id(state)] = solver
+
+    def _exit_satisfiable(self, state):
+        """
+        Whether a successor state is satisfiable, checked against the solver shared with the other exits of the run if
+        there is one. The result is kept in the history of the successor, so that it is not checked again.
+
+        :param state: the successor state
+        :return: True if the successor state is satisfiable
+        """
+        solver = self._pending_exit_checks.pop(id(state), None)
+        if solver is None:
+            return state.satisfiable()
+
+        sat = solver.satisfiable(extra_constraints=(state.scratch.guard,))
+        state.history._satisfiable = sat
+        return sat
+
     @staticmethod
     def _manage_callstack(state):
         # condition for call = Ijk_Call
@@ -249,7 +302,7 @@ class SimSuccessors(object):
             self.unsat_successors.append(state)
         elif not state.scratch.guard.symbolic and state.solver.is_false(state.scratch.guard):
             self.unsat_successors.append(state)
-        elif o.LAZY_SOLVES not in state.options and not state.satisfiable():
+        elif o.LAZY_SOLVES not in state.options and not self._exit_satisfiable(state):
             self.unsat_successors.append(state)
         elif o.NO_SYMBOLIC_JUMP_RESOLUTION in state.options and state.solver.symbolic(target):
             self.unconstrained_successors.append(state)
@@ -387,6 +440,9 @@ class SimSuccessors(object):
         """
         Finalizes the request.
         """
+        self._exit_solvers.clear()
+        self._pending_exit_checks.clear()
+
         if len(self.all_successors) == 0:
             return
 
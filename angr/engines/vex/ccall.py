@@ -426,6 +426,204 @@ def pc_actions_SMULQ(*args, **kwargs):
     raise SimCCallError("Unsupported flag action. Please implement or bug Yan.")
 
 
+#
+# Concrete flag helpers
+#
+
+# These mirror the pc_actions_* functions above on plain Python integers. They are used by the CCall wrappers when
+# FAST_CONCRETE_OPS is enabled and every argument is concrete, which avoids building a large AST for each flags
+# computation.
+
+# parity flag of each byte value: 1 if the number of set bits is even
+_parity_table = tuple(1 - (bin(i).count('1') & 1) for i in range(256))
+
+def _concrete_args(*args):
+    """
+    Get the integer values of a list of CCall arguments, or None if any of them is symbolic.
+    """
+    values = [ ]
+    for a in args:
+        if isinstance(a, int):
+            values.append(a)
+        elif isinstance(a, claripy.ast.BV) and a.op == 'BVV':
+            values.append(a.args[0])
+        else:
+            return None
+    return values
+
+def _concrete_flags_tuple(nbits, cc_str, dep1, dep2, ndep, platform):
+    """
+    Calculate (cf, pf, af, zf, sf, of) as integers. Returns None for operations that have no concrete implementation.
+    """
+    mask = (1 << nbits) - 1
+    msb = nbits - 1
+    offsets = data[platform]['CondBitOffsets']
+    shift_a = offsets['G_CC_SHIFT_A']
+    dep1 &= mask
+    dep2 &= mask
+    ndep &= mask
+    op = cc_str[8:-1]
+
+    if op == 'ADD':
+        res = (dep1 + dep2) & mask
+        cf = int(res < dep1)
+        af = ((res ^ dep1 ^ dep2) >> shift_a) & 1
+        of = (((dep1 ^ dep2 ^ mask) & (dep1 ^ res)) >> msb) & 1
+    elif op == 'SUB':
+        res = (dep1 - dep2) & mask
+        cf = int(dep1 < dep2)
+        af = ((res ^ dep1 ^ dep2) >> shift_a) & 1
+        of = (((dep1 ^ dep2) & (dep1 ^ res)) >> msb) & 1
+    elif op == 'ADC':
+        old_c = ndep & data[platform]['CondBitMasks']['G_CC_MASK_C']
+        arg_r = dep2 ^ old_c
+        res = (dep1 + arg_r + old_c) & mask
+        cf = int(res <= dep1) if old_c != 0 else int(res < dep1)
+        af = ((res ^ dep1 ^ arg_r) >> shift_a) & 1
+        of = (((dep1 ^ arg_r ^ mask) & (dep1 ^ res)) >> msb) & 1
+    elif op == 'SBB':
+        old_c = (ndep >> offsets['G_CC_SHIFT_C']) & 1
+        arg_r = dep2 ^ old_c
+        res = (dep1 - arg_r - old_c) & mask
+        cf = int(dep1 <= arg_r) if old_c == 1 else int(dep1 < arg_r)
+        af = ((res ^ dep1 ^ arg_r) >> shift_a) & 1
+        of = (((dep1 ^ arg_r) & (dep1 ^ res)) >> msb) & 1
+    elif op == 'LOGIC':
+        res = dep1
+        cf, af, of = 0, 0, 0
+    elif op in ('INC', 'DEC'):
+        res = dep1
+        arg_l = (res - 1) & mask if op == 'INC' else (res + 1) & mask
+        cf = (ndep >> offsets['G_CC_SHIFT_C']) & 1
+        af = ((res ^ arg_l ^ 1) >> shift_a) & 1
+        of = int((res >> msb) != (arg_l >> msb))
+    elif op == 'SHL':
+        res = dep1
+        cf = (res >> msb) & 1
+        af = 0
+        of = (res ^ dep2) & 1
+    elif op == 'SHR':
+        res = dep1
+        cf = dep2 & 1
+        af = 0
+        of = (res ^ dep2) & 1
+    elif op in ('ROL', 'ROR'):
+        res = dep1
+        if op == 'ROL':
+            cf = res & 1
+            of = ((res >> msb) ^ res) & 1
+        else:
+            cf = (res >> msb) & 1
+            of = ((res >> msb) ^ (res >> (msb - 1))) & 1
+        return (cf,
+                (ndep >> offsets['G_CC_SHIFT_P']) & 1,
+                (ndep >> offsets['G_CC_SHIFT_A']) & 1,
+                (ndep >> offsets['G_CC_SHIFT_Z']) & 1,
+                (ndep >> offsets['G_CC_SHIFT_S']) & 1,
+                of)
+    else:
+        # UMUL/SMUL are left to the symbolic actions: their carry depends on how claripy evaluates a shift by the full
+        # width of the result, which is not the same in every backend
+        return None
+
+    return cf, _parity_table[res & 0xff], af, int(res == 0), (res >> msb) & 1, of
+
+def _concrete_rdata_all(cc_op, dep1, dep2, ndep, platform):
+    """
+    Calculate the full flags register as an integer. Returns None if the operation is not supported concretely.
+    """
+    masks = data[platform]['CondBitMasks']
+    if cc_op == data[platform]['OpTypes']['G_CC_OP_COPY']:
+        return dep1 & (masks['G_CC_MASK_O'] | masks['G_CC_MASK_S'] | masks['G_CC_MASK_Z'] | masks['G_CC_MASK_A'] |
+                       masks['G_CC_MASK_C'] | masks['G_CC_MASK_P'])
+
+    cc_str = data_inverted[platform]['OpTypes'].get(cc_op, None)
+    if cc_str is None or cc_str == 'G_CC_OP_NUMBER':
+        return None
+    flags = _concrete_flags_tuple(_get_nbits(cc_str), cc_str, dep1, dep2, ndep, platform)
+    if flags is None:
+        return None
+
+    offsets = data[platform]['CondBitOffsets']
+    cf, pf, af, zf, sf, of = flags
+    return (cf << offsets['G_CC_SHIFT_C']) | (pf << offsets['G_CC_SHIFT_P']) | (af << offsets['G_CC_SHIFT_A']) | \
+           (zf << offsets['G_CC_SHIFT_Z']) | (sf << offsets['G_CC_SHIFT_S']) | (of << offsets['G_CC_SHIFT_O'])
+
+def _concrete_condition(cond, rdata, platform):
+    """
+    Evaluate an x86 condition code against a concrete flags register.
+    """
+    offsets = data[platform]['CondBitOffsets']
+    conds = data[platform]['CondTypes']
+    inv = cond & 1
+    of = rdata >> offsets['G_CC_SHIFT_O']
+    sf = rdata >> offsets['G_CC_SHIFT_S']
+    zf = rdata >> offsets['G_CC_SHIFT_Z']
+    cf = rdata >> offsets['G_CC_SHIFT_C']
+    pf = rdata >> offsets['G_CC_SHIFT_P']
+
+    if cond in (conds['CondO'], conds['CondNO']):
+        return 1 & (inv ^ of)
+    if cond in (conds['CondZ'], conds['CondNZ']):
+        return 1 & (inv ^ zf)
+    if cond in (conds['CondB'], conds['CondNB']):
+        return 1 & (inv ^ cf)
+    if cond in (conds['CondBE'], conds['CondNBE']):
+        return 1 & (inv ^ (cf | zf))
+    if cond in (conds['CondS'], conds['CondNS']):
+        return 1 & (inv ^ sf)
+    if cond in (conds['CondP'], conds['CondNP']):
+        return 1 & (inv ^ pf)
+    if cond in (conds['CondL'], conds['CondNL']):
+        return 1 & (inv ^ (sf ^ of))
+    if cond in (conds['CondLE'], conds['CondNLE']):
+        return 1 & (inv ^ ((sf ^ of) | zf))
+    return None
+
+def pc_calculate_condition_concrete(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep, platform=None):
+    """
+    A concrete version of pc_calculate_condition(). Returns None if any argument is symbolic or the operation is not
+    supported, in which case the caller should fall back to the symbolic implementation.
+    """
+    args = _concrete_args(cond, cc_op, cc_dep1, cc_dep2, cc_ndep)
+    if args is None:
+        return None
+    cond, cc_op, cc_dep1, cc_dep2, cc_ndep = args
+    rdata = _concrete_rdata_all(cc_op, cc_dep1, cc_dep2, cc_ndep, platform)
+    if rdata is None:
+        return None
+    r = _concrete_condition(cond, rdata, platform)
+    if r is None:
+        return None
+    return state.solver.BVV(r, state.arch.bits), [ ]
+
+def pc_calculate_rdata_all_concrete(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform=None):
+    """
+    A concrete version of pc_calculate_rdata_all(). Returns None if any argument is symbolic or the operation is not
+    supported.
+    """
+    args = _concrete_args(cc_op, cc_dep1, cc_dep2, cc_ndep)
+    if args is None:
+        return None
+    rdata = _concrete_rdata_all(*args, platform=platform)
+    if rdata is None:
+        return None
+    return state.solver.BVV(rdata, data[platform]['size']), [ ]
+
+def pc_calculate_rdata_c_concrete(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform=None):
+    """
+    A concrete version of pc_calculate_rdata_c(). Returns None if any argument is symbolic or the operation is not
+    supported.
+    """
+    args = _concrete_args(cc_op, cc_dep1, cc_dep2, cc_ndep)
+    if args is None:
+        return None
+    rdata = _concrete_rdata_all(*args, platform=platform)
+    if rdata is None:
+        return None
+    return state.solver.BVV((rdata >> data[platform]['CondBitOffsets']['G_CC_SHIFT_C']) & 1, state.arch.bits), [ ]
+
+
 
 def pc_calculate_rdata_all_WRK(state, cc_op, cc_dep1_formal, cc_dep2_formal, cc_ndep_formal, platform=None):
     # sanity check
@@ -872,6 +1070,10 @@ def amd64g_calculate_RCR(state, arg, rot_amt, eflags_in, sz):
         return arg_out, []
 
 def amd64g_calculate_condition(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep):
+    if FAST_CONCRETE_OPS in state.options:
+        r = pc_calculate_condition_concrete(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='AMD64')
+        if r is not None:
+            return r
     if USE_SIMPLIFIED_CCALLS in state.options:
         try:
             return pc_calculate_condition_simple(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='AMD64')
@@ -881,9 +1083,17 @@ def amd64g_calculate_condition(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep):
     return pc_calculate_condition(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='AMD64')
 
 def amd64g_calculate_rflags_all(state, cc_op, cc_dep1, cc_dep2, cc_ndep):
+    if FAST_CONCRETE_OPS in state.options:
+        r = pc_calculate_rdata_all_concrete(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='AMD64')
+        if r is not None:
+            return r
     return pc_calculate_rdata_all(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='AMD64')
 
 def amd64g_calculate_rflags_c(state, cc_op, cc_dep1, cc_dep2, cc_ndep):
+    if FAST_CONCRETE_OPS in state.options:
+        r = pc_calculate_rdata_c_concrete(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='AMD64')
+        if r is not None:
+            return r
     return pc_calculate_rdata_c(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='AMD64')
 
 ###########################
@@ -917,15 +1127,27 @@ def x86g_calculate_RCR(state, arg, rot_amt, eflags_in, sz):
     return eflags_out.concat(arg_out), []
 
 def x86g_calculate_condition(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep):
+    if FAST_CONCRETE_OPS in state.options:
+        r = pc_calculate_condition_concrete(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='X86')
+        if r is not None:
+            return r
     if USE_SIMPLIFIED_CCALLS in state.options:
         return pc_calculate_condition_simple(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='X86')
     else:
         return pc_calculate_condition(state, cond, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='X86')
 
 def x86g_calculate_eflags_all(state, cc_op, cc_dep1, cc_dep2, cc_ndep):
+    if FAST_CONCRETE_OPS in state.options:
+        r = pc_calculate_rdata_all_concrete(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='X86')
+        if r is not None:
+            return r
     return pc_calculate_rdata_all(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='X86')
 
 def x86g_calculate_eflags_c(state, cc_op, cc_dep1, cc_dep2, cc_ndep):
+    if FAST_CONCRETE_OPS in state.options:
+        r = pc_calculate_rdata_c_concrete(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='X86')
+        if r is not None:
+            return r
     return pc_calculate_rdata_c(state, cc_op, cc_dep1, cc_dep2, cc_ndep, platform='X86')
 
 def x86g_check_fldcw(state, fpucw):
@@ -1747,4 +1969,4 @@ def _get_nbits(cc_str):
     return nbits
 
 from ...errors import SimError, SimCCallError
-from ...sim_options import USE_SIMPLIFIED_CCALLS
+from ...sim_options import USE_SIMPLIFIED_CCALLS, FAST_CONCRETE_OPS
@@ -15,6 +15,7 @@ from ...misc.ux import once
 from ..engine import SimEngine
 from .statements import translate_stmt
 from .expressions import translate_expr
+from .plan import IRSBPlan
 
 import logging
 l = logging.getLogger(name=__name__)
@@ -64,6 +65,9 @@ class SimEngineVEX(SimEngine):
         self._block_cache_hits = 0
         self._block_cache_misses = 0
 
+        # execution plan cache, living alongside the block cache
+        self._plan_cache = None
+
         self._initialize_block_cache()
 
     def is_stop_point(self, addr, extra_stop_points=None):
@@ -79,6 +83,30 @@ class SimEngineVEX(SimEngine):
         self._block_cache = LRUCache(maxsize=self._cache_size)
         self._block_cache_hits = 0
         self._block_cache_misses = 0
+        self._plan_cache = LRUCache(maxsize=self._cache_size)
+
+    def get_plan(self, irsb):
+        """
+        Get the execution plan of an IRSB, building it if it has not been built yet.
+
+        Plans are keyed by the identity of the IRSB object. Since lifted blocks are cached, all states executing the
+        same block share a single plan. When the block cache is disabled, plans are not cached either.
+
+        :param irsb:    The pyvex IRSB.
+        :return:        An IRSBPlan.
+        """
+        if not self._use_cache:
+            return IRSBPlan(irsb)
+
+        key = id(irsb)
+        try:
+            plan = self._plan_cache[key]
+        except KeyError:
+            plan = None
+        if plan is None or plan.irsb is not irsb:
+            plan = IRSBPlan(irsb)
+            self._plan_cache[key] = plan
+        return plan
 
     def process(self, state,
             irsb=None,
@@ -216,9 +244,8 @@ class SimEngineVEX(SimEngine):
         successors.processed = True
 
     def _handle_irsb(self, state, successors, irsb, skip_stmts, last_stmt, whitelist):
-        # shortcut. we'll be typing this a lot
-        ss = irsb.statements
-        num_stmts = len(ss)
+        plan = self.get_plan(irsb)
+        num_stmts = len(plan.stmts)
 
         # fill in artifacts
         successors.artifacts['irsb'] = irsb
@@ -226,8 +253,6 @@ class SimEngineVEX(SimEngine):
         successors.artifacts['irsb_direct_next'] = irsb.direct_next
         successors.artifacts['irsb_default_jumpkind'] = irsb.jumpkind
 
-        insn_addrs = [ ]
-
         has_default_exit = True
         if irsb.next is None:
             l.warning("The .next property of IRSB %#x has an unexpected value None. "
@@ -241,21 +266,12 @@ class SimEngineVEX(SimEngine):
 
         # This option makes us only execute the last four instructions
         if o.SUPER_FASTPATH in state.options:
-            imark_counter = 0
-            for i in range(len(ss) - 1, -1, -1):
-                if type(ss[i]) is pyvex.IRStmt.IMark:
-                    imark_counter += 1
-                if imark_counter >= 4:
-                    skip_stmts = max(skip_stmts, i)
-                    break
+            skip_stmts = max(skip_stmts, plan.fastpath_skip)
 
         # set the current basic block address that's being processed
         state.scratch.bbl_addr = irsb.addr
 
-        for stmt_idx, stmt in enumerate(ss):
-            if isinstance(stmt, pyvex.IRStmt.IMark):
-                insn_addrs.append(stmt.addr + stmt.delta)
-
+        for stmt_idx, stmt, stmt_class, is_imark, is_exit in plan.stmts:
             if stmt_idx < skip_stmts:
                 l.debug("Skipping statement %d", stmt_idx)
                 continue
@@ -269,7 +285,8 @@ class SimEngineVEX(SimEngine):
             try:
                 state.scratch.stmt_idx = stmt_idx
                 state._inspect('statement', BP_BEFORE, statement=stmt_idx)
-                cont = self._handle_statement(state, successors, stmt)
+                cont = self._handle_statement(state, successors, stmt, stmt_class=stmt_class, is_imark=is_imark,
+                                              is_exit=is_exit)
                 state._inspect('statement', BP_AFTER)
                 if not cont:
                     return
@@ -289,7 +306,7 @@ class SimEngineVEX(SimEngine):
 
         state.scratch.stmt_idx = num_stmts
 
-        successors.artifacts['insn_addrs'] = insn_addrs
+        successors.artifacts['insn_addrs'] = list(plan.insn_addrs)
 
         # If there was an error, and not all the statements were processed,
         # then this block does not have a default exit. This can happen if
@@ -357,12 +374,19 @@ class SimEngineVEX(SimEngine):
             l.debug('Add an incomplete successor state as the result of an incomplete execution due to the white-list.')
             successors.flat_successors.append(state)
 
-    def _handle_statement(self, state, successors, stmt):
+    def _handle_statement(self, state, successors, stmt, stmt_class=None, is_imark=None, is_exit=None):
         """
         This function receives an initial state and imark and processes a list of pyvex.IRStmts
         It annotates the request with a final state, last imark, and a list of SimIRStmts
+
+        The statement class and kind can be passed in from a pre-translated IRSBPlan to avoid resolving them again.
         """
-        if type(stmt) == pyvex.IRStmt.IMark:
+        if is_imark is None:
+            is_imark = type(stmt) is pyvex.IRStmt.IMark
+        if is_exit is None:
+            is_exit = type(stmt) is pyvex.IRStmt.Exit
+
+        if is_imark:
             ins_addr = stmt.addr + stmt.delta
             state.scratch.ins_addr = ins_addr
 
@@ -377,13 +401,13 @@ class SimEngineVEX(SimEngine):
             state._inspect('instruction', BP_BEFORE, instruction=ins_addr)
 
         # process it!
-        s_stmt = translate_stmt(stmt, state)
+        s_stmt = translate_stmt(stmt, state, stmt_class=stmt_class)
         if s_stmt is not None:
             state.history.extend_actions(s_stmt.actions)
 
         # for the exits, put *not* taking the exit on the list of constraints so
         # that we can continue on. Otherwise, add the constraints
-        if type(stmt) == pyvex.IRStmt.Exit:
+        if is_exit:
             l.debug("%s adding conditional exit", self)
 
             # Produce our successor state!
@@ -696,6 +720,7 @@ class SimEngineVEX(SimEngine):
 
     def clear_cache(self):
         self._block_cache = LRUCache(maxsize=self._cache_size)
+        self._plan_cache = LRUCache(maxsize=self._cache_size)
 
         self._block_cache_hits = 0
         self._block_cache_misses = 0
@@ -1,15 +1,32 @@
+_expr_class_cache = { }
+
+def resolve_expr_class(expr_type):
+    """
+    Resolve the SimIRExpr class that handles a given pyvex expression type. Resolutions are cached per type, so the
+    class name is only built and looked up once.
+
+    :param expr_type:   The type of a pyvex IRExpr.
+    :return:            The SimIRExpr subclass, or None if the expression type is not supported.
+    """
+    try:
+        return _expr_class_cache[expr_type]
+    except KeyError:
+        pass
+
+    expr_name = 'SimIRExpr_' + expr_type.__name__.split('IRExpr')[-1].split('.')[-1]
+    expr_class = globals().get(expr_name, None)
+    _expr_class_cache[expr_type] = expr_class
+    return expr_class
+
 def translate_expr(expr, state):
-    expr_name = 'SimIRExpr_' + type(expr).__name__.split('IRExpr')[-1].split('.')[-1]
-    g = globals()
+    expr_class = resolve_expr_class(type(expr))
 
-    if expr_name not in g and o.BYPASS_UNSUPPORTED_IREXPR not in state.options:
-        raise UnsupportedIRExprError("Unsupported expression type %s" % (type(expr)))
-    elif expr_name not in g:
+    if expr_class is None:
+        if o.BYPASS_UNSUPPORTED_IREXPR not in state.options:
+            raise UnsupportedIRExprError("Unsupported expression type %s" % (type(expr)))
         expr_class = SimIRExpr_Unsupported
-    else:
-        expr_class = g[expr_name]
 
-    l.debug("Processing expression %s", expr_name)
+    l.debug("Processing expression %s", expr_class.__name__)
     e = expr_class(expr, state)
     e.process()
     return e
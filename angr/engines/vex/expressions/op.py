@@ -2,7 +2,7 @@
 from pyvex.expr import RdTmp, Get
 
 from .base import SimIRExpr
-from ..irop import translate
+from ..irop import translate, translate_inner, operations
 from .... import sim_options as o
 from ....errors import UnsupportedIROpError, SimOperationError
 from ....state_plugins.sim_action import SimActionOperation, SimActionObject
@@ -16,7 +16,11 @@ class SimIRExpr_Op(SimIRExpr):
         exprs = self._translate_exprs(self._expr.args)
 
         try:
-            self.expr = translate(self.state, self._expr.op, [ e.expr for e in exprs ])
+            irop = operations.get(self._expr.op, None)
+            if irop is not None:
+                self.expr = translate_inner(self.state, irop, [ e.expr for e in exprs ])
+            else:
+                self.expr = translate(self.state, self._expr.op, [ e.expr for e in exprs ])
 
             if o.TRACK_OP_ACTIONS in self.state.options:
                 action_objects = [ ]
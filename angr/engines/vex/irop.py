@@ -173,6 +173,10 @@ fp_ops = set()
 common_unsupported_generics = collections.Counter()
 
 
+def _to_signed(v, size):
+    return v - (1 << size) if v >> (size - 1) & 1 else v
+
+
 def supports_vector(f):
     f.supports_vector = True
     return f
@@ -356,6 +360,8 @@ class SimIROp(object):
             l.debug("... can't support operations")
             raise UnsupportedIROpError("no calculate function identified for %s" % self.name)
 
+        self._concrete_calculate = self._pick_concrete_calculate()
+
     def __repr__(self):
         return "<SimIROp %s>" % self.name
 
@@ -395,6 +401,139 @@ class SimIROp(object):
         else:
             return o
 
+    #
+    # Concrete evaluation
+    #
+
+    _concrete_mapped_ops = {
+        'Add': lambda a, b, mask: a + b,
+        'Sub': lambda a, b, mask: a - b,
+        'Mul': lambda a, b, mask: a * b,
+        'And': lambda a, b, mask: a & b,
+        'Or': lambda a, b, mask: a | b,
+        'Xor': lambda a, b, mask: a ^ b,
+        'Not': lambda a, mask: ~a,
+        'Shl': lambda a, b, mask: a << b if b < mask.bit_length() else 0,
+        'Shr': lambda a, b, mask: a >> b,
+    }
+
+    _concrete_compare_ops = {
+        'CmpEQ': operator.eq, 'CasCmpEQ': operator.eq,
+        'CmpNE': operator.ne, 'CasCmpNE': operator.ne, 'ExpCmpNE': operator.ne,
+        'CmpGT': operator.gt, 'CasCmpGT': operator.gt,
+        'CmpGE': operator.ge, 'CasCmpGE': operator.ge,
+        'CmpLT': operator.lt, 'CasCmpLT': operator.lt,
+        'CmpLE': operator.le, 'CasCmpLE': operator.le,
+        'CmpNEZ': operator.ne,
+    }
+
+    def _pick_concrete_calculate(self):
+        """
+        Find a function that evaluates this operation on Python integers, or None if there isn't one.
+        """
+        if self._float or self._vector_size is not None or self._vector_count is not None:
+            return None
+
+        calculate = self._calculate
+        if calculate == self._op_mapped:
+            if self._generic_name in self._concrete_mapped_ops or self._generic_name == 'Sar':
+                return self._concrete_op_mapped
+        elif calculate == self._op_zero_extend:
+            return self._concrete_op_zero_extend
+        elif calculate == self._op_sign_extend:
+            return self._concrete_op_sign_extend
+        elif calculate == self._op_extract or calculate == self._op_lo_half:
+            return self._concrete_op_lo_bits
+        elif calculate == self._op_hi_half:
+            return self._concrete_op_hi_half
+        elif calculate == self._op_concat:
+            return self._concrete_op_concat
+        elif self._generic_name in self._concrete_compare_ops and \
+                calculate == getattr(self, '_op_generic_%s' % self._generic_name, None):
+            return self._concrete_op_compare
+        return None
+
+    def calculate_concrete(self, *args):
+        """
+        Evaluate this operation on concrete arguments without building any intermediate AST.
+
+        :param args:    The claripy arguments of the operation.
+        :return:        A claripy BVV holding the result, or None if not all arguments are concrete bitvectors or the
+                        operation has no concrete implementation.
+        """
+        if self._concrete_calculate is None:
+            return None
+
+        values = [ ]
+        for a in args:
+            if not isinstance(a, claripy.ast.BV) or a.op != 'BVV':
+                return None
+            values.append((a.args[0], a.args[1]))
+
+        value, size = self._concrete_calculate(values)
+        if size < self._output_size_bits:
+            if self._to_signed == 'S' or (self._from_signed == 'S' and self._to_signed is None):
+                value = _to_signed(value, size)
+            size = self._output_size_bits
+        elif size > self._output_size_bits:
+            raise SimOperationError('output of %s is too big' % self.name)
+        return claripy.BVV(value & ((1 << size) - 1), size)
+
+    def _concrete_sized_args(self, values):
+        if self._from_size is None:
+            return values, values[0][1]
+        sized = [ ]
+        for v, s in values:
+            if s > self._from_size:
+                raise SimOperationError("operation %s received too large an argument" % self.name)
+            if s < self._from_size and self.is_signed:
+                v = _to_signed(v, s) & ((1 << self._from_size) - 1)
+            sized.append((v, self._from_size))
+        return sized, self._from_size
+
+    def _concrete_op_mapped(self, values):
+        values, size = self._concrete_sized_args(values)
+        mask = (1 << size) - 1
+        if self._generic_name == 'Sar':
+            a, b = values[0][0], values[1][0]
+            # like claripy's concrete arithmetic shift, shifting by the width or more gives zero, not the sign
+            if b >= size:
+                return 0, size
+            return (_to_signed(a, size) >> b) & mask, size
+        return self._concrete_mapped_ops[self._generic_name](*([ v for v, _ in values ] + [ mask ])) & mask, size
+
+    def _concrete_op_compare(self, values):
+        if self._generic_name == 'CmpNEZ':
+            return int(values[0][0] != 0), 1
+
+        (a, size), (b, _) = values
+        if self.is_signed:
+            a, b = _to_signed(a, size), _to_signed(b, size)
+        return int(self._concrete_compare_ops[self._generic_name](a, b)), 1
+
+    def _concrete_op_zero_extend(self, values):
+        return values[0][0], self._to_size
+
+    def _concrete_op_sign_extend(self, values):
+        v, s = values[0]
+        return _to_signed(v, s) & ((1 << self._to_size) - 1), self._to_size
+
+    def _concrete_op_lo_bits(self, values):
+        v, s = values[0]
+        size = self._to_size if self._calculate == self._op_extract else s // 2
+        return v & ((1 << size) - 1), size
+
+    def _concrete_op_hi_half(self, values):
+        v, s = values[0]
+        return v >> (s // 2), s - s // 2
+
+    def _concrete_op_concat(self, values):
+        result, size = 0, 0
+        for v, s in values:
+            result = (result << s) | v
+            size += s
+        return result, size
+
     @property
     def is_signed(self):
         return self._from_signed == 'S' or self._vector_signed == 'S'
@@ -969,6 +1108,10 @@ def translate_inner(state, irop, s_args):
     try:
         if irop._float and not options.SUPPORT_FLOATING_POINT in state.options:
             raise UnsupportedIROpError("floating point support disabled")
+        if options.FAST_CONCRETE_OPS in state.options:
+            r = irop.calculate_concrete(*s_args)
+            if r is not None:
+                return r
         return irop.calculate(*s_args)
     except SimZeroDivisionException:
         if state.mode == 'static' and len(s_args) == 2 and state.solver.is_true(s_args[1] == 0):
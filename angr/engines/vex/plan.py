@@ -0,0 +1,45 @@
+import pyvex
+
+from .statements import resolve_stmt_class
+from .expressions import resolve_expr_class
+
+
+class IRSBPlan:
+    """
+    A pre-translated execution plan for a lifted IRSB.
+
+    Building a plan resolves everything about an IRSB that does not depend on the state being executed: the SimIRStmt
+    class handling each statement, the instruction addresses, and where SUPER_FASTPATH starts. Plans are built once per
+    IRSB and are shared by every state that executes the block.
+    """
+
+    __slots__ = ('irsb', 'stmts', 'insn_addrs', 'fastpath_skip', )
+
+    def __init__(self, irsb):
+        self.irsb = irsb
+
+        # each entry is (stmt_idx, stmt, stmt_class, is_imark, is_exit)
+        self.stmts = [ ]
+        self.insn_addrs = [ ]
+
+        imark_positions = [ ]
+        for stmt_idx, stmt in enumerate(irsb.statements):
+            stmt_type = type(stmt)
+            is_imark = stmt_type is pyvex.IRStmt.IMark
+            if is_imark:
+                self.insn_addrs.append(stmt.addr + stmt.delta)
+                imark_positions.append(stmt_idx)
+
+            self.stmts.append((stmt_idx, stmt, resolve_stmt_class(stmt_type), is_imark, stmt_type is pyvex.IRStmt.Exit))
+
+            for expr in stmt.expressions:
+                resolve_expr_class(type(expr))
+
+        # the index of the statement SUPER_FASTPATH starts at: the fourth IMark from the end of the block
+        self.fastpath_skip = imark_positions[-4] if len(imark_positions) >= 4 else 0
+
+        if irsb.next is not None:
+            resolve_expr_class(type(irsb.next))
+
+    def __repr__(self):
+        return "<IRSBPlan for %#x, %d statements>" % (self.irsb.addr, len(self.stmts))
@@ -20,11 +20,30 @@ from .puti import SimIRStmt_PutI
 import logging
 l = logging.getLogger(name=__name__)
 
-def translate_stmt(stmt, state):
-    stmt_name = 'SimIRStmt_' +  type(stmt).__name__.split('IRStmt')[-1].split('.')[-1]
+_stmt_class_cache = { }
 
-    if stmt_name in globals():
-        stmt_class = globals()[stmt_name]
+def resolve_stmt_class(stmt_type):
+    """
+    Resolve the SimIRStmt class that handles a given pyvex statement type. Resolutions are cached per type.
+
+    :param stmt_type:   The type of a pyvex IRStmt.
+    :return:            The SimIRStmt subclass, or None if the statement type is not supported.
+    """
+    try:
+        return _stmt_class_cache[stmt_type]
+    except KeyError:
+        pass
+
+    stmt_name = 'SimIRStmt_' + stmt_type.__name__.split('IRStmt')[-1].split('.')[-1]
+    stmt_class = globals().get(stmt_name, None)
+    _stmt_class_cache[stmt_type] = stmt_class
+    return stmt_class
+
+def translate_stmt(stmt, state, stmt_class=None):
+    if stmt_class is None:
+        stmt_class = resolve_stmt_class(type(stmt))
+
+    if stmt_class is not None:
         s = stmt_class(stmt, state)
         s.process()
         return s
@@ -171,7 +171,7 @@ from .slicecutor import Slicecutor
 from .cacher import Cacher
 from .driller_core import DrillerCore
 from .loop_seer import LoopSeer
-from .tracer import Tracer
+from .tracer import Tracer, BlockTrace
 from .explorer import Explorer
 from .threading import Threading
 from .dfs import DFS
@@ -187,3 +187,5 @@ from .unique import UniqueSearch
 from .symbion import Symbion
 from ..errors import AngrError, AngrExplorationTechniqueError
 from .memory_watcher import MemoryWatcher
+from .profiler import Profiler
+from .memory_budget import MemoryBudget
@@ -0,0 +1,146 @@
+import logging
+
+from . import ExplorationTechnique
+from ..errors import AngrExplorationTechniqueError
+from ..state_footprint import estimate_footprint, history_node_size
+
+l = logging.getLogger(name=__name__)
+
+
+class MemoryBudget(ExplorationTechnique):
+    """
+    Keep the memory held by the states of a simulation manager under a budget.
+
+    After each step, the memory held by all states of the simulation manager is estimated with
+    :func:`angr.state_footprint.estimate_footprint`. While the estimate is over the budget, the actions of the policy
+    are applied, in order, to states of the source stash:
+
+    - ``downsize``: discard the solver caches and the ancestry of the state. Anything that walks the history of the
+      state, such as ``state.history.bbl_addrs``, will only see the latest step afterwards.
+    - ``spill``: store the state in a vault and remove it from the simulation manager. Spilled states are loaded back
+      once the source stash runs empty.
+    - ``drop``: discard the state.
+
+    :param int budget:          The budget, in MB.
+    :param policy:              The actions to take, in order. (default: downsize, then spill)
+    :param str src_stash:       The stash from which states are downsized, spilled or dropped.
+    :param priority_key:        A function that takes a state and returns its priority. The actions are applied to the
+                                states with the highest value first. By default, they are applied to the states that
+                                hold the most memory of their own first.
+    :param int interval:        Only check the budget every this many steps.
+    :param int reload_count:    The number of spilled states to load back at a time.
+    :param vault:               An angr.Vault object to spill states to. If not provided, an angr.vaults.VaultShelf will
+                                be created with a temporary file.
+    """
+
+    ACTIONS = ('downsize', 'spill', 'drop')
+
+    def __init__(self, budget, policy=('downsize', 'spill'), src_stash='active', priority_key=None, interval=1,
+                 reload_count=10, vault=None):
+        super(MemoryBudget, self).__init__()
+
+        for action in policy:
+            if action not in self.ACTIONS:
+                raise AngrExplorationTechniqueError("Unknown memory budget action %r." % action)
+        if 'spill' in policy and vault is None:
+            vault = vaults.VaultShelf()
+
+        self.budget = budget * 1024 * 1024
+        self.policy = tuple(policy)
+        self.src_stash = src_stash
+        self.priority_key = priority_key
+        self.interval = interval
+        self.reload_count = reload_count
+        self._vault = vault
+
+        self._steps = 0
+        self._spilled = [ ]
+        self.last_footprint = None
+
+        self.downsized = 0
+        self.spilled = 0
+        self.reloaded = 0
+        self.dropped = 0
+
+    def step(self, simgr, stash='active', **kwargs):
+        simgr = simgr.step(stash=stash, **kwargs)
+
+        self._steps += 1
+        if self._steps % self.interval == 0:
+            self.enforce(simgr)
+
+        # load spilled states back before the simulation manager runs out of states to step
+        if self._spilled and not simgr.stashes[self.src_stash]:
+            self._reload(simgr)
+        return simgr
+
+    def enforce(self, simgr):
+        """
+        Estimate the memory held by the states of a simulation manager, and apply the policy until it is under the
+        budget.
+
+        :param simgr:   The simulation manager.
+        :return:        The estimated number of bytes held after the policy has been applied.
+        """
+        all_states = [ s for stash, states in simgr.stashes.items() if stash != '_DROP' for s in states ]
+        footprint = estimate_footprint(all_states)
+        self.last_footprint = footprint
+        total = footprint.total
+        if total <= self.budget:
+            return total
+
+        l.info("States hold an estimated %d MB, over the budget of %d MB.", total // 2**20, self.budget // 2**20)
+
+        src_ids = { id(s) for s in simgr.stashes[self.src_stash] }
+        candidates = [ fp for fp in footprint.states if id(fp.state) in src_ids ]
+        if self.priority_key is None:
+            candidates.sort(key=lambda fp: fp.exclusive, reverse=True)
+        else:
+            candidates.sort(key=lambda fp: self.priority_key(fp.state), reverse=True)
+
+        removed = set()
+        for action in self.policy:
+            for fp in candidates:
+                if total <= self.budget:
+                    break
+                if id(fp.state) in removed:
+                    continue
+
+                if action == 'downsize':
+                    total -= self._downsize(fp)
+                else:
+                    if action == 'spill':
+                        self._spilled.append(self._vault.store(fp.state))
+                        self.spilled += 1
+                    else:
+                        self.dropped += 1
+                    removed.add(id(fp.state))
+                    total -= fp.exclusive
+
+        if removed:
+            simgr.stashes[self.src_stash] = [ s for s in simgr.stashes[self.src_stash] if id(s) not in removed ]
+
+        if total > self.budget:
+            l.warning("States still hold an estimated %d MB after applying the memory budget policy.", total // 2**20)
+        return total
+
+    def _downsize(self, fp):
+        state = fp.state
+        state.downsize()
+        # only the ancestry that no other state shares is freed by trimming it
+        if fp.history_nodes <= 1:
+            return 0
+
+        state.history.trim()
+        self.downsized += 1
+        freed = fp.history - history_node_size(state.history)
+        fp.history -= freed
+        return freed
+
+    def _reload(self, simgr):
+        sids = self._spilled[-self.reload_count:]
+        del self._spilled[-self.reload_count:]
+        simgr.stashes[self.src_stash].extend(self._vault.load(sid) for sid in sids)
+        self.reloaded += len(sids)
+
+from .. import vaults
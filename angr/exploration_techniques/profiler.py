@@ -0,0 +1,117 @@
+import json
+import time
+
+from . import ExplorationTechnique
+from ..misc import profiling
+
+
+class Profiler(ExplorationTechnique):
+    """
+    Profile the steps of a simulation manager.
+
+    While the simulation manager steps, the time spent in each engine, in each block and in each kind of solver query
+    is accounted, along with the number of states stepped and how many of them forked or were pruned. Profiling only
+    happens inside the steps taken by this technique, so other simulation managers and the rest of the program are not
+    slowed down. The results are available as a dict from :meth:`report` and as JSON from :meth:`to_json`.
+
+    :param int top_blocks:  The number of blocks to list in the report, hottest first.
+    """
+
+    def __init__(self, top_blocks=20):
+        super(Profiler, self).__init__()
+        self.top_blocks = top_blocks
+        self.counters = profiling.ProfileCounters()
+
+        self.steps = 0
+        self.wall_time = 0.0
+        self.max_step_time = 0.0
+        self.states_stepped = 0
+        self.successors_produced = 0
+        self.forks = 0
+        self.prunes = 0
+
+    def step(self, simgr, stash='active', **kwargs):
+        previous = profiling.start(self.counters)
+        start = time.perf_counter()
+        try:
+            simgr = simgr.step(stash=stash, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            profiling.stop(previous)
+
+        self.steps += 1
+        self.wall_time += elapsed
+        self.max_step_time = max(self.max_step_time, elapsed)
+        return simgr
+
+    def step_state(self, simgr, state, **kwargs):
+        stashes = simgr.step_state(state, **kwargs)
+
+        successors = len(stashes.get(None, ()))
+        self.states_stepped += 1
+        self.successors_produced += successors
+        if successors > 1:
+            self.forks += successors - 1
+        self.prunes += len(stashes.get('unsat', ())) + len(stashes.get('pruned', ()))
+        return stashes
+
+    def reset(self):
+        """
+        Discard everything that has been profiled so far.
+        """
+        self.counters.clear()
+        self.steps = 0
+        self.wall_time = 0.0
+        self.max_step_time = 0.0
+        self.states_stepped = 0
+        self.successors_produced = 0
+        self.forks = 0
+        self.prunes = 0
+
+    @staticmethod
+    def _entries(counts):
+        return {name: {'count': count, 'time': duration} for name, (count, duration) in counts.items()}
+
+    def report(self):
+        """
+        Summarize the profile.
+
+        :return:    A dict of plain values, which can be serialized as JSON.
+        :rtype:     dict
+        """
+        blocks = sorted(self.counters.blocks.items(), key=lambda item: item[1][1], reverse=True)[:self.top_blocks]
+        stepped = self.states_stepped
+
+        return {
+            'steps': self.steps,
+            'wall_time': self.wall_time,
+            'mean_step_time': self.wall_time / self.steps if self.steps else 0.0,
+            'max_step_time': self.max_step_time,
+            'states_stepped': stepped,
+            'states_per_second': stepped / self.wall_time if self.wall_time else 0.0,
+            'successors': self.successors_produced,
+            'forks': self.forks,
+            'fork_rate': self.forks / stepped if stepped else 0.0,
+            'prunes': self.prunes,
+            'prune_rate': self.prunes / stepped if stepped else 0.0,
+            'engines': self._entries(self.counters.engines),
+            'solver': self._entries(self.counters.solver),
+            'blocks': [
+                {'addr': addr if type(addr) is int else str(addr), 'count': count, 'time': duration}
+                for addr, (count, duration) in blocks
+            ],
+        }
+
+    def to_json(self, path=None):
+        """
+        Export the profile as JSON.
+
+        :param str path:    A file to write the report to.
+        :return:            The report, as a JSON string.
+        :rtype:             str
+        """
+        s = json.dumps(self.report(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(s)
+        return s
@@ -1,5 +1,10 @@
 from typing import List
+from bisect import bisect_left
+from collections import defaultdict
+import array
 import logging
+import mmap
+import sys
 
 from . import ExplorationTechnique
 from .. import BP_BEFORE, BP_AFTER, sim_options
@@ -8,6 +13,158 @@ from ..errors import AngrTracerError
 l = logging.getLogger(name=__name__)
 
 
+class BlockTrace(object):
+    """
+    A basic block trace, i.e. a sequence of (translated) basic block addresses, stored as a typed array.
+
+    A trace can be built around any indexable sequence of addresses, or loaded from a binary file of fixed-size
+    addresses with `BlockTrace.load()`. Loaded traces are memory mapped, so that even very long traces only occupy
+    address space instead of gigabytes of Python ints.
+
+    Searching for an address with `index()` uses a per-address index of sorted occurrences, which is built on the first
+    search. Each subsequent search is a binary search instead of a linear scan of the trace.
+    """
+
+    _TYPECODES = {4: 'I', 8: 'Q'}
+
+    def __init__(self, addrs):
+        """
+        :param addrs:   The block addresses, as a list, an array.array or a memoryview of ints.
+        """
+        self._addrs = addrs
+        self._mmap = None
+        self._occurrences = None
+
+    @classmethod
+    def load(cls, path, word_size=8, byteorder='little'):
+        """
+        Load a trace from a binary file, as written by `BlockTrace.dump()`.
+
+        :param str path:        Path to the trace file.
+        :param int word_size:   The size of each address in the file, in bytes (4 or 8).
+        :param str byteorder:   The byte order of the addresses in the file, 'little' or 'big'.
+        :return:                The trace.
+        :rtype:                 BlockTrace
+        """
+        typecode = cls._typecode(word_size)
+
+        with open(path, 'rb') as f:
+            if byteorder != sys.byteorder:
+                # the file cannot be used as-is, so it has to be read in and swapped
+                addrs = array.array(typecode)
+                addrs.frombytes(f.read())
+                addrs.byteswap()
+                return cls(addrs)
+
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty file
+                return cls(array.array(typecode))
+
+        if len(mm) % word_size != 0:
+            mm.close()
+            raise AngrTracerError("The size of trace file %s is not a multiple of %d" % (path, word_size))
+
+        trace = cls(memoryview(mm).cast(typecode))
+        trace._mmap = mm
+        return trace
+
+    @classmethod
+    def dump(cls, addrs, path, word_size=8, chunk_size=0x100000):
+        """
+        Write a sequence of block addresses to a binary trace file. Addresses are consumed in chunks, so `addrs` can be
+        a generator over a trace that does not fit in memory.
+
+        :param addrs:           An iterable of block addresses.
+        :param str path:        Path to the trace file.
+        :param int word_size:   The size of each address in the file, in bytes (4 or 8).
+        :param int chunk_size:  The number of addresses to buffer before writing them out.
+        :return:                The number of addresses written.
+        """
+        typecode = cls._typecode(word_size)
+
+        count = 0
+        chunk = array.array(typecode)
+        with open(path, 'wb') as f:
+            for addr in addrs:
+                chunk.append(addr)
+                if len(chunk) >= chunk_size:
+                    chunk.tofile(f)
+                    count += len(chunk)
+                    chunk = array.array(typecode)
+            chunk.tofile(f)
+            count += len(chunk)
+
+        return count
+
+    @classmethod
+    def _typecode(cls, word_size):
+        try:
+            return cls._TYPECODES[word_size]
+        except KeyError:
+            raise AngrTracerError("Unsupported trace word size %d" % word_size)
+
+    def close(self):
+        """
+        Release the underlying mapping of a trace loaded from a file. The trace must not be used afterwards.
+        """
+        if self._mmap is not None:
+            self._addrs.release()
+            self._mmap.close()
+            self._mmap = None
+        self._addrs = array.array('Q')
+        self._occurrences = None
+
+    def __len__(self):
+        return len(self._addrs)
+
+    def __getitem__(self, idx):
+        return self._addrs[idx]
+
+    def __iter__(self):
+        return iter(self._addrs)
+
+    def __repr__(self):
+        return "<BlockTrace of %d blocks>" % len(self)
+
+    def _build_occurrences(self):
+        occurrences = defaultdict(lambda: array.array('Q'))
+        for idx, addr in enumerate(self._addrs):
+            occurrences[addr].append(idx)
+        self._occurrences = dict(occurrences)
+
+    def occurrences(self, addr):
+        """
+        Get all positions at which an address appears in the trace.
+
+        :param int addr:    The block address.
+        :return:            The positions, in increasing order.
+        """
+        if self._occurrences is None:
+            self._build_occurrences()
+        return self._occurrences.get(addr, ())
+
+    def index(self, addr, start=0, end=None):
+        """
+        Find the first position of an address in the trace, like list.index().
+
+        :param int addr:    The block address.
+        :param int start:   The position to start searching from.
+        :param int end:     The position to stop searching at (exclusive).
+        :return:            The position of the first occurrence of `addr` in [start, end).
+        :raises ValueError: If the address does not appear in that range.
+        """
+        positions = self.occurrences(addr)
+        i = bisect_left(positions, start)
+        if i < len(positions) and (end is None or positions[i] < end):
+            return positions[i]
+        raise ValueError("%#x is not in the trace" % addr)
+
+    def count(self, addr):
+        return len(self.occurrences(addr))
+
+
 class Tracer(ExplorationTechnique):
     """
     An exploration technique that follows an angr path with a concrete input.
@@ -17,7 +174,7 @@ class Tracer(ExplorationTechnique):
     If the given concrete input makes the program crash, you should provide crash_addr, and the
     crashing state will be found in the 'crashed' stash.
 
-    :param trace:               The basic block trace.
+    :param trace:               The basic block trace, as a list of addresses or a BlockTrace.
     :param resiliency:          Should we continue to step forward even if qemu and angr disagree?
     :param keep_predecessors:   Number of states before the final state we should log.
     :param crash_addr:          If the trace resulted in a crash, provide the crashing instruction
@@ -40,6 +197,8 @@ class Tracer(ExplorationTechnique):
             crash_addr=None,
             copy_states=False):
         super(Tracer, self).__init__()
+        if trace is not None and not isinstance(trace, BlockTrace):
+            trace = BlockTrace(trace)
         self._trace = trace
         self._resiliency = resiliency
         self._crash_addr = crash_addr
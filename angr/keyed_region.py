@@ -103,14 +103,19 @@ class KeyedRegion:
     this region overlap with another variable in this region.
 
     Registers and function frames can all be viewed as a keyed region.
+
+    Copies are copy-on-write: a copy shares the storage and all region objects with the original, the storage is
+    shallow-copied the first time either of them is modified, and a region object is only copied when it is modified.
     """
 
-    __slots__ = ('_storage', '_object_mapping', '_phi_node_contains' )
+    __slots__ = ('_storage', '_object_mapping', '_phi_node_contains', '_cowed', )
 
     def __init__(self, tree=None, phi_node_contains=None):
         self._storage = SortedDict() if tree is None else tree
         self._object_mapping = weakref.WeakValueDictionary()
         self._phi_node_contains = phi_node_contains
+        # ids of region objects owned by this KeyedRegion, or None if the storage itself is shared with other copies
+        self._cowed = set()
 
     def __getstate__(self):
         return self._storage, dict(self._object_mapping), self._phi_node_contains
@@ -118,6 +123,7 @@ class KeyedRegion:
     def __setstate__(self, s):
         self._storage, om, self._phi_node_contains = s
         self._object_mapping = weakref.WeakValueDictionary(om)
+        self._cowed = None
 
     def _get_container(self, offset):
         try:
@@ -150,11 +156,15 @@ class KeyedRegion:
         return iter(self._storage.values())
 
     def __eq__(self, other):
+        if self._storage is other._storage:
+            return True
+
         if set(self._storage.keys()) != set(other._storage.keys()):
             return False
 
         for k, v in self._storage.items():
-            if v != other._storage[k]:
+            other_v = other._storage[k]
+            if v is not other_v and v != other_v:
                 return False
 
         return True
@@ -163,10 +173,11 @@ class KeyedRegion:
         if not self._storage:
             return KeyedRegion(phi_node_contains=self._phi_node_contains)
 
-        kr = KeyedRegion(phi_node_contains=self._phi_node_contains)
-        for key, ro in self._storage.items():
-            kr._storage[key] = ro.copy()
-        kr._object_mapping = self._object_mapping.copy()
+        kr = KeyedRegion(tree=self._storage, phi_node_contains=self._phi_node_contains)
+        kr._object_mapping = self._object_mapping
+        # from now on, both KeyedRegions share the storage, all region objects, and the object mapping
+        kr._cowed = None
+        self._cowed = None
         return kr
 
     def merge(self, other, replacements=None):
@@ -177,11 +188,29 @@ class KeyedRegion:
         :return: None
         """
 
-        # TODO: is the current solution not optimal enough?
-        for _, item in other._storage.items():  # type: RegionObject
+        if other._storage is self._storage and not replacements:
+            # both regions are unmodified copies of the same region. storing objects again would only update the
+            # object mapping
+            for item in other._storage.values():
+                for so in item.stored_objects:
+                    if self._object_mapping.get(so.obj_id, None) is not so:
+                        self._make_writable()
+                        self._object_mapping[so.obj_id] = so
+            return self
+
+        self._make_writable()
+
+        for key, item in other._storage.items():  # type: RegionObject
+            # a region object shared by both regions does not need to be stored again if every object in it covers
+            # exactly this region object
+            shared = self._storage.get(key, None) is item
+
             for so in item.stored_objects:  # type: StoredObject
                 if replacements and so.obj in replacements:
                     so = StoredObject(so.start, replacements[so.obj], so.size)
+                elif shared and so.start == item.start and so.size == item.size:
+                    self._object_mapping[so.obj_id] = so
+                    continue
                 self._object_mapping[so.obj_id] = so
                 self.__store(so, overwrite=False)
 
@@ -322,6 +351,34 @@ class KeyedRegion:
     # Private methods
     #
 
+    def _make_writable(self):
+        """
+        Make sure the storage and the object mapping are not shared with any other KeyedRegion.
+
+        :return: None
+        """
+
+        if self._cowed is None:
+            self._storage = self._storage.copy()
+            self._object_mapping = self._object_mapping.copy()
+            self._cowed = set()
+
+    def _get_writable_item(self, key):
+        """
+        Get the region object at the given key, copying it first if it is shared with another KeyedRegion.
+
+        :param int key: The key of the region object.
+        :return: The region object.
+        :rtype: RegionObject
+        """
+
+        item = self._storage[key]
+        if id(item) not in self._cowed:
+            item = item.copy()
+            self._storage[key] = item
+            self._cowed.add(id(item))
+        return item
+
     def _store(self, start, obj, size, overwrite=False):
         """
         Store a variable into the storage.
@@ -333,6 +390,8 @@ class KeyedRegion:
         :return: None
         """
 
+        self._make_writable()
+
         stored_object = StoredObject(start, obj, size)
         self._object_mapping[stored_object.obj_id] = stored_object
         self.__store(stored_object, overwrite=overwrite)
@@ -393,6 +452,7 @@ class KeyedRegion:
                 to_update[b.start] = b
                 last_end = b.end
             else:
+                item = self._get_writable_item(floor_key)
                 if overwrite:
                     item.set_object(stored_object)
                 else:
@@ -400,6 +460,7 @@ class KeyedRegion:
                 to_update[item.start] = item
 
         self._storage.update(to_update)
+        self._cowed.update(id(item) for item in to_update.values())
 
     def _is_overlapping(self, start, variable):
 
@@ -12,6 +12,8 @@ class KnowledgeBase(object):
         object.__setattr__(self, '_project', project)
         object.__setattr__(self, 'obj', obj)
         object.__setattr__(self, '_plugins', {})
+        # an optional KnowledgeBaseStore that plugins are loaded from on first access
+        object.__setattr__(self, '_storage', None)
 
     @property
     def callgraph(self):
@@ -29,6 +31,7 @@ class KnowledgeBase(object):
         object.__setattr__(self, '_project', state['project'])
         object.__setattr__(self, 'obj', state['obj'])
         object.__setattr__(self, '_plugins', state['plugins'])
+        object.__setattr__(self, '_storage', None)
 
     def __getstate__(self):
         s = {
@@ -63,7 +66,10 @@ class KnowledgeBase(object):
 
     def get_plugin(self, name):
         if name not in self._plugins:
-            p = default_plugins[name](self)
+            if self._storage is not None and self._storage.has_object(name):
+                p = self._storage.load_object(self, name)
+            else:
+                p = default_plugins[name](self)
             self.register_plugin(name, p)
             return p
         return self._plugins[name]
@@ -5,4 +5,6 @@ from .comments import Comments
 from .data import Data
 from .indirect_jumps import IndirectJumps
 from .labels import Labels
+from .veritesting_regions import VeritestingRegions, VeritestingRegion
 from .plugin import KnowledgeBasePlugin
+from .storage import KnowledgeBaseStore
@@ -26,7 +26,7 @@ class Function:
                  'bp_on_stack', 'retaddr_on_stack', 'sp_delta', 'calling_convention', 'prototype', '_returning',
                  'prepared_registers', 'prepared_stack_variables', 'registers_read_afterwards',
                  'startpoint', '_addr_to_block_node', '_block_sizes', '_block_cache', '_local_blocks',
-                 '_local_block_addrs', 'info', 'tags',
+                 '_local_block_addrs', 'info', 'tags', '_cache',
                  )
 
     def __init__(self, function_manager, addr, name=None, syscall=None):
@@ -146,6 +146,7 @@ class Function:
         self._addr_to_block_node = {}  # map addresses to nodes
         self._block_sizes = {}  # map addresses to block sizes
         self._block_cache = {}  # a cache of real, hard data Block objects
+        self._cache = { }  # properties derived from the blocks and the graph. cleared whenever the function is modified
         self._local_blocks = {} # a dict of all blocks inside the function
         self._local_block_addrs = set()  # a set of addresses of all blocks inside the function
 
@@ -253,17 +254,27 @@ class Function:
     @property
     def operations(self):
         """
-        All of the operations that are done by this functions.
+        All of the operations that are done by this functions. The result is cached until the function is modified.
         """
-        return [op for block in self.blocks for op in block.vex.operations]
+        try:
+            operations = self._cache['operations']
+        except KeyError:
+            operations = self._cache['operations'] = [op for block in self.blocks for op in block.vex.operations]
+        return list(operations)
 
     @property
     def code_constants(self):
         """
-        All of the constants that are used by this functions's code.
+        All of the constants that are used by this functions's code. The result is cached until the function is
+        modified.
         """
-        # TODO: remove link register values
-        return [const.value for block in self.blocks for const in block.vex.constants]
+        try:
+            constants = self._cache['code_constants']
+        except KeyError:
+            # TODO: remove link register values
+            constants = self._cache['code_constants'] = [const.value for block in self.blocks
+                                                         for const in block.vex.constants]
+        return list(constants)
 
     def string_references(self, minimum_length=2, vex_only=False):
         """
@@ -274,16 +285,21 @@ class Function:
         :return:                A list of tuples of (address, string) where is address is the location of the string in
                                 memory.
         """
+        # the result depends on the graphs of all functions, so it is cached until any function is modified
+        key = ('string_references', minimum_length, vex_only)
+        version = self._function_manager.graph_version
+        cached = self._cache.get(key, None)
+        if cached is not None and cached[0] == version:
+            return list(cached[1])
+
         strings = []
         memory = self._project.loader.memory
 
         # get known instruction addresses and call targets
         # these addresses cannot be string references, but show up frequently in the runtime values
-        known_executable_addresses = set()
+        known_executable_addresses = set(self._function_manager.node_addrs())
         for block in self.blocks:
             known_executable_addresses.update(block.instruction_addrs)
-        for function in self._function_manager.values():
-            known_executable_addresses.update(set(x.addr for x in function.graph.nodes()))
 
         # loop over all local runtime values and check if the value points to a printable string
         for addr in self.local_runtime_values if not vex_only else self.code_constants:
@@ -307,7 +323,9 @@ class Function:
                             strings.append((addr, stn))
                 except KeyError:
                     pass
-        return strings
+
+        self._cache[key] = (version, strings)
+        return list(strings)
 
     @property
     def local_runtime_values(self):
@@ -316,9 +334,19 @@ class Function:
         These values are generated by starting from a blank state and reanalyzing the basic blocks once each.
         Function calls are skipped, and back edges are never taken so these values are often unreliable,
         This function is good at finding simple constant addresses which the function will use or calculate.
+        The result is cached until the function is modified.
 
         :return: a set of constants
         """
+        try:
+            return set(self._cache['local_runtime_values'])
+        except KeyError:
+            pass
+
+        constants = self._cache['local_runtime_values'] = self._local_runtime_values()
+        return set(constants)
+
+    def _local_runtime_values(self):
         constants = set()
 
         if not self._project.loader.main_object.contains_addr(self.addr):
@@ -522,7 +550,7 @@ class Function:
         self._block_sizes = {}
         self.startpoint = None
         self.transition_graph = networkx.DiGraph()
-        self._local_transition_graph = None
+        self._clear_cache()
 
     def _confirm_fakeret(self, src, dst):
 
@@ -539,6 +567,7 @@ class Function:
             self._register_nodes(True, dst)
 
         self.transition_graph[src][dst]['confirmed'] = True
+        self._clear_cache()
 
     def _transit_to(self, from_node, to_node, outside=False, ins_addr=None, stmt_idx=None):
         """
@@ -574,8 +603,7 @@ class Function:
             # this node is an endpoint of the current function
             self._add_endpoint(from_node, 'transition')
 
-        # clear the cache
-        self._local_transition_graph = None
+        self._clear_cache()
 
     def _call_to(self, from_node, to_func, ret_node, stmt_idx=None, ins_addr=None, return_to_outside=False):
         """
@@ -603,7 +631,7 @@ class Function:
             if ret_node is not None:
                 self._fakeret_to(from_node, ret_node, to_outside=return_to_outside)
 
-        self._local_transition_graph = None
+        self._clear_cache()
 
     def _fakeret_to(self, from_node, to_node, confirmed=None, to_outside=False):
         self._register_nodes(True, from_node)
@@ -617,12 +645,12 @@ class Function:
             if confirmed:
                 self._register_nodes(not to_outside, to_node)
 
-        self._local_transition_graph = None
+        self._clear_cache()
 
     def _remove_fakeret(self, from_node, to_node):
         self.transition_graph.remove_edge(from_node, to_node)
 
-        self._local_transition_graph = None
+        self._clear_cache()
 
     def _return_from_call(self, from_func, to_node, to_outside=False):
         self.transition_graph.add_edge(from_func, to_node, type='real_return', to_outside=to_outside)
@@ -630,7 +658,7 @@ class Function:
             if 'type' in data and data['type'] == 'fake_return':
                 data['confirmed'] = True
 
-        self._local_transition_graph = None
+        self._clear_cache()
 
     def _register_nodes(self, is_local, *nodes):
         if not isinstance(is_local, bool):
@@ -655,6 +683,19 @@ class Function:
                 #    # checks that we don't have multiple block nodes at a single address
                 #    assert node == self._addr_to_block_node[node.addr]
 
+        self._clear_cache()
+
+    def _clear_cache(self):
+        """
+        Drop the local transition graph and all other cached properties. This must be called whenever the transition
+        graph or the blocks of this function change.
+
+        :return: None
+        """
+        self._local_transition_graph = None
+        self._cache.clear()
+        self._function_manager._function_changed(self)
+
     def _add_return_site(self, return_site):
         """
         Registers a basic block as a site for control flow to return from this function.
@@ -1048,8 +1089,7 @@ class Function:
         if self.startpoint.size != self._block_sizes[self.startpoint.addr]:
             self.startpoint = self.get_node(self.startpoint.addr)
 
-        # Clear the cache
-        self._local_transition_graph = None
+        self._clear_cache()
 
         self.normalized = True
 
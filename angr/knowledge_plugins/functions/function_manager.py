@@ -57,6 +57,16 @@ class FunctionDict(SortedDict):
         except StopIteration:
             raise KeyError(addr)
 
+    def functions_named(self, name):
+        """
+        Iterate over all functions with the given name.
+
+        :param str name:    Name of the function.
+        """
+        for func in self.values():
+            if func.name == name:
+                yield func
+
 
 class FunctionManager(KnowledgeBasePlugin, collections.Mapping):
     """
@@ -72,6 +82,11 @@ class FunctionManager(KnowledgeBasePlugin, collections.Mapping):
         self.callgraph = networkx.MultiDiGraph()
         self.block_map = {}
 
+        # incremented whenever a function is added, removed or modified. used to invalidate caches that depend on the
+        # graphs of more than one function
+        self.graph_version = 0
+        self._node_addrs = None
+
         # Registers used for passing arguments around
         self._arg_registers = kb._project.arch.argument_registers
 
@@ -84,6 +99,7 @@ class FunctionManager(KnowledgeBasePlugin, collections.Mapping):
         return fm
 
     def clear(self):
+        self.graph_version += 1
         self._function_map.clear()
         self.callgraph = networkx.MultiDiGraph()
         self.block_map.clear()
@@ -248,6 +264,7 @@ class FunctionManager(KnowledgeBasePlugin, collections.Mapping):
     def __delitem__(self, k):
         if isinstance(k, self.function_address_types):
             del self._function_map[k]
+            self.graph_version += 1
             if k in self.callgraph:
                 self.callgraph.remove_node(k)
         else:
@@ -273,6 +290,33 @@ class FunctionManager(KnowledgeBasePlugin, collections.Mapping):
 
         # make sure all functions exist in the call graph
         self.callgraph.add_node(func.addr)
+        self.graph_version += 1
+
+    def _function_changed(self, func):  # pylint:disable=unused-argument
+        """
+        A callback method for a function whose transition graph or blocks have been modified.
+
+        :param Function func:   The Function instance being modified.
+        :return:                None
+        """
+
+        self.graph_version += 1
+
+    def node_addrs(self):
+        """
+        Get the addresses of all nodes in the local transition graphs of all functions. The result is cached until any
+        function is added, removed or modified.
+
+        :return:    A frozenset of node addresses.
+        :rtype:     frozenset
+        """
+
+        if self._node_addrs is None or self._node_addrs[0] != self.graph_version:
+            addrs = set()
+            for function in self._function_map.values():
+                addrs.update(x.addr for x in function.graph.nodes())
+            self._node_addrs = (self.graph_version, frozenset(addrs))
+        return self._node_addrs[1]
 
     def contains_addr(self, addr):
         """
@@ -346,10 +390,9 @@ class FunctionManager(KnowledgeBasePlugin, collections.Mapping):
                         f.is_syscall=True
                     return f
         elif name is not None:
-            for func in self._function_map.values():
-                if func.name == name:
-                    if plt is None or func.is_plt == plt:
-                        return func
+            for func in self._function_map.functions_named(name):
+                if plt is None or func.is_plt == plt:
+                    return func
 
         return None
 
@@ -95,6 +95,7 @@ class SootFunction(Function):
         self._addr_to_block_node = {}  # map addresses to nodes
         self._block_sizes = {}  # map addresses to block sizes
         self._block_cache = {}  # a cache of real, hard data Block objects
+        self._cache = {}  # properties derived from the blocks and the graph. cleared whenever the function is modified
         self._local_blocks = {} # a dict of all blocks inside the function
         self._local_block_addrs = set()  # a set of addresses of all blocks inside the function
 
@@ -0,0 +1,516 @@
+import io
+import logging
+import pickle
+import sqlite3
+
+import networkx
+
+from ..codenode import CodeNode
+from .functions import Function, FunctionManager
+from .functions.function_manager import FunctionDict
+
+l = logging.getLogger(name=__name__)
+
+# SQLite integers are signed 64-bit values. Function addresses are shifted by this bias before they are stored so that
+# the on-disk ordering of the primary key matches the ordering of the addresses.
+_ADDR_BIAS = 1 << 63
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS functions (addr INTEGER PRIMARY KEY, name TEXT, data BLOB);
+CREATE INDEX IF NOT EXISTS functions_name ON functions (name);
+CREATE TABLE IF NOT EXISTS objects (name TEXT PRIMARY KEY, data BLOB);
+"""
+
+# these slots either point back into the project, or are caches that are rebuilt on demand
+_TRANSIENT_FUNCTION_SLOTS = {'_function_manager', '_project', '_local_transition_graph', '_block_cache', '_cache'}
+
+
+class _StorePickler(pickle.Pickler):
+    """
+    Replaces references to functions, the function manager, the knowledge base and the project with persistent IDs,
+    so that every function can be stored on its own.
+    """
+    def __init__(self, file, kb):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._kb = kb
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Function):
+            return 'function', obj.addr
+        if obj is self._kb:
+            return 'kb', None
+        if obj is self._kb._project:
+            return 'project', None
+        if isinstance(obj, FunctionManager) and obj._kb is self._kb:
+            return 'functions', None
+        return None
+
+
+class _StoreUnpickler(pickle.Unpickler):
+    def __init__(self, file, kb):
+        super().__init__(file)
+        self._kb = kb
+
+    def persistent_load(self, pid):
+        kind, value = pid
+        if kind == 'function':
+            return self._kb.functions._function_map.function_ref(value)
+        if kind == 'kb':
+            return self._kb
+        if kind == 'project':
+            return self._kb._project
+        if kind == 'functions':
+            return self._kb.functions
+        raise pickle.UnpicklingError("Unsupported persistent ID %r" % (pid, ))
+
+
+class _LazyFunction(Function):
+    """
+    A placeholder for a function that lives in a KnowledgeBaseStore but has not been loaded yet. Only `addr` and
+    `_function_manager` are set. The first access to any other attribute loads the function from disk and turns the
+    placeholder into a plain Function in place, so references held by other objects stay valid.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, item):
+        if type(self) is _LazyFunction:
+            try:
+                self._function_manager._function_map.materialize(self.addr)
+            except KeyError:
+                raise AttributeError("Function %#x has been removed from the knowledge base" % self.addr)
+        return object.__getattribute__(self, item)
+
+    def __repr__(self):
+        return '<Function %#x (not loaded)>' % self.addr
+
+
+class LazyFunctionDict(FunctionDict):
+    """
+    A FunctionDict that is backed by a KnowledgeBaseStore. Functions are unpickled from the store the first time they
+    are accessed, and range queries are answered by the index of the store without loading any function.
+
+    Functions that have been loaded or created are kept in memory until they are written back by
+    :meth:`KnowledgeBaseStore.commit`.
+    """
+    def __init__(self, backref, store, *args, **kwargs):
+        self._store = store
+        # placeholders of functions that are referenced by loaded objects but have not been loaded themselves
+        self._refs = { }
+        self._deleted = set()
+        # functions in memory that are not in the store (as of the last commit)
+        self._unstored = set()
+        self._cleared = False
+        super(LazyFunctionDict, self).__init__(backref, *args, **kwargs)
+        # SortedDict binds irange() of its key list to the instance, which would only cover functions in memory
+        del self.irange
+
+    def _in_store(self, addr):
+        return not self._cleared and addr not in self._deleted and self._store.has_function(addr)
+
+    def _stored_addrs(self, minimum=None, maximum=None, reverse=False):
+        if self._cleared:
+            return
+        for addr in self._store.function_addrs(minimum=minimum, maximum=maximum, reverse=reverse):
+            if addr not in self._deleted:
+                yield addr
+
+    # SortedDict methods call back into __contains__ and __getitem__, which would consult the store. Functions in memory
+    # are managed with the following methods instead.
+
+    def _is_loaded(self, addr):
+        return dict.__contains__(self, addr)
+
+    def _put(self, addr, func):
+        if not dict.__contains__(self, addr):
+            self._list.add(addr)
+        dict.__setitem__(self, addr, func)
+
+    def _drop(self, addr):
+        dict.__delitem__(self, addr)
+        self._list.remove(addr)
+        self._unstored.discard(addr)
+
+    #
+    # Loading and unloading
+    #
+
+    def function_ref(self, addr):
+        """
+        Get the Function object for an address without loading it from the store.
+
+        :param int addr:    Address of the function.
+        :return:            The loaded Function, or a placeholder that loads itself on first use.
+        :rtype:             Function
+        """
+        try:
+            return dict.__getitem__(self, addr)
+        except KeyError:
+            pass
+        func = self._refs.get(addr, None)
+        if func is None:
+            func = _LazyFunction.__new__(_LazyFunction)
+            func.addr = addr
+            func._function_manager = self._backref
+            self._refs[addr] = func
+        return func
+
+    def materialize(self, addr):
+        """
+        Load a function from the store, and keep it in memory.
+
+        :param int addr:    Address of the function.
+        :return:            The Function instance.
+        :rtype:             Function
+        """
+        if not self._in_store(addr):
+            raise KeyError(addr)
+        func = self.function_ref(addr)
+        if type(func) is not _LazyFunction:
+            return func
+
+        # register the function before unpickling, so that references to itself (recursive calls) resolve to it
+        func.__class__ = Function
+        self._put(addr, func)
+        self._refs.pop(addr, None)
+
+        state = self._store.load_function_state(self._backref._kb, addr)
+        for k, v in state.items():
+            setattr(func, k, v)
+        func._project = self._backref._kb._project
+        func._local_transition_graph = None
+        func._block_cache = {}
+        func._cache = {}
+        for node in func.transition_graph.nodes():
+            if isinstance(node, CodeNode):
+                node._graph = func.transition_graph
+        return func
+
+    def loaded_items(self):
+        """
+        Iterate over the functions that are currently held in memory.
+        """
+        return [ (addr, dict.__getitem__(self, addr)) for addr in self._list ]
+
+    def release(self):
+        """
+        Drop every function that is held in memory and turn it back into a placeholder. Unsaved modifications are lost,
+        so call :meth:`KnowledgeBaseStore.commit` first.
+        """
+        for addr, func in self.loaded_items():
+            if addr in self._unstored:
+                # it has never been saved
+                continue
+            for slot in Function.__slots__:
+                if slot not in ('addr', '_function_manager') and hasattr(func, slot):
+                    delattr(func, slot)
+            func.__class__ = _LazyFunction
+            self._drop(addr)
+            self._refs[addr] = func
+
+    def _mark_committed(self):
+        self._deleted.clear()
+        self._unstored.clear()
+        self._cleared = False
+
+    #
+    # FunctionDict interface
+    #
+
+    def __getitem__(self, addr):
+        try:
+            return dict.__getitem__(self, addr)
+        except KeyError:
+            pass
+        if self._in_store(addr):
+            return self.materialize(addr)
+        return super(LazyFunctionDict, self).__getitem__(addr)
+
+    def get(self, addr):
+        try:
+            return dict.__getitem__(self, addr)
+        except KeyError:
+            return self.materialize(addr)
+
+    def __setitem__(self, addr, func):
+        if not self._is_loaded(addr) and not self._in_store(addr):
+            self._unstored.add(addr)
+        self._put(addr, func)
+        self._refs.pop(addr, None)
+
+    def __delitem__(self, addr):
+        in_store = self._in_store(addr)
+        if self._is_loaded(addr):
+            self._drop(addr)
+        elif not in_store:
+            raise KeyError(addr)
+        self._refs.pop(addr, None)
+        if in_store:
+            self._deleted.add(addr)
+
+    def __contains__(self, addr):
+        return self._is_loaded(addr) or self._in_store(addr)
+
+    def __len__(self):
+        if self._cleared:
+            return len(self._unstored)
+        return self._store.function_count() - len(self._deleted) + len(self._unstored)
+
+    def __iter__(self):
+        return self.irange()
+
+    def __reversed__(self):
+        return self.irange(reverse=True)
+
+    def __eq__(self, other):
+        return self is other
+
+    def __ne__(self, other):
+        return self is not other
+
+    __hash__ = object.__hash__
+
+    def keys(self):
+        return list(self.irange())
+
+    def values(self):
+        for addr in self.irange():
+            yield self[addr]
+
+    def items(self):
+        for addr in self.irange():
+            yield addr, self[addr]
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True), reverse=False):
+        """
+        Iterate over the addresses of all functions, both in memory and in the store, within a range.
+        """
+        in_memory = self._list.irange(minimum=minimum, maximum=maximum, inclusive=inclusive, reverse=reverse)
+        stored = self._stored_addrs(minimum=minimum, maximum=maximum, reverse=reverse)
+        if not inclusive[0] or not inclusive[1]:
+            stored = (addr for addr in stored if (inclusive[0] or addr != minimum) and (inclusive[1] or addr != maximum))
+
+        last = None
+        a, b = next(in_memory, None), next(stored, None)
+        while a is not None or b is not None:
+            if b is None or (a is not None and (a > b if reverse else a < b)):
+                addr, a = a, next(in_memory, None)
+            else:
+                addr, b = b, next(stored, None)
+            if addr != last:
+                yield addr
+                last = addr
+
+    def clear(self):
+        super(LazyFunctionDict, self).clear()
+        self._refs.clear()
+        self._deleted.clear()
+        self._unstored.clear()
+        self._cleared = True
+
+    def copy(self):
+        return FunctionDict(self._backref, self.items(), key_types=self._key_types)
+
+    def functions_named(self, name):
+        # functions in memory may have been renamed or created since the last commit, so their current names are used
+        addrs = set(addr for addr, func in self.loaded_items() if func.name == name)
+        if not self._cleared:
+            addrs.update(addr for addr in self._store.function_addrs_by_name(name)
+                         if not self._is_loaded(addr) and addr not in self._deleted)
+        for addr in sorted(addrs):
+            yield self[addr]
+
+
+class KnowledgeBaseStore:
+    """
+    An on-disk store for a knowledge base, backed by SQLite.
+
+    Every function is stored as its own record, so loading a knowledge base back only reads the functions that are
+    actually used, and writing it back only writes the functions that have been loaded or created. Function lookups
+    and range queries (`floor_func`, `ceiling_func`) are answered by the index of the store. Other plugins (labels,
+    comments, indirect jumps, variable managers, ...) are stored as one record each and are loaded when they are first
+    accessed.
+
+    Only knowledge bases whose function addresses are integers can be stored. The block map of the function manager is
+    not stored.
+    """
+    def __init__(self, path):
+        """
+        :param str path:    Path of the database file. It is created if it does not exist.
+        """
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    #
+    # Public methods
+    #
+
+    def save(self, kb):
+        """
+        Write an entire knowledge base to the store, replacing everything that was stored before.
+
+        :param KnowledgeBase kb:    The knowledge base to save.
+        :return:                    None
+        """
+        function_map = kb.functions._function_map
+        if isinstance(function_map, LazyFunctionDict) and function_map._store is self:
+            self.commit(kb)
+            return
+
+        with self._db:
+            self._db.execute("DELETE FROM functions")
+            self._db.execute("DELETE FROM objects")
+            for func in function_map.values():
+                self._write_function(kb, func)
+            self._write_plugins(kb)
+
+    def commit(self, kb, release=False):
+        """
+        Incrementally write back a knowledge base that was loaded from this store. Only functions that have been loaded
+        or created since they were loaded are written, and plugins that have never been loaded are left untouched.
+
+        :param KnowledgeBase kb:    The knowledge base that was returned by :meth:`load`.
+        :param bool release:        Unload all functions from memory after writing them.
+        :return:                    None
+        """
+        function_map = kb.functions._function_map
+        if not isinstance(function_map, LazyFunctionDict) or function_map._store is not self:
+            raise ValueError("The knowledge base was not loaded from this store. Use save() instead.")
+
+        with self._db:
+            if function_map._cleared:
+                self._db.execute("DELETE FROM functions")
+            self._db.executemany("DELETE FROM functions WHERE addr = ?",
+                                 [ (addr - _ADDR_BIAS, ) for addr in function_map._deleted ])
+            for _, func in function_map.loaded_items():
+                self._write_function(kb, func)
+            self._write_plugins(kb)
+            function_map._mark_committed()
+
+        if release:
+            function_map.release()
+
+    def load(self, project, obj=None):
+        """
+        Open the knowledge base that is stored in this store. Nothing is loaded until it is accessed.
+
+        :param project:     The project the knowledge base belongs to.
+        :param obj:         The object the knowledge base belongs to. Defaults to the main object of the project.
+        :return:            The knowledge base.
+        :rtype:             KnowledgeBase
+        """
+        from ..knowledge_base import KnowledgeBase
+
+        kb = KnowledgeBase(project, project.loader.main_object if obj is None else obj)
+        object.__setattr__(kb, '_storage', self)
+
+        fm = FunctionManager(kb)
+        fm._function_map = LazyFunctionDict(fm, self, key_types=fm.function_address_types)
+        kb.register_plugin('functions', fm)
+        callgraph = self.load_object(kb, 'functions.callgraph')
+        if callgraph is not None:
+            fm.callgraph = callgraph
+
+        return kb
+
+    #
+    # Low-level accessors
+    #
+
+    def has_function(self, addr):
+        cur = self._db.execute("SELECT 1 FROM functions WHERE addr = ?", (addr - _ADDR_BIAS, ))
+        return cur.fetchone() is not None
+
+    def function_count(self):
+        return self._db.execute("SELECT COUNT(*) FROM functions").fetchone()[0]
+
+    def function_addrs(self, minimum=None, maximum=None, reverse=False):
+        """
+        Iterate over the addresses of all stored functions in a range, in order.
+
+        :param int minimum: The smallest address to include, or None.
+        :param int maximum: The greatest address to include, or None.
+        :param bool reverse: Iterate in descending order.
+        """
+        query = "SELECT addr FROM functions WHERE addr >= ? AND addr <= ? ORDER BY addr %s" % \
+                ("DESC" if reverse else "ASC")
+        lo = -_ADDR_BIAS if minimum is None else max(minimum - _ADDR_BIAS, -_ADDR_BIAS)
+        hi = _ADDR_BIAS - 1 if maximum is None else min(maximum - _ADDR_BIAS, _ADDR_BIAS - 1)
+        if lo > hi:
+            return
+        # fetch in small batches so that early-exiting range queries do not read the whole index
+        cur = self._db.execute(query, (lo, hi))
+        while True:
+            rows = cur.fetchmany(64)
+            if not rows:
+                break
+            for (addr, ) in rows:
+                yield addr + _ADDR_BIAS
+
+    def function_addrs_by_name(self, name):
+        cur = self._db.execute("SELECT addr FROM functions WHERE name = ? ORDER BY addr", (name, ))
+        return [ addr + _ADDR_BIAS for (addr, ) in cur.fetchall() ]
+
+    def load_function_state(self, kb, addr):
+        row = self._db.execute("SELECT data FROM functions WHERE addr = ?", (addr - _ADDR_BIAS, )).fetchone()
+        if row is None:
+            raise KeyError(addr)
+        return _StoreUnpickler(io.BytesIO(row[0]), kb).load()
+
+    def has_object(self, name):
+        return self._db.execute("SELECT 1 FROM objects WHERE name = ?", (name, )).fetchone() is not None
+
+    def load_object(self, kb, name):
+        row = self._db.execute("SELECT data FROM objects WHERE name = ?", (name, )).fetchone()
+        if row is None:
+            return None
+        return _StoreUnpickler(io.BytesIO(row[0]), kb).load()
+
+    #
+    # Private methods
+    #
+
+    @staticmethod
+    def _dumps(kb, o):
+        f = io.BytesIO()
+        _StorePickler(f, kb).dump(o)
+        return f.getvalue()
+
+    def _write_function(self, kb, func):
+        if type(func.addr) is not int:  # pylint: disable=unidiomatic-typecheck
+            raise TypeError("KnowledgeBaseStore only supports functions with integer addresses")
+
+        state = { }
+        for slot in Function.__slots__:
+            if slot in _TRANSIENT_FUNCTION_SLOTS or slot in state:
+                continue
+            try:
+                state[slot] = getattr(func, slot)
+            except AttributeError:
+                pass
+
+        self._db.execute("INSERT OR REPLACE INTO functions (addr, name, data) VALUES (?, ?, ?)",
+                         (func.addr - _ADDR_BIAS, func.name, self._dumps(kb, state)))
+
+    def _write_plugins(self, kb):
+        for name, plugin in kb._plugins.items():
+            if name == 'functions':
+                data = self._dumps(kb, networkx.MultiDiGraph(plugin.callgraph))
+                name = 'functions.callgraph'
+            else:
+                try:
+                    data = self._dumps(kb, plugin)
+                except (pickle.PicklingError, TypeError, AttributeError) as ex:
+                    l.warning("Cannot store knowledge base plugin %s: %s", name, ex)
+                    continue
+            self._db.execute("INSERT OR REPLACE INTO objects (name, data) VALUES (?, ?)", (name, data))
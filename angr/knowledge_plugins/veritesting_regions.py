@@ -0,0 +1,78 @@
+from .plugin import KnowledgeBasePlugin
+
+
+class VeritestingRegion(object):
+    """
+    A region recovered by Veritesting.
+
+    :ivar cfg:                  The region CFG, with loops unrolled.
+    :ivar graph_with_loops:     The graph of the region CFG before loops were unrolled.
+    :ivar merge_points:         A list of merge points (address and number of times looped), or None if they have not
+                                been computed yet.
+    """
+
+    __slots__ = ('cfg', 'graph_with_loops', 'merge_points', )
+
+    def __init__(self, cfg, graph_with_loops, merge_points=None):
+        self.cfg = cfg
+        self.graph_with_loops = graph_with_loops
+        self.merge_points = merge_points
+
+
+class VeritestingRegions(KnowledgeBasePlugin):
+    """
+    Regions recovered by Veritesting, keyed by the start address and jumpkind of the region as well as the loop
+    unrolling limit and function inlining setting they were recovered with. All Veritesting analyses that use the same
+    knowledge base share these regions, so each region is recovered only once.
+
+    Regions are transient: they are neither copied nor pickled with the knowledge base.
+    """
+
+    def __init__(self, kb):
+        super(VeritestingRegions, self).__init__()
+        self._kb = kb
+        self._regions = { }
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._regions)
+
+    def __contains__(self, key):
+        return key in self._regions
+
+    def __getstate__(self):
+        return {'_kb': self._kb}
+
+    def __setstate__(self, s):
+        self.__init__(s['_kb'])
+
+    def get(self, key):
+        """
+        Get a region, and count the lookup as a hit or a miss.
+
+        :param tuple key:   The region key.
+        :return:            The region, or None if it has not been recovered yet.
+        :rtype:             VeritestingRegion or None
+        """
+        region = self._regions.get(key, None)
+        if region is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return region
+
+    def add(self, key, region):
+        self._regions[key] = region
+
+    def clear(self):
+        self._regions.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def copy(self):
+        return VeritestingRegions(self._kb)
+
+
+KnowledgeBasePlugin.register_default('veritesting_regions', VeritestingRegions)
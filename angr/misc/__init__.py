@@ -1,6 +1,8 @@
 from . import ux
 from . import autoimport
 from . import weakpatch
+from . import profiling
+from . import fork_pool
 from .loggers import Loggers
 from .range import IRange
 from .plugins import PluginHub, PluginPreset
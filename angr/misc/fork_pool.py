@@ -0,0 +1,86 @@
+import functools
+import itertools
+import logging
+import multiprocessing
+
+l = logging.getLogger(name=__name__)
+
+# objects shared with the active pools, inherited by the worker processes when they are forked
+_shared = { }
+_keys = itertools.count(1)
+
+
+def _run_in_worker(key, func, item):
+    return func(_shared[key], item)
+
+
+class ForkPool(object):
+    """
+    A pool of worker processes forked from the current process, sharing an object with them. Jobs are functions that
+    take the shared object and one item, and they are run in the workers on the copy of the object they inherited, so
+    that the object is never pickled. Jobs must be picklable, i.e. module-level functions.
+
+    If forking is not supported on the platform, jobs are run serially in the current process.
+
+    :param shared:      The object shared with the workers.
+    :param int workers: Number of worker processes. Defaults to the number of CPUs.
+    """
+
+    def __init__(self, shared, workers=None):
+        self.shared = shared
+        self._pool = None
+        self._key = None
+
+        try:
+            ctx = multiprocessing.get_context('fork')
+        except ValueError:
+            l.warning("Forking is not supported on this platform. Jobs will be run serially.")
+            return
+
+        # the object stays registered while the pool is open, so that workers replaced by the pool see it as well
+        self._key = next(_keys)
+        _shared[self._key] = shared
+        try:
+            self._pool = ctx.Pool(processes=workers)
+        except:
+            del _shared[self._key]
+            raise
+
+    @property
+    def parallel(self):
+        """
+        Whether jobs are run in worker processes.
+        """
+        return self._pool is not None
+
+    def map(self, func, iterable, chunksize=1):
+        """
+        Run `func(shared, item)` for every item, and yield the results in order.
+
+        :param func:            A module-level function taking the shared object and an item.
+        :param iterable:        The items.
+        :param int chunksize:   Number of items sent to a worker at once.
+        """
+        if self._pool is None:
+            for item in iterable:
+                yield func(self.shared, item)
+            return
+
+        for r in self._pool.imap(functools.partial(_run_in_worker, self._key, func), iterable, chunksize):
+            yield r
+
+    def close(self):
+        """
+        Stop all worker processes.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            del _shared[self._key]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
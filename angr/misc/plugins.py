@@ -23,7 +23,8 @@ class PluginHub(object):
         super(PluginHub, self).__init__()
         self._active_plugins = {}
         self._active_preset = None
-        self._provided_by_preset = []
+        # ids of the active plugins that were created from the preset
+        self._provided_by_preset = set()
 
     #
     #   Class methods for registration
@@ -60,13 +61,18 @@ class PluginHub(object):
         plugins, preset, provided = s
         self._active_preset = preset
         self._active_plugins = {}
-        self._provided_by_preset = provided
+        self._provided_by_preset = set(provided)
 
         for name, plugin in plugins.items():
             if name not in self._active_plugins:
                 self.register_plugin(name, plugin)
 
     def __getattr__(self, name):
+        # Active plugins are instance attributes (see register_plugin), so they never reach this method. Only plugins
+        # that still have to be created from the preset, and names that do not exist at all, end up here.
+        if name.startswith('__'):
+            # copy, pickle and friends probe for special methods. no plugin is ever named like that.
+            raise AttributeError(name)
         try:
             return self.get_plugin(name)
         except AngrNoPluginError:
@@ -148,15 +154,17 @@ class PluginHub(object):
         Get the plugin named ``name``. If no such plugin is currently active, try to activate a new
         one using the current preset.
         """
-        if name in self._active_plugins:
+        try:
             return self._active_plugins[name]
+        except KeyError:
+            pass
 
-        elif self.has_plugin_preset:
+        if self._active_preset is not None:
             plugin_cls = self._active_preset.request_plugin(name)
             plugin = self._init_plugin(plugin_cls)
 
             # Remember that this plugin was provided by preset.
-            self._provided_by_preset.append(id(plugin))
+            self._provided_by_preset.add(id(plugin))
 
             self.register_plugin(name, plugin)
             return plugin
@@ -193,8 +201,7 @@ class PluginHub(object):
         Deactivate and remove the plugin with name ``name``.
         """
         plugin = self._active_plugins[name]
-        if id(plugin) in self._provided_by_preset:
-            self._provided_by_preset.remove(id(plugin))
+        self._provided_by_preset.discard(id(plugin))
 
         del self._active_plugins[name]
         delattr(self, name)
@@ -0,0 +1,101 @@
+"""
+Counters used to profile symbolic execution.
+
+Profiling is off unless a :class:`ProfileCounters` object has been activated with :func:`start`. While profiling is off,
+the engines only pay for a check of the module-level ``counters`` attribute, and the solver runs its original,
+unwrapped query methods.
+"""
+
+#: The active counters, or None if profiling is disabled.
+counters = None
+
+
+class ProfileCounters(object):
+    """
+    Time and call counts collected while profiling.
+
+    :ivar engines:      A dict mapping engine class names to a ``[count, seconds]`` list.
+    :ivar blocks:       A dict mapping block addresses to a ``[count, seconds]`` list.
+    :ivar solver:       A dict mapping solver query kinds to a ``[count, seconds]`` list.
+    """
+
+    __slots__ = ('engines', 'blocks', 'solver', 'solver_depth', )
+
+    def __init__(self):
+        self.engines = { }
+        self.blocks = { }
+        self.solver = { }
+        # solver queries that are issued by other solver queries are accounted to the outermost one
+        self.solver_depth = 0
+
+    def record_engine(self, engine, addr, duration):
+        """
+        Account one execution of a block by an engine.
+
+        :param engine:      The SimEngine that executed the block.
+        :param addr:        The address of the block.
+        :param float duration: The time the execution took, in seconds.
+        """
+        name = type(engine).__name__
+        try:
+            entry = self.engines[name]
+        except KeyError:
+            entry = self.engines[name] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += duration
+
+        try:
+            entry = self.blocks[addr]
+        except KeyError:
+            entry = self.blocks[addr] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += duration
+
+    def record_solver(self, kind, duration):
+        """
+        Account one solver query.
+
+        :param str kind:        The kind of query, e.g. "eval" or "satisfiable".
+        :param float duration:  The time the query took, in seconds.
+        """
+        try:
+            entry = self.solver[kind]
+        except KeyError:
+            entry = self.solver[kind] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += duration
+
+    def clear(self):
+        self.engines.clear()
+        self.blocks.clear()
+        self.solver.clear()
+        self.solver_depth = 0
+
+
+def start(new_counters):
+    """
+    Start accounting engine and solver time to a set of counters.
+
+    :param ProfileCounters new_counters:    The counters to activate.
+    :return:                                The counters that were active before, to be passed to :func:`stop`.
+    """
+    global counters # pylint:disable=global-statement
+    previous = counters
+    counters = new_counters
+    if previous is None:
+        from ..state_plugins.solver import enable_profiling
+        enable_profiling()
+    return previous
+
+
+def stop(previous=None):
+    """
+    Stop accounting time to the active counters.
+
+    :param previous:    The counters that were active before :func:`start` was called, which are reactivated.
+    """
+    global counters # pylint:disable=global-statement
+    counters = previous
+    if previous is None:
+        from ..state_plugins.solver import disable_profiling
+        disable_profiling()
@@ -30,7 +30,15 @@ class memcpy(angr.SimProcedure):
         l.debug("Memcpy running with conditional_size %#x", conditional_size)
 
         if conditional_size > 0:
-            src_mem = self.state.memory.load(src_addr, conditional_size, endness='Iend_BE')
+            src_mem = None
+            if ABSTRACT_MEMORY not in self.state.options and not self.state.solver.symbolic(limit) and \
+                    not self.state.solver.symbolic(src_addr):
+                # copying a fully concrete buffer does not need to go through a symbolic load
+                raw = self.state.memory.load_concrete(self.state.solver.eval(src_addr), conditional_size)
+                if raw is not None:
+                    src_mem = self.state.solver.BVV(raw)
+            if src_mem is None:
+                src_mem = self.state.memory.load(src_addr, conditional_size, endness='Iend_BE')
             if ABSTRACT_MEMORY in self.state.options:
                 self.state.memory.store(dst_addr, src_mem, size=conditional_size, endness='Iend_BE')
             else:
@@ -9,6 +9,40 @@ l = logging.getLogger(name=__name__)
 class strlen(angr.SimProcedure):
     #pylint:disable=arguments-differ
 
+    CONCRETE_SEARCH_LIMIT = 0x10000
+    CONCRETE_CHUNK_SIZE = 0x1000
+
+    def _concrete_strlen(self, s, width, step):
+        """
+        Find the length of a string by scanning raw bytes, when both the pointer and the string are concrete.
+
+        :return: The length of the string, or None if it cannot be determined without going through symbolic memory.
+        """
+        if self.state.solver.symbolic(s):
+            return None
+        addr = self.state.solver.eval(s)
+        null = b"\x00" * width
+
+        buf = bytearray()
+        pos = 0
+        while len(buf) < self.CONCRETE_SEARCH_LIMIT:
+            cur = addr + len(buf)
+            chunk_size = self.CONCRETE_CHUNK_SIZE - cur % self.CONCRETE_CHUNK_SIZE
+            data = self.state.memory.load_concrete(cur, chunk_size, allow_partial=True)
+            if not data:
+                return None
+            buf += data
+
+            idx = buf.find(null, pos)
+            while idx != -1 and idx % step != 0:
+                idx = buf.find(null, idx + 1)
+            if idx != -1:
+                return idx
+            if len(data) < chunk_size:
+                # we ran into symbolic or missing bytes before finding the terminator
+                return None
+            pos = max(0, len(buf) - width + 1)
+
     def run(self, s, wchar=False):
         #pylint:disable=attribute-defined-outside-init
 
@@ -52,6 +86,11 @@ class strlen(angr.SimProcedure):
             return length
 
         else:
+            concrete_len = self._concrete_strlen(s, null_seq.size() // 8, step)
+            if concrete_len is not None:
+                self.max_null_index = concrete_len
+                return self.state.solver.BVV(concrete_len, self.state.arch.bits)
+
             search_len = max_str_len
             r, c, i = self.state.memory.find(s, null_seq, search_len, max_symbolic_bytes=max_symbolic_bytes, step=step, chunk_size=chunk_size)
 
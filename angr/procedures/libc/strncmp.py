@@ -7,6 +7,34 @@ l = logging.getLogger(name=__name__)
 class strncmp(angr.SimProcedure):
     #pylint:disable=arguments-differ
 
+    def _concrete_compare(self, a_addr, b_addr, maxlen, ignore_case):
+        """
+        Compare two buffers directly in Python, when both pointers and all compared bytes are concrete.
+
+        :return: -1, 0 or 1, or None if either buffer is not entirely concrete.
+        """
+        if self.state.solver.symbolic(a_addr) or self.state.solver.symbolic(b_addr):
+            return None
+        a_raw = self.state.memory.load_concrete(self.state.solver.eval(a_addr), maxlen)
+        if a_raw is None:
+            return None
+        b_raw = self.state.memory.load_concrete(self.state.solver.eval(b_addr), maxlen)
+        if b_raw is None:
+            return None
+
+        for a_conc, b_conc in zip(a_raw, b_raw):
+            if ignore_case:
+                # convert both to lowercase
+                if ord('a') <= a_conc <= ord('z'):
+                    a_conc -= ord(' ')
+                if ord('a') <= b_conc <= ord('z'):
+                    b_conc -= ord(' ')
+
+            if a_conc != b_conc:
+                l.debug("... found mis-matching concrete bytes 0x%x and 0x%x", a_conc, b_conc)
+                return -1 if a_conc < b_conc else 1
+        return 0
+
     def run(self, a_addr, b_addr, limit, a_len=None, b_len=None, wchar=False, ignore_case=False): #pylint:disable=arguments-differ
         # TODO: smarter types here?
         self.argument_types = {0: self.ty_ptr(SimTypeString()),
@@ -70,6 +98,11 @@ class strncmp(angr.SimProcedure):
                 else:
                     return self.state.solver.BVV(1, self.state.arch.bits, variables=variables)
 
+        if concrete_run and self.state.mode != 'static':
+            r = self._concrete_compare(a_addr, b_addr, maxlen, ignore_case)
+            if r is not None:
+                return self.state.solver.BVV(r, self.state.arch.bits, variables=variables)
+
         # the bytes
         a_bytes = self.state.memory.load(a_addr, maxlen, endness='Iend_BE')
         b_bytes = self.state.memory.load(b_addr, maxlen, endness='Iend_BE')
@@ -539,19 +539,24 @@ class FormatParser(SimProcedure):
         if self.state.solver.is_true(length == 0):
             return FormatString(self, [b""])
 
-        fmt_xpr = self.state.memory.load(fmtstr_ptr, length)
-
-        fmt = [ ]
-        for i in range(fmt_xpr.size(), 0, -8):
-            char = fmt_xpr[i - 1 : i - 8]
-            try:
-                conc_char = self.state.solver.eval_one(char)
-            except SimSolverError:
-                # For symbolic chars, just keep them symbolic
-                fmt.append(char)
-            else:
-                # Concrete chars are directly appended to the list
-                fmt.append(bytes([conc_char]))
+        raw = self.state.memory.load_concrete(self.state.solver.eval(fmtstr_ptr), self.state.solver.eval(length))
+        if raw is not None:
+            # the whole format string is concrete, no need to evaluate it byte by byte
+            fmt = [bytes([b]) for b in raw]
+        else:
+            fmt_xpr = self.state.memory.load(fmtstr_ptr, length)
+
+            fmt = [ ]
+            for i in range(fmt_xpr.size(), 0, -8):
+                char = fmt_xpr[i - 1 : i - 8]
+                try:
+                    conc_char = self.state.solver.eval_one(char)
+                except SimSolverError:
+                    # For symbolic chars, just keep them symbolic
+                    fmt.append(char)
+                else:
+                    # Concrete chars are directly appended to the list
+                    fmt.append(bytes([conc_char]))
 
         # make a FormatString object
         fmt_str = self._get_fmt(fmt)
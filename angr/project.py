@@ -11,6 +11,7 @@ from archinfo.arch_soot import SootAddressDescriptor, ArchSoot
 import cle
 
 from .misc.ux import deprecated
+from .misc.fork_pool import ForkPool
 
 l = logging.getLogger(name=__name__)
 
@@ -678,6 +679,82 @@ class Project:
             l.error("Cannot unpickle container of type %s", type(container))
             return None
 
+    #
+    # Templates and worker processes
+    #
+
+    def save_template(self, container):
+        """
+        Save a snapshot of this project that can be loaded with :meth:`load_template`. Loading a template skips CLE
+        loading, SimProcedure hooking and the SimOS configuration, so it is much faster than creating the project again.
+        The knowledge base is not included in the template.
+
+        :param container:   A file name or an open file.
+        :return:            None
+        """
+        kb = self.kb
+        self.kb = KnowledgeBase(self, self.loader.main_object)
+        try:
+            if isinstance(container, str):
+                with open(container, 'wb') as f:
+                    pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+            else:
+                pickle.dump(self, container, pickle.HIGHEST_PROTOCOL)
+        finally:
+            self.kb = kb
+
+    @staticmethod
+    def load_template(container):
+        """
+        Load a project from a snapshot that was saved with :meth:`save_template`.
+
+        :param container:   A file name or an open file.
+        :return:            The project.
+        :rtype:             Project
+        """
+        if isinstance(container, str):
+            with open(container, 'rb') as f:
+                return pickle.load(f)
+        return pickle.load(container)
+
+    def warm_up(self, addrs=None, state=None):
+        """
+        Lift blocks into the lift cache of the default engine, so that processes forked from this project afterwards
+        (see :meth:`worker_pool`) start with a warm cache.
+
+        :param addrs:   Addresses of the blocks to lift. Defaults to the blocks of all functions in the knowledge base.
+        :param state:   A state whose options decide how blocks are lifted. Defaults to a blank state.
+        :return:        The number of blocks that were lifted.
+        :rtype:         int
+        """
+        if addrs is None:
+            addrs = [ addr for func in self.kb.functions.values() for addr in func.block_addrs ]
+        if state is None:
+            state = self.factory.blank_state()
+
+        engine = self.factory.default_engine
+        lifted = 0
+        for addr in addrs:
+            if self.is_hooked(addr):
+                continue
+            try:
+                engine.lift(state=state, addr=addr)
+            except (SimEngineError, SimMemoryError):
+                continue
+            lifted += 1
+        return lifted
+
+    def worker_pool(self, workers=None):
+        """
+        Fork a pool of worker processes from this project. Workers share everything that has been set up in the parent
+        so far (loaded binaries, hooks, the lift cache), so they are ready to run jobs in milliseconds.
+
+        :param int workers: Number of worker processes. Defaults to the number of CPUs.
+        :return:            The pool.
+        :rtype:             ProjectPool
+        """
+        return ProjectPool(self, workers=workers)
+
     def __repr__(self):
         return '<Project %s>' % (self.filename if self.filename is not None else 'loaded from stream')
 
@@ -699,7 +776,21 @@ class Project:
         return self.simos
 
 
-from .errors import AngrNoPluginError
+class ProjectPool(ForkPool):
+    """
+    A pool of worker processes forked from a fully initialized project (a fork server). Jobs are functions that take the
+    project and one item, and they are run in the workers with the project of the parent, without loading anything
+    again. Jobs must be picklable, i.e. module-level functions.
+
+    If forking is not supported on the platform, jobs are run serially in the current process.
+    """
+
+    def __init__(self, project, workers=None):
+        super(ProjectPool, self).__init__(project, workers=workers)
+        self.project = project
+
+
+from .errors import AngrNoPluginError, SimEngineError, SimMemoryError
 from .factory import AngrObjectFactory
 from angr.simos import SimOS, os_mapping
 from .analyses.analysis import AnalysesHub
@@ -115,6 +115,10 @@ SYMBOLIC_WRITE_ADDRESSES = "SYMBOLIC_WRITE_ADDRESSES"
 CONSERVATIVE_WRITE_STRATEGY = "CONSERVATIVE_WRITE_STRATEGY"
 CONSERVATIVE_READ_STRATEGY = "CONSERVATIVE_READ_STRATEGY"
 
+# Memoize the results of stateless address concretization strategies, keyed on the address and the constraints that
+# involve it. The memo is shared between a state and all states copied from it.
+MEMOIZE_ADDRESS_CONCRETIZATION = "MEMOIZE_ADDRESS_CONCRETIZATION"
+
 # This enables dependency tracking for all Claripy ASTs.
 AST_DEPS = "AST_DEPS"
 
@@ -169,12 +173,20 @@ ABSTRACT_SOLVER = "ABSTRACT_SOLVER"
 # this stops SimRun for checking the satisfiability of successor states
 LAZY_SOLVES = "LAZY_SOLVES"
 
+# this checks the guards of all the exits of a block against one solver holding the constraints they share, instead of
+# checking the satisfiability of every successor state with its own solver
+BATCH_EXIT_FEASIBILITY = "BATCH_EXIT_FEASIBILITY"
+
 # This makes angr downsize solvers wherever reasonable.
 DOWNSIZE_Z3 = "DOWNSIZE_Z3"
 
 # Turn-on superfastpath mode
 SUPER_FASTPATH = "SUPER_FASTPATH"
 
+# Evaluate integer VEX operations and x86 flag ccalls on Python integers when all of their operands are concrete,
+# instead of building claripy ASTs for them
+FAST_CONCRETE_OPS = "FAST_CONCRETE_OPS"
+
 # use FastMemory for memory
 FAST_MEMORY = "FAST_MEMORY"
 
@@ -170,7 +170,7 @@ class SimProcedure:
             else:
                 if arguments is None:
                     inst.use_state_arguments = True
-                    sim_args = [ inst.arg(_) for _ in range(inst.num_args) ]
+                    sim_args = inst.cc.arg_values(state, inst.num_args)
                     inst.arguments = sim_args
                 else:
                     inst.use_state_arguments = False
@@ -62,6 +62,7 @@ class SimState(PluginHub):
             l.warning("Unused keyword arguments passed to SimState: %s", " ".join(kwargs))
         super(SimState, self).__init__()
         self.project = project
+        self._update_project_kind()
 
         # Arch
         if self._is_java_jni_project:
@@ -204,6 +205,7 @@ class SimState(PluginHub):
 
     def __setstate__(self, s):
         self.__dict__.update(s)
+        self._update_project_kind()
         for p in self.plugins.values():
             p.set_state(self)
             if p.STRONGREF_STATE:
@@ -374,21 +376,19 @@ class SimState(PluginHub):
     # Java support
     #
 
-    @property
-    def _is_java_project(self):
-        """
-        Indicates if the project's main binary is a Java Archive.
+    def _update_project_kind(self):
         """
-        return self.project and isinstance(self.project.arch, ArchSoot)
+        Determine whether the project is a Java project, and whether it uses JNI. The flags are looked up by `arch`,
+        `get_plugin` and `has_plugin` on every call, so they are computed once here instead of on each access. Call
+        this method again after assigning a different project to the state.
 
-    @property
-    def _is_java_jni_project(self):
-        """
-        Indicates if the project's main binary is a Java Archive, which
-        interacts during its execution with native libraries (via JNI).
+        _is_java_project indicates if the project's main binary is a Java Archive.
+        _is_java_jni_project indicates if the project's main binary is a Java Archive, which interacts during its
+        execution with native libraries (via JNI).
         """
-        return self.project and isinstance(self.project.arch, ArchSoot) and \
-               self.project.simos.is_javavm_with_jni_support
+        project = self.project
+        self._is_java_project = bool(project) and isinstance(project.arch, ArchSoot)
+        self._is_java_jni_project = self._is_java_project and bool(project.simos.is_javavm_with_jni_support)
 
     @property
     def javavm_memory(self):
@@ -0,0 +1,168 @@
+from .storage.paged_memory import SimPagedMemory
+
+# rough per-object costs, in bytes, for the parts of a state that cannot be measured cheaply
+HISTORY_NODE_SIZE = 1024
+HISTORY_EVENT_SIZE = 256
+CONSTRAINT_SIZE = 512
+
+
+class StateFootprint(object):
+    """
+    The estimated memory footprint of a single state, within a set of states.
+
+    :ivar state:            The state.
+    :ivar int pages:        The number of memory and register pages the state references.
+    :ivar int owned_pages:  The number of those pages that no other state in the set references.
+    :ivar int history_nodes: The number of history nodes that no other state in the set references.
+    :ivar int constraints:  The number of constraints that no other state in the set references.
+    :ivar int memory:       The bytes held by the pages that no other state in the set references.
+    :ivar int history:      The bytes held by the history nodes that no other state in the set references.
+    :ivar int solver:       The bytes held by the constraints that no other state in the set references.
+    """
+
+    __slots__ = ('state', 'pages', 'owned_pages', 'history_nodes', 'constraints', 'memory', 'history', 'solver', )
+
+    def __init__(self, state):
+        self.state = state
+        self.pages = 0
+        self.owned_pages = 0
+        self.history_nodes = 0
+        self.constraints = 0
+        self.memory = 0
+        self.history = 0
+        self.solver = 0
+
+    @property
+    def exclusive(self):
+        """
+        The bytes that would be freed if this state was discarded.
+        """
+        return self.memory + self.history + self.solver
+
+    def __repr__(self):
+        return "<StateFootprint of %s: %d bytes exclusive, %d/%d pages owned>" % (
+            self.state, self.exclusive, self.owned_pages, self.pages)
+
+
+class Footprint(object):
+    """
+    The estimated memory footprint of a set of states.
+
+    :ivar list states:  A StateFootprint for each state, in the order the states were given.
+    :ivar int shared:   The bytes held by objects that several of the states reference.
+    :ivar int total:    The bytes held by all states together, with every shared object counted once.
+    """
+
+    __slots__ = ('states', 'shared', 'total', )
+
+    def __init__(self, states, shared):
+        self.states = states
+        self.shared = shared
+        self.total = shared + sum(fp.exclusive for fp in states)
+
+    def __repr__(self):
+        return "<Footprint of %d states: %d bytes, %d shared>" % (len(self.states), self.total, self.shared)
+
+
+def history_node_size(node):
+    """
+    Estimate the number of bytes held by a single history node.
+    """
+    return HISTORY_NODE_SIZE + len(node.recent_events) * HISTORY_EVENT_SIZE
+
+
+def _paged_memories(state):
+    for name in ('memory', 'registers'):
+        if state.has_plugin(name):
+            mem = getattr(state.get_plugin(name), 'mem', None)
+            if isinstance(mem, SimPagedMemory):
+                yield mem
+
+
+def estimate_footprint(states):
+    """
+    Estimate how much memory a set of states holds.
+
+    Pages are shared copy-on-write between states, history nodes are shared between states with a common ancestry, and
+    constraints are shared between states that forked from each other, so each object is accounted once: either to the
+    only state in the set that references it, or as shared. Pages are measured; history nodes and constraints are
+    estimated with fixed costs.
+
+    :param states:  The states.
+    :return:        The footprint of the states.
+    :rtype:         Footprint
+    """
+    footprints = [ StateFootprint(state) for state in states ]
+    shared = 0
+
+    # pages and constraints: count the holders of each object. owned pages are known to have a single holder.
+    pages = { }
+    constraints = { }
+    for i, fp in enumerate(footprints):
+        for mem in _paged_memories(fp.state):
+            for _, page, owned in mem.page_ownership():
+                fp.pages += 1
+                if owned:
+                    fp.owned_pages += 1
+                    fp.memory += page.estimated_size()
+                    continue
+                entry = pages.get(id(page), None)
+                if entry is None:
+                    pages[id(page)] = [i, page]
+                else:
+                    entry[0] = None
+
+        if fp.state.has_plugin('solver'):
+            for c in fp.state.solver.constraints:
+                entry = constraints.get(id(c), None)
+                if entry is None:
+                    constraints[id(c)] = [i, c]
+                else:
+                    entry[0] = None
+
+    for holder, page in pages.values():
+        size = page.estimated_size()
+        if holder is None:
+            shared += size
+        else:
+            footprints[holder].owned_pages += 1
+            footprints[holder].memory += size
+
+    for holder, _ in constraints.values():
+        if holder is None:
+            shared += CONSTRAINT_SIZE
+        else:
+            footprints[holder].constraints += 1
+            footprints[holder].solver += CONSTRAINT_SIZE
+
+    # history: walk up from each state until reaching a node that was already walked. the walk of every state
+    # claims the nodes it reaches first; when a later walk reaches one of them, that node and all of its ancestors
+    # are shared.
+    claimed = { }
+    segments = [ ]
+    for i, fp in enumerate(footprints):
+        segment = [ ]
+        node = fp.state.history if fp.state.has_plugin('history') else None
+        while node is not None:
+            entry = claimed.get(id(node), None)
+            if entry is not None:
+                owner, pos = entry
+                if owner != i:
+                    cuts = segments[owner]
+                    cuts[0] = min(cuts[0], pos)
+                break
+            claimed[id(node)] = (i, len(segment))
+            segment.append(node)
+            node = node.parent
+        segments.append([len(segment), segment])
+
+    for fp, (cut, segment) in zip(footprints, segments):
+        for pos, node in enumerate(segment):
+            size = history_node_size(node)
+            if pos < cut:
+                fp.history_nodes += 1
+                fp.history += size
+            else:
+                shared += size
+
+    return Footprint(footprints, shared)
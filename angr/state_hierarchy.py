@@ -1,3 +1,4 @@
+import heapq
 import logging
 import weakref
 import networkx
@@ -17,6 +18,7 @@ class StateHierarchy(object):
         self._twigs = set() # nodes with one child
         self._weakref_cache = {} # map from object id to weakref
         self._reverse_weakref_cache = {} # map from weakref to object id
+        self._clear_index()
 
     def __getstate__(self):
         histories = [ h() for h in networkx.algorithms.dfs_postorder_nodes(self._graph) ]
@@ -28,6 +30,7 @@ class StateHierarchy(object):
         self._twigs = set()
         self._weakref_cache = {}
         self._reverse_weakref_cache = {}
+        self._clear_index()
 
         nodes = s[0]
         for n in nodes:
@@ -66,6 +69,7 @@ class StateHierarchy(object):
                 self._graph.add_edge(p, s)
 
             self._graph.remove_node(h)
+            self._index_dirty = True
         except networkx.NetworkXError:
             pass
 
@@ -81,9 +85,14 @@ class StateHierarchy(object):
 
     def add_history(self, h):
         cur_node = self.get_ref(h)
+        if cur_node in self._graph:
+            # this node may already have descendants, whose depths would change
+            self._index_dirty = True
         self._graph.add_node(cur_node)
         if h.parent is not None:
             prev_node = self.get_ref(h.parent)
+            if not self._index_dirty and prev_node not in self._graph:
+                self._index_node(prev_node, None)
             self._graph.add_edge(prev_node, cur_node)
 
             self._leaves.discard(prev_node)
@@ -91,6 +100,17 @@ class StateHierarchy(object):
                 self._twigs.add(prev_node)
             else:
                 self._twigs.discard(prev_node)
+                if not self._index_dirty:
+                    # the new node is an additional leaf below all of its ancestors
+                    a = prev_node
+                    while a is not None:
+                        self._leaf_count[a] += 1
+                        a = self._parent[a]
+
+            if not self._index_dirty:
+                self._index_node(cur_node, prev_node)
+        elif not self._index_dirty:
+            self._index_node(cur_node, None)
 
         self._leaves.add(cur_node)
 
@@ -105,17 +125,120 @@ class StateHierarchy(object):
             if self._graph.out_degree(h) == 1:
                 self._remove_history(h)
 
+    #
+    # Ancestry index
+    #
+    # Every node of the graph has at most one predecessor. For each node, the index keeps its parent, its depth, its
+    # ancestors at distances of powers of two (for O(log n) ancestor queries) and the number of leaves below it. It is
+    # updated incrementally when histories are added below the graph, and rebuilt in a single pass the next time it is
+    # needed after nodes are removed or inserted above existing ones.
+    #
+
+    def _clear_index(self):
+        self._parent = {}
+        self._depth = {}
+        self._jumps = {}
+        self._leaf_count = {}
+        self._index_dirty = False
+
+    def _index_node(self, node, parent):
+        self._parent[node] = parent
+        if parent is None:
+            self._depth[node] = 0
+            self._jumps[node] = [ ]
+        else:
+            self._depth[node] = self._depth[parent] + 1
+            jumps = [ parent ]
+            while len(self._jumps[jumps[-1]]) >= len(jumps):
+                jumps.append(self._jumps[jumps[-1]][len(jumps) - 1])
+            self._jumps[node] = jumps
+        self._leaf_count[node] = 1
+
+    def _ensure_index(self):
+        if not self._index_dirty:
+            return
+
+        self._clear_index()
+        order = [ ]
+        for root in self._graph.nodes():
+            if self._graph.in_degree(root) != 0:
+                continue
+            self._index_node(root, None)
+            order.append(root)
+            pos = len(order) - 1
+            while pos < len(order):
+                node = order[pos]
+                for child in self._graph.successors(node):
+                    self._index_node(child, node)
+                    order.append(child)
+                pos += 1
+
+        for node in reversed(order):
+            if self._graph.out_degree(node) != 0:
+                self._leaf_count[node] = sum(self._leaf_count[c] for c in self._graph.successors(node))
+
+    def _climb(self, node):
+        """
+        Find the lowest proper ancestor of a node that has more than one leaf below it.
+        """
+        parent = self._parent[node]
+        if parent is None or self._leaf_count[parent] > 1:
+            return parent
+
+        # leaf counts never decrease going up, so the ancestors with a single leaf form a chain that can be skipped
+        node = parent
+        for k in range(len(self._jumps[node]) - 1, -1, -1):
+            jumps = self._jumps[node]
+            if k < len(jumps) and self._leaf_count[jumps[k]] == 1:
+                node = jumps[k]
+        return self._parent[node]
+
+    def lowest_common_ancestor(self, h1, h2):
+        """
+        Find the deepest history in the hierarchy that is an ancestor of (or is) both of two histories.
+
+        :param h1:  A history.
+        :param h2:  Another history.
+        :return:    The common ancestor, or None if the histories are in separate trees.
+        """
+        self._ensure_index()
+        a = self.get_ref(h1)
+        b = self.get_ref(h2)
+        if a not in self._depth or b not in self._depth:
+            return None
+
+        if self._depth[a] < self._depth[b]:
+            a, b = b, a
+        diff = self._depth[a] - self._depth[b]
+        k = 0
+        while diff:
+            if diff & 1:
+                a = self._jumps[a][k]
+            diff >>= 1
+            k += 1
+
+        if a is b:
+            return a()
+        for k in range(len(self._jumps[a]) - 1, -1, -1):
+            if k < len(self._jumps[a]) and self._jumps[a][k] is not self._jumps[b][k]:
+                a = self._jumps[a][k]
+                b = self._jumps[b][k]
+        parent = self._parent[a]
+        return None if parent is None else parent()
+
     def lineage(self, h):
         """
         Returns the lineage of histories leading up to `h`.
         """
+        self._ensure_index()
+        if h not in self._parent:
+            raise networkx.NetworkXError("The history %s is not in the hierarchy." % h)
 
         lineage = [ ]
-
-        predecessors = list(self._graph.predecessors(h))
-        while len(predecessors):
-            lineage.append(predecessors[0])
-            predecessors = list(self._graph.predecessors(predecessors[0]))
+        p = self._parent[h]
+        while p is not None:
+            lineage.append(p)
+            p = self._parent[p]
 
         lineage.reverse()
         return lineage
@@ -175,6 +298,7 @@ class StateHierarchy(object):
             if n().state is not None:
                 n().state.add_constraints(claripy.false)
         self._graph.remove_nodes_from(all_children)
+        self._index_dirty = True
 
     def unreachable_state(self, state):
         self.unreachable_history(state.history)
@@ -203,16 +327,42 @@ class StateHierarchy(object):
         :returns: a tuple of: (a list of states to merge, those states' common history, a list of states to not merge yet)
         """
 
+        self._ensure_index()
+
         histories = set(self.get_ref(s.history) for s in states)
+        nodes = [ h for h in histories if h in self._depth ]
+
+        # histories that are ancestors of other histories prevent skipping single-leaf chains of ancestors
+        skip = not any(self._graph.out_degree(n) for n in nodes)
+
+        # walk up from every history, deepest first, gathering the histories below each ancestor. the first ancestor
+        # that gathers several of them is the deepest common (proper) ancestor of any group of states.
+        pending = { }
+        heap = [ ]
+        counter = itertools.count()
+
+        def _push(node, below):
+            if node is None:
+                return
+            if node in pending:
+                pending[node] |= below
+            else:
+                pending[node] = set(below)
+                heapq.heappush(heap, (-self._depth[node], next(counter), node))
+
+        for n in nodes:
+            _push(self._climb(n) if skip else self._parent[n], {n})
 
-        for n in networkx.algorithms.dfs_postorder_nodes(self._graph):
-            intersection = histories.intersection(self.all_successors(n))
-            if len(intersection) > 1:
+        while heap:
+            _, _, n = heapq.heappop(heap)
+            below = pending.pop(n)
+            if len(below) > 1:
                 return (
-                    [ s for s in states if self.get_ref(s.history) in intersection ],
+                    [ s for s in states if self.get_ref(s.history) in below ],
                     n(),
-                    [ s for s in states if self.get_ref(s.history) not in intersection ]
+                    [ s for s in states if self.get_ref(s.history) not in below ]
                 )
+            _push(self._climb(n) if skip else self._parent[n], below)
 
         # didn't find any?
         return set(), None, states
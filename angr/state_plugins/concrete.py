@@ -9,6 +9,7 @@ import struct
 
 from .plugin import SimStatePlugin
 from ..errors import SimConcreteRegisterError
+from ..concrete_cache import ConcreteTargetCache
 from archinfo import ArchX86, ArchAMD64
 
 l = logging.getLogger("state_plugin.concrete")
@@ -100,17 +101,19 @@ class Concrete(SimStatePlugin):
         l.debug("Synchronizing general purpose registers")
 
         to_sync_register = list(filter(lambda x: x.concrete, self.state.arch.register_list))
+        to_sync_names = [ ]
 
         for register in to_sync_register:
 
             # before let's sync all the subregisters of the current register.
             # sometimes this can be helpful ( i.e. ymmm0 e xmm0 )
             if register.subregisters:
-                subregisters_names = map(lambda x: x[0], register.subregisters)
-                self._sync_registers(subregisters_names, target)
+                to_sync_names.extend(map(lambda x: x[0], register.subregisters))
 
             # finally let's synchronize the whole register
-            self._sync_registers([register.name], target)
+            to_sync_names.append(register.name)
+
+        self._sync_registers(to_sync_names, target)
 
         if self.synchronize_cle:
             self._sync_cle(target)
@@ -120,6 +123,11 @@ class Concrete(SimStatePlugin):
         if self.state.project._should_use_sim_procedures and not self.state.project.loader.main_object.pic:
             l.debug("Restoring SimProc using concrete memory")
 
+            if isinstance(target, ConcreteTargetCache):
+                # read all the pointers to the imported functions at once
+                target.prefetch((reloc.rebased_addr, reloc.rebased_addr + self.state.project.arch.bytes)
+                                for reloc in self.state.project.loader.main_object.relocs if reloc.symbol)
+
             for reloc in self.state.project.loader.main_object.relocs:
                 if reloc.symbol:  # consider only reloc with a symbol
                     l.debug("Trying to re-hook SimProc %s", reloc.symbol.name)
@@ -178,6 +186,9 @@ class Concrete(SimStatePlugin):
                 l.error("Can't set breakpoint to synchronize segments registers, horrible things will happen.")
 
     def _sync_registers(self, register_names, target):
+        if isinstance(target, ConcreteTargetCache):
+            target.read_registers(register_names)
+
         for register_name in register_names:
             try:
                 reg_value = target.read_register(register_name)
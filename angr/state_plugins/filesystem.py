@@ -2,7 +2,7 @@ import os
 import logging
 
 from .plugin import SimStatePlugin
-from ..storage.file import SimFile
+from ..storage.file import SimFile, SimHostFileMapping
 from ..errors import SimMergeError
 from ..misc.ux import once
 
@@ -294,12 +294,13 @@ class SimHostFilesystem(SimMount):
     @staticmethod
     def _load_file(path):
         try:
-            with open(path, 'rb') as fp:
-                content = fp.read()
+            content = SimHostFileMapping(path)
+        except ValueError:
+            # empty files cannot be mapped
+            content = b''
         except OSError:
             return None
-        else:
-            return SimFile(name='file://' + path, content=content, size=len(content))
+        return SimFile(name='file://' + path, content=content, size=len(content))
 
     def insert(self, path_elements, simfile):
         path = self.pathsep.join(x.decode() for x in path_elements)
@@ -6,6 +6,7 @@ import binascii
 
 from .plugin import SimStatePlugin
 from ..errors import SimStateError
+from ..storage.elf_core import SimElfCore
 
 l = logging.getLogger(name=__name__)
 
@@ -13,7 +14,8 @@ l = logging.getLogger(name=__name__)
 
 class GDB(SimStatePlugin):
     """
-    Initialize or update a state from gdb dumps of the stack, heap, registers and data (or arbitrary) segments.
+    Initialize or update a state from gdb dumps of the stack, heap, registers and data (or arbitrary) segments, or from
+    an ELF core file.
     """
 
     def __init__(self, omit_fp=False, adjust_stack=False):
@@ -100,6 +102,42 @@ class GDB(SimStatePlugin):
 
         self._adjust_regs()
 
+    def set_core(self, core_file, thread=0):
+        """
+        Initialize the memory and the registers of the state from an ELF core file, such as a crash dump.
+
+        The PT_LOAD segments of the core file are laid over the memory of the state through a memory mapping of the
+        file: a page is only read from the file the first time it is touched, so even huge core files are cheap to load.
+        Parts of the address space that are not in the dump keep their current content (typically, the code of the
+        loaded binaries). The registers are set from the NT_PRSTATUS note of a thread.
+
+        :param core_file:   The path of the core file.
+        :param int thread:  The index of the thread to take the registers of. The first thread is the one that caused
+                            the dump.
+        :return:            The parsed core file.
+        :rtype:             angr.storage.elf_core.SimElfCore
+        """
+        core = SimElfCore(core_file)
+        core.check_arch(self.state.arch)
+        if not 0 <= thread < len(core.threads):
+            raise SimStateError("Core file %s has %d threads, there is no thread %d" % (
+                core_file, len(core.threads), thread))
+
+        segments = core.memory_segments()
+        l.info("Mapping %d segments of core file %s", len(segments), core_file)
+        self.state.memory.mem.map_segments(segments)
+
+        pid, regs = core.threads[thread]
+        l.info("Setting registers from thread %d", pid)
+        for reg, val in regs.items():
+            size = self.state.arch.registers[reg][1] if reg in self.state.arch.registers else self.state.arch.bytes
+            try:
+                self.state.registers.store(reg, claripy.BVV(val & ((1 << (size * 8)) - 1), size * 8))
+            except KeyError as e:
+                l.warning("Reg %s was not set", e)
+
+        return core
+
     def _adjust_regs(self):
         """
         Adjust bp and sp w.r.t. stack difference between GDB session and angr.
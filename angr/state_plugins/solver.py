@@ -76,6 +76,59 @@ else:
 
 break_time = float(os.environ.get('SOLVER_BREAK_TIME', -1))
 
+#
+# Profiling stuff
+#
+
+# the solver methods whose run time is accounted while profiling, and the kind of query they are accounted as
+_profiled_queries = {
+    'eval_to_ast': 'eval',
+    '_eval': 'eval',
+    'max': 'max',
+    'min': 'min',
+    'solution': 'solution',
+    'is_true': 'is_true',
+    'is_false': 'is_false',
+    'unsat_core': 'unsat_core',
+    'satisfiable': 'satisfiable',
+    'unique': 'unique',
+}
+_unprofiled_methods = { }
+
+def _profiled_function(f, kind):
+    @functools.wraps(f)
+    def profiled(*args, **kwargs):
+        counters = profiling.counters
+        if counters is None or counters.solver_depth:
+            return f(*args, **kwargs)
+
+        counters.solver_depth += 1
+        start = time.perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            counters.solver_depth -= 1
+            counters.record_solver(kind, time.perf_counter() - start)
+
+    return profiled
+
+def enable_profiling():
+    """
+    Wrap the query methods of SimSolver so that they account their run time to the active profiling counters. The
+    methods are only wrapped while profiling, so they cost nothing extra otherwise.
+    """
+    if _unprofiled_methods:
+        return
+    for name, kind in _profiled_queries.items():
+        f = SimSolver.__dict__[name]
+        _unprofiled_methods[name] = f
+        setattr(SimSolver, name, _profiled_function(f, kind))
+
+def disable_profiling():
+    for name, f in _unprofiled_methods.items():
+        setattr(SimSolver, name, f)
+    _unprofiled_methods.clear()
+
 #
 # Various over-engineered crap
 #
@@ -881,5 +934,6 @@ from angr.sim_state import SimState
 SimState.register_default('solver', SimSolver)
 
 from .. import sim_options as o
+from ..misc import profiling
 from .inspect import BP_AFTER
 from ..errors import SimValueError, SimUnsatError, SimSolverModeError, SimSolverOptionError
@@ -6,6 +6,7 @@ import itertools
 l = logging.getLogger(name=__name__)
 
 import claripy
+from cachetools import LRUCache
 
 from ..storage.memory import SimMemory, DUMMY_SYMBOLIC_READ_VALUE
 from ..storage.paged_memory import SimPagedMemory
@@ -35,7 +36,8 @@ class SimSymbolicMemory(SimMemory): #pylint:disable=abstract-method
     def __init__(
         self, memory_backer=None, permissions_backer=None, mem=None, memory_id="mem",
         endness=None, abstract_backer=False, check_permissions=None,
-        read_strategies=None, write_strategies=None, stack_region_map=None, generic_region_map=None
+        read_strategies=None, write_strategies=None, stack_region_map=None, generic_region_map=None,
+        concretization_memo=None
     ):
         SimMemory.__init__(self,
                            endness=endness,
@@ -57,6 +59,9 @@ class SimSymbolicMemory(SimMemory): #pylint:disable=abstract-method
         self.read_strategies = read_strategies
         self.write_strategies = write_strategies
 
+        # memoized results of stateless concretization strategies, shared with all copies of this memory
+        self._concretization_memo = LRUCache(maxsize=10000) if concretization_memo is None else concretization_memo
+
 
     #
     # Lifecycle management
@@ -76,7 +81,8 @@ class SimSymbolicMemory(SimMemory): #pylint:disable=abstract-method
             read_strategies=[ s.copy() for s in self.read_strategies ],
             write_strategies=[ s.copy() for s in self.write_strategies ],
             stack_region_map=self._stack_region_map,
-            generic_region_map=self._generic_region_map
+            generic_region_map=self._generic_region_map,
+            concretization_memo=self._concretization_memo
         )
 
         return c
@@ -372,7 +378,7 @@ class SimSymbolicMemory(SimMemory): #pylint:disable=abstract-method
 
             # let's try to apply it!
             try:
-                a = s.concretize(self, e)
+                a = self._concretize_with_strategy(s, e)
             except SimUnsatError:
                 a = None
 
@@ -392,6 +398,49 @@ class SimSymbolicMemory(SimMemory): #pylint:disable=abstract-method
             "Unable to concretize address for %s with the provided strategies." % action
         )
 
+    def _concretize_with_strategy(self, strategy, addr):
+        """
+        Concretize an address with a single strategy. With MEMOIZE_ADDRESS_CONCRETIZATION, the results of stateless
+        strategies are memoized on the address and on the constraints that are (transitively) related to it, so that
+        states which share those constraints do not issue the same solver queries again.
+        """
+        if options.MEMOIZE_ADDRESS_CONCRETIZATION not in self.state.options or not strategy.cacheable or \
+                not isinstance(addr, claripy.ast.Base):
+            return strategy.concretize(self, addr)
+
+        key = (strategy, addr.cache_key, self._related_constraints(addr))
+        try:
+            r = self._concretization_memo[key]
+        except KeyError:
+            r = strategy.concretize(self, addr)
+            self._concretization_memo[key] = r
+        return list(r) if r is not None else None
+
+    def _related_constraints(self, expr):
+        """
+        Get the constraints of the state that share variables with an expression, directly or through other constraints.
+
+        :return: A frozenset of the cache keys of those constraints.
+        """
+        variables = set(expr.variables)
+        remaining = list(self.state.solver.constraints)
+        related = set()
+
+        changed = True
+        while changed:
+            changed = False
+            rest = [ ]
+            for c in remaining:
+                if variables.isdisjoint(c.variables):
+                    rest.append(c)
+                else:
+                    related.add(c.cache_key)
+                    variables |= c.variables
+                    changed = True
+            remaining = rest
+
+        return frozenset(related)
+
     def concretize_write_addr(self, addr, strategies=None):
         """
         Concretizes an address meant for writing.
@@ -706,6 +755,37 @@ class SimSymbolicMemory(SimMemory): #pylint:disable=abstract-method
             addr = self.state.solver.eval(dst)
         return self.mem.contains_no_backer(addr)
 
+    def load_concrete(self, addr, size, allow_partial=False):
+        """
+        Load raw bytes from memory when both the address and the contents are concrete. This bypasses expression
+        construction entirely, and is meant for fast paths (for example in SimProcedures) that fall back to a regular
+        load() when None is returned.
+
+        No fast path is taken when breakpoints on memory reads are set or memory actions are tracked, since loading this
+        way triggers neither. A single reference action is still recorded for the whole read when AUTO_REFS is set.
+
+        :param addr:                The address to load from, as an int or a claripy AST.
+        :param int size:            The number of bytes to load.
+        :param bool allow_partial:  Return the longest concrete prefix instead of None if some bytes are not concrete.
+        :return:                    The bytes, or None.
+        :rtype:                     bytes or None
+        """
+        if options.TRACK_MEMORY_ACTIONS in self.state.options or \
+                (self.state.has_plugin('inspect') and self.state.inspect._breakpoints['mem_read']):
+            return None
+
+        if not isinstance(addr, int):
+            if self.state.solver.symbolic(addr):
+                return None
+            addr = self.state.solver.eval(addr)
+
+        raw = self.mem.load_concrete_bytes(addr, size, allow_partial=allow_partial)
+        if raw and options.AUTO_REFS in self.state.options:
+            action = SimActionData(self.state, self.category, 'read', addr=addr, data=self.state.solver.BVV(raw),
+                                   size=len(raw) * self.state.arch.byte_width)
+            self.state.history.add_action(action)
+        return raw
+
     #
     # Writes
     #
@@ -1265,4 +1345,5 @@ SimState.register_default('sym_memory', SimSymbolicMemory)
 from ..errors import SimUnsatError, SimMemoryError, SimMemoryLimitError, SimMemoryAddressError, SimMergeError
 from .. import sim_options as options
 from .inspect import BP_AFTER, BP_BEFORE
+from .sim_action import SimActionData
 from .. import concretization_strategies
@@ -0,0 +1,168 @@
+import struct
+import logging
+
+from .file import SimHostFileMapping
+from .paged_memory import Page
+from ..errors import SimStateError
+
+l = logging.getLogger(name=__name__)
+
+PT_LOAD = 1
+PT_NOTE = 4
+NT_PRSTATUS = 1
+
+PF_X = 1
+PF_W = 2
+PF_R = 4
+
+EM_386 = 3
+EM_ARM = 40
+EM_X86_64 = 62
+EM_AARCH64 = 183
+
+# the machine type of the core files each architecture can be restored from
+_MACHINES = {
+    'X86': EM_386,
+    'AMD64': EM_X86_64,
+    'ARMEL': EM_ARM,
+    'ARMHF': EM_ARM,
+    'ARMCortexM': EM_ARM,
+    'AARCH64': EM_AARCH64,
+}
+
+# the layout of struct elf_prstatus for each machine type: the offset of pr_pid, the offset of pr_reg, and the angr
+# names of the registers in pr_reg. registers named None are not restored (segment selectors, orig_rax, etc.)
+_PRSTATUS_LAYOUTS = {
+    EM_X86_64: (32, 112, (
+        'r15', 'r14', 'r13', 'r12', 'rbp', 'rbx', 'r11', 'r10', 'r9', 'r8', 'rax', 'rcx', 'rdx', 'rsi', 'rdi', None,
+        'rip', None, 'eflags', 'rsp', None, 'fs', 'gs', None, None, None, None,
+    )),
+    EM_386: (24, 72, (
+        'ebx', 'ecx', 'edx', 'esi', 'edi', 'ebp', 'eax', None, None, None, None, None, 'eip', None, 'eflags', 'esp',
+        None,
+    )),
+    EM_AARCH64: (32, 112, tuple('x%d' % i for i in range(31)) + ('sp', 'pc', 'flags')),
+    EM_ARM: (24, 72, tuple('r%d' % i for i in range(16)) + ('flags', None)),
+}
+
+
+class SimElfCore(object):
+    """
+    An ELF core file, such as a crash dump, mapped in memory.
+
+    Nothing but the headers and the notes of the file is read up front: the memory the PT_LOAD segments hold is only
+    read as the pages it covers are touched, through :meth:`memory_segments`.
+
+    :param str path:    The path of the core file.
+
+    :ivar int machine:  The machine type (e_machine) of the core file.
+    :ivar str endness:  The endianness of the core file, as '<' or '>'.
+    :ivar int bits:     The word size of the core file.
+    :ivar list loads:   The (vaddr, offset, filesz, memsz, flags) of each PT_LOAD segment.
+    :ivar list threads: For each NT_PRSTATUS note, a (pid, registers) tuple, where the registers are a dict of register
+                        values by angr register name. The first one is the thread that caused the dump.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            self._mapping = SimHostFileMapping(path)
+        except (OSError, ValueError) as e:
+            raise SimStateError("Cannot map core file %s: %s" % (path, e))
+
+        self.machine = None
+        self.endness = None
+        self.bits = None
+        self.loads = [ ]
+        self.threads = [ ]
+        self._parse()
+
+    def _parse(self):
+        m = self._mapping
+        if m[:4] != b'\x7fELF':
+            raise SimStateError("%s is not an ELF file" % self.path)
+        elf_class, elf_data = m[4], m[5]
+        if elf_class not in (1, 2) or elf_data not in (1, 2):
+            raise SimStateError("%s has an unknown ELF class or data encoding" % self.path)
+        self.bits = 32 if elf_class == 1 else 64
+        self.endness = '<' if elf_data == 1 else '>'
+        e = self.endness
+
+        if self.bits == 64:
+            e_type, self.machine = struct.unpack_from(e + 'HH', m, 16)
+            e_phoff, = struct.unpack_from(e + 'Q', m, 32)
+            e_phentsize, e_phnum = struct.unpack_from(e + 'HH', m, 54)
+        else:
+            e_type, self.machine = struct.unpack_from(e + 'HH', m, 16)
+            e_phoff, = struct.unpack_from(e + 'I', m, 28)
+            e_phentsize, e_phnum = struct.unpack_from(e + 'HH', m, 42)
+        if e_type != 4:  # ET_CORE
+            raise SimStateError("%s is not a core file" % self.path)
+
+        for i in range(e_phnum):
+            off = e_phoff + i * e_phentsize
+            if self.bits == 64:
+                p_type, p_flags, p_offset, p_vaddr, _, p_filesz, p_memsz, _ = struct.unpack_from(e + 'IIQQQQQQ', m, off)
+            else:
+                p_type, p_offset, p_vaddr, _, p_filesz, p_memsz, p_flags, _ = struct.unpack_from(e + 'IIIIIIII', m, off)
+
+            if p_type == PT_LOAD:
+                self.loads.append((p_vaddr, p_offset, p_filesz, p_memsz, p_flags))
+            elif p_type == PT_NOTE:
+                self._parse_notes(p_offset, p_filesz)
+
+    def _parse_notes(self, offset, size):
+        m = self._mapping
+        e = self.endness
+        end = offset + size
+        while offset + 12 <= end:
+            namesz, descsz, n_type = struct.unpack_from(e + 'III', m, offset)
+            desc = offset + 12 + ((namesz + 3) & ~3)
+            if n_type == NT_PRSTATUS:
+                self.threads.append(self._parse_prstatus(m[desc:desc + descsz]))
+            offset = desc + ((descsz + 3) & ~3)
+
+    def _parse_prstatus(self, desc):
+        try:
+            pid_offset, reg_offset, names = _PRSTATUS_LAYOUTS[self.machine]
+        except KeyError:
+            raise SimStateError("Registers of core files of machine type %d are not supported" % self.machine)
+
+        fmt = self.endness + ('Q' if self.bits == 64 else 'I') * len(names)
+        if len(desc) < reg_offset + struct.calcsize(fmt):
+            raise SimStateError("Truncated NT_PRSTATUS note in %s" % self.path)
+
+        pid, = struct.unpack_from(self.endness + 'i', desc, pid_offset)
+        values = struct.unpack_from(fmt, desc, reg_offset)
+        return pid, { name: value for name, value in zip(names, values) if name is not None }
+
+    def check_arch(self, arch):
+        """
+        Make sure that the core file was dumped from a process of an architecture.
+
+        :param arch:    The archinfo.Arch.
+        :raises SimStateError: If it was not.
+        """
+        if _MACHINES.get(arch.name, None) != self.machine or arch.bits != self.bits:
+            raise SimStateError("Core file %s (machine type %d, %d bits) does not match architecture %s" % (
+                self.path, self.machine, self.bits, arch.name))
+
+    def memory_segments(self):
+        """
+        The memory held by the PT_LOAD segments, as taken by :meth:`angr.storage.paged_memory.SimPagedMemory.map_segments`.
+        Only the part of each segment that was dumped is included: segments or parts of segments that were left out of
+        the dump (typically read-only file mappings) keep the content of the memory they are laid over.
+        """
+        segments = [ ]
+        for vaddr, offset, filesz, _, flags in self.loads:
+            if filesz == 0:
+                continue
+            permissions = 0
+            if flags & PF_R:
+                permissions |= Page.PROT_READ
+            if flags & PF_W:
+                permissions |= Page.PROT_WRITE
+            if flags & PF_X:
+                permissions |= Page.PROT_EXEC
+            segments.append((vaddr, self._mapping, offset, filesz, permissions))
+        return segments
@@ -1,6 +1,7 @@
 import claripy
 import logging
 import itertools
+import mmap
 
 from .memory_object import SimMemoryObject
 from ..state_plugins.plugin import SimStatePlugin
@@ -36,6 +37,25 @@ class Flags: # pylint: disable=W0232,
     O_TRUNC = 1024
 
 
+class SimHostFileMapping(mmap.mmap):
+    """
+    A read-only memory mapping of a file on the host. It can be used as the content of a SimFile, in which case the
+    file is paged in lazily instead of being read into memory up front. Unlike a plain mmap, it can be pickled: the
+    file is mapped again when unpickling.
+
+    :param str path:    The path of the file on the host. The file must not be empty.
+    """
+
+    def __new__(cls, path):
+        with open(path, 'rb') as fp:
+            self = super(SimHostFileMapping, cls).__new__(cls, fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        return self
+
+    def __reduce__(self):
+        return type(self), (self.path,)
+
+
 def _deps_unpack(a):
     if isinstance(a, SimActionObject):
         return a.ast, a.reg_deps, a.tmp_deps
@@ -143,7 +163,9 @@ class SimFile(SimFileBase, SimSymbolicMemory):
     it are very simple.
 
     :param name:        The name of the file
-    :param content:     Optional initial content for the file as a string or bitvector
+    :param content:     Optional initial content for the file as a string or bitvector, or as a read-only mmap (e.g. a
+                        SimHostFileMapping). Mapped content is only turned into memory objects a page at a time, as the
+                        file is read or written, and the mapping is shared between all copies of the file.
     :param size:        Optional size of the file. If content is not specified, it defaults to zero
     :param has_end:     Whether the size boundary is treated as the end of the file or a frontier at which new content
                         will be generated. If unspecified, will pick its value based on options.FILES_HAVE_EOF. Another
@@ -157,6 +179,14 @@ class SimFile(SimFileBase, SimSymbolicMemory):
     """
     def __init__(self, name, content=None, size=None, has_end=None, seekable=True, writable=True, ident=None, concrete=None, **kwargs):
         kwargs['memory_id'] = kwargs.get('memory_id', 'file')
+        if isinstance(content, mmap.mmap):
+            # large concrete content: the pages of the file are initialized from the mapping on demand
+            kwargs['memory_backer'] = content
+            if size is None:
+                size = len(content)
+            if concrete is None:
+                concrete = True
+            content = None
         super(SimFile, self).__init__(name, writable=writable, ident=ident, **kwargs)
         self._size = size
         self.has_end = has_end
@@ -288,7 +318,8 @@ class SimFile(SimFileBase, SimSymbolicMemory):
             read_strategies=[ s.copy() for s in self.read_strategies ],
             write_strategies=[ s.copy() for s in self.write_strategies ],
             stack_region_map=self._stack_region_map,
-            generic_region_map=self._generic_region_map
+            generic_region_map=self._generic_region_map,
+            concretization_memo=self._concretization_memo
         )
 
     def merge(self, others, merge_conditions, common_ancestor=None): # pylint: disable=unused-argument
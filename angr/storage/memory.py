@@ -826,6 +826,18 @@ class SimMemory(SimStatePlugin):
 
         return r
 
+    def load_concrete(self, addr, size, allow_partial=False): # pylint:disable=no-self-use,unused-argument
+        """
+        Load raw bytes from memory without building any expression, if both the address and the contents are concrete.
+        Memory models that do not support this return None, and callers are expected to fall back to load().
+
+        :param addr:                The address to load from.
+        :param int size:            The number of bytes to load.
+        :param bool allow_partial:  Return the longest concrete prefix instead of None if some bytes are not concrete.
+        :return:                    The bytes, or None.
+        """
+        return None
+
     def _constrain_underconstrained_index(self, addr_e):
         if not self.state.uc_manager.is_bounded(addr_e) or self.state.solver.max_int(addr_e) - self.state.solver.min_int( addr_e) >= self._read_address_range:
             # in under-constrained symbolic execution, we'll assign a new memory region for this address
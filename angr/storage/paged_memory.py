@@ -1,3 +1,6 @@
+import sys
+import mmap
+import bisect
 import cooldict
 import claripy
 import cle
@@ -102,6 +105,13 @@ class BasePage:
     def keys(self):
         raise NotImplementedError()
 
+    def estimated_size(self):
+        """
+        Estimate the number of bytes held by this page, not counting the memory objects, which are shared between the
+        copies of a page.
+        """
+        raise NotImplementedError()
+
     def replace_mo(self, state, old_mo, new_mo):
         raise NotImplementedError()
 
@@ -140,6 +150,10 @@ class TreePage(BasePage):
         else:
             return set.union(*(set(range(*self._resolve_range(mo))) for mo in self._storage.values()))
 
+    def estimated_size(self):
+        # the dict, plus the sorted list of keys and the keys themselves
+        return sys.getsizeof(self._storage) + len(self._storage) * 40
+
     def replace_mo(self, state, old_mo, new_mo):
         start, end = self._resolve_range(old_mo)
         for key in self._storage.irange(start, end-1):
@@ -259,6 +273,9 @@ class ListPage(BasePage):
         else:
             return [ self._page_addr + i for i,v in enumerate(self._storage) if v is not None ]
 
+    def estimated_size(self):
+        return sys.getsizeof(self._storage)
+
     def replace_mo(self, state, old_mo, new_mo):
         if self._sinkhole is old_mo:
             self._sinkhole = new_mo
@@ -321,6 +338,81 @@ class ListPage(BasePage):
 
 Page = ListPage
 
+# memory backers of these types are treated as a flat buffer of bytes starting at address 0
+_flat_backer_types = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+class SimMappedSegments(object):
+    """
+    A memory backer made of segments of a buffer, such as the segments of a memory-mapped core file, laid at some
+    addresses over another memory backer. Where a segment and the other memory backer overlap, the segment wins. The
+    buffer is only sliced when a page that a segment covers is initialized, so large mappings cost nothing until they
+    are touched.
+
+    :param base:        The memory backer the segments are laid over.
+    :param segments:    An iterable of (address, buffer, offset, size, permissions) tuples: the segment at the address is
+                        the size bytes of the buffer starting at the offset. The permissions are a combination of the
+                        Page.PROT_* bits, or None to keep the permissions of the pages the segment covers.
+    """
+
+    def __init__(self, base, segments=()):
+        self.base = base
+        self._segments = [ ]
+        self._starts = [ ]
+        self._max_size = 0
+        for seg in segments:
+            self.add_segment(*seg)
+
+    def add_segment(self, addr, data, offset, size, permissions=None):
+        """
+        Add a segment. It takes precedence over the segments added before it where they overlap.
+        """
+        if size <= 0:
+            return
+        idx = bisect.bisect_right(self._starts, addr)
+        self._starts.insert(idx, addr)
+        self._max_size = max(self._max_size, size)
+        self._segments.insert(idx, (addr, len(self._segments), data, offset, size, permissions))
+
+    @property
+    def segments(self):
+        """
+        The (address, size, permissions) of each segment, by address.
+        """
+        return [ (addr, size, permissions) for addr, _, _, _, size, permissions in self._segments ]
+
+    def segments_in(self, start, end):
+        """
+        Get the data of the segments that intersect with a range of addresses, in the order the segments were added.
+
+        :param int start:   The start of the range.
+        :param int end:     The end of the range, excluded.
+        :return:            A list of (address, bytes, permissions) tuples, clipped to the range.
+        """
+        found = [ ]
+        # segments may overlap, so walk back from the end of the range until no segment can reach the range anymore
+        for i in range(bisect.bisect_left(self._starts, end) - 1, -1, -1):
+            addr, order, data, offset, size, permissions = self._segments[i]
+            if addr + self._max_size <= start:
+                break
+            if addr + size <= start:
+                continue
+            lo = max(start, addr)
+            hi = min(end, addr + size)
+            found.append((order, lo, data[offset + lo - addr:offset + hi - addr], permissions))
+        found.sort(key=lambda f: f[0])
+        return [ (lo, bytes(chunk), permissions) for _, lo, chunk, permissions in found ]
+
+    def keys(self):
+        keys = set()
+        if isinstance(self.base, _flat_backer_types):
+            keys.update(range(len(self.base)))
+        elif self.base is not None:
+            keys.update(self.base.keys())
+        for addr, _, _, _, size, _ in self._segments:
+            keys.update(range(addr, addr + size))
+        return keys
+
 #pylint:disable=unidiomatic-typecheck
 
 class SimPagedMemory:
@@ -460,6 +552,55 @@ class SimPagedMemory:
 
         return result
 
+    def load_concrete_bytes(self, addr, num_bytes, allow_partial=False):
+        """
+        Load a range of memory as raw bytes, without building any claripy expression.
+
+        :param int addr:            Address to start loading.
+        :param int num_bytes:       Number of bytes to load.
+        :param bool allow_partial:  If True, return the longest concrete prefix of the range instead of giving up when
+                                    a byte is missing or symbolic.
+        :return:                    The bytes, or None if any byte in the range is missing or symbolic (and
+                                    allow_partial is False).
+        :rtype:                     bytes or None
+        """
+        if num_bytes <= 0:
+            return b""
+        if self.byte_width != 8:
+            return None
+
+        end = addr + num_bytes
+        items = self.load_objects(addr, num_bytes, ret_on_segv=True)
+
+        result = bytearray()
+        cur = addr
+        last_mo = None
+        for i, (mo_addr, mo) in enumerate(items):
+            if mo_addr != cur:
+                # some bytes are missing
+                break
+            next_addr = items[i + 1][0] if i + 1 < len(items) else end
+            seg_end = min(end, next_addr, mo.last_addr + 1)
+
+            obj = mo.object
+            if mo is not last_mo:
+                if obj.symbolic or not isinstance(obj, claripy.ast.BV) or obj.size() % 8 != 0 or \
+                        type(mo.length) is not int:
+                    break
+                last_mo = mo
+
+            # cut the bytes out of the big-endian value instead of converting the whole object
+            start, stop = cur - mo.base, seg_end - mo.base
+            value = obj._model_concrete.value >> ((obj.size() // 8 - stop) * 8)
+            result += (value & ((1 << ((stop - start) * 8)) - 1)).to_bytes(stop - start, 'big')
+            cur = seg_end
+            if cur == end:
+                break
+
+        if cur != end and not allow_partial:
+            return None
+        return bytes(result)
+
     #
     # Page management
     #
@@ -475,18 +616,40 @@ class SimPagedMemory:
             return False
         self._initialized.add(n)
 
-        new_page_addr = n*self._page_size
-        initialized = False
-
         if self.state is not None:
             self.state.scratch.push_priv(True)
 
-        if self._memory_backer is None:
+        initialized = self._initialize_page_from(self._memory_backer, n, new_page)
+
+        if self.state is not None:
+            self.state.scratch.pop_priv()
+        return initialized
+
+    def _initialize_page_from(self, memory_backer, n, new_page):
+        new_page_addr = n*self._page_size
+        initialized = False
+
+        if memory_backer is None:
             pass
 
-        elif isinstance(self._memory_backer, cle.Clemory) and self._memory_backer.is_concrete_target_set():
+        elif isinstance(memory_backer, SimMappedSegments):
+            # the segments take precedence over the memory backer they are laid over
+            initialized = self._initialize_page_from(memory_backer.base, n, new_page)
+            for addr, data, permissions in memory_backer.segments_in(new_page_addr, new_page_addr + self._page_size):
+                if permissions is not None and addr <= new_page_addr:
+                    new_page.permissions = claripy.BVV(permissions, 3)
+                if self.byte_width == 8:
+                    mo = SimMemoryObject(claripy.BVV(data), addr, byte_width=self.byte_width)
+                    self._apply_object_to_page(new_page_addr, mo, page=new_page)
+                else:
+                    for i, byte in enumerate(data):
+                        mo = SimMemoryObject(claripy.BVV(byte, self.byte_width), addr + i, byte_width=self.byte_width)
+                        self._apply_object_to_page(new_page_addr, mo, page=new_page)
+                initialized = True
+
+        elif isinstance(memory_backer, cle.Clemory) and memory_backer.is_concrete_target_set():
             try:
-                concrete_memory = self._memory_backer.load(new_page_addr, self._page_size)
+                concrete_memory = memory_backer.load(new_page_addr, self._page_size)
                 backer = claripy.BVV(concrete_memory)
                 mo = SimMemoryObject(backer, new_page_addr, byte_width=self.byte_width)
                 self._apply_object_to_page(n * self._page_size, mo, page=new_page)
@@ -496,9 +659,7 @@ class SimPagedMemory:
                 this can happen when a memory allocation function/syscall is invoked in the simulated execution \
                 and the map_region function is called")
 
-                return initialized
-
-        elif isinstance(self._memory_backer, cle.Clemory):
+        elif isinstance(memory_backer, cle.Clemory):
             # find permission backer associated with the address
             # fall back to default (read-write-maybe-exec) if can't find any
             for start, end in self._permission_map:
@@ -508,7 +669,7 @@ class SimPagedMemory:
                     break
 
             # for each clemory backer which intersects with the page, apply its relevant data
-            for backer_addr, backer in self._memory_backer.backers(new_page_addr):
+            for backer_addr, backer in memory_backer.backers(new_page_addr):
                 if backer_addr >= new_page_addr + self._page_size:
                     break
 
@@ -533,36 +694,49 @@ class SimPagedMemory:
 
                 initialized = True
 
-        elif len(self._memory_backer) <= self._page_size:
-            for i in self._memory_backer:
+        elif isinstance(memory_backer, _flat_backer_types):
+            # a flat buffer (e.g. a memory-mapped file) starting at address 0. only the part covering this page is
+            # turned into a memory object.
+            relevant_data = memory_backer[new_page_addr:new_page_addr + self._page_size]
+            if relevant_data:
+                if self.byte_width == 8:
+                    mo = SimMemoryObject(claripy.BVV(bytes(relevant_data)), new_page_addr, byte_width=self.byte_width)
+                    self._apply_object_to_page(new_page_addr, mo, page=new_page)
+                else:
+                    for i, byte in enumerate(relevant_data):
+                        mo = SimMemoryObject(claripy.BVV(byte, self.byte_width), new_page_addr + i,
+                                             byte_width=self.byte_width)
+                        self._apply_object_to_page(new_page_addr, mo, page=new_page)
+                initialized = True
+
+        elif len(memory_backer) <= self._page_size:
+            for i in memory_backer:
                 if new_page_addr <= i <= new_page_addr + self._page_size:
-                    if isinstance(self._memory_backer[i], claripy.ast.Base):
-                        backer = self._memory_backer[i]
-                    elif isinstance(self._memory_backer[i], bytes):
-                        backer = claripy.BVV(self._memory_backer[i])
+                    if isinstance(memory_backer[i], claripy.ast.Base):
+                        backer = memory_backer[i]
+                    elif isinstance(memory_backer[i], bytes):
+                        backer = claripy.BVV(memory_backer[i])
                     else:
-                        backer = claripy.BVV(self._memory_backer[i], self.byte_width)
+                        backer = claripy.BVV(memory_backer[i], self.byte_width)
                     mo = SimMemoryObject(backer, i, byte_width=self.byte_width)
                     self._apply_object_to_page(n*self._page_size, mo, page=new_page)
                     initialized = True
 
-        elif len(self._memory_backer) > self._page_size:
+        elif len(memory_backer) > self._page_size:
             for i in range(self._page_size):
                 try:
-                    if isinstance(self._memory_backer[i], claripy.ast.Base):
-                        backer = self._memory_backer[i]
-                    elif isinstance(self._memory_backer[i], bytes):
-                        backer = claripy.BVV(self._memory_backer[i])
+                    if isinstance(memory_backer[i], claripy.ast.Base):
+                        backer = memory_backer[i]
+                    elif isinstance(memory_backer[i], bytes):
+                        backer = claripy.BVV(memory_backer[i])
                     else:
-                        backer = claripy.BVV(self._memory_backer[i], self.byte_width)
+                        backer = claripy.BVV(memory_backer[i], self.byte_width)
                     mo = SimMemoryObject(backer, new_page_addr+i, byte_width=self.byte_width)
                     self._apply_object_to_page(n*self._page_size, mo, page=new_page)
                     initialized = True
                 except KeyError:
                     pass
 
-        if self.state is not None:
-            self.state.scratch.pop_priv()
         return initialized
 
     def _get_page(self, page_num, write=False, create=False, initialize=True):
@@ -614,7 +788,12 @@ class SimPagedMemory:
 
     def keys(self):
         sofar = set()
-        sofar.update(self._memory_backer.keys())
+        if isinstance(self._memory_backer, SimMappedSegments):
+            sofar.update(self._memory_backer.keys())
+        elif isinstance(self._memory_backer, _flat_backer_types):
+            sofar.update(range(len(self._memory_backer)))
+        else:
+            sofar.update(self._memory_backer.keys())
 
         for i, p in self._pages.items():
             sofar.update([k + i * self._page_size for k in p.keys()])
@@ -624,6 +803,16 @@ class SimPagedMemory:
     def __len__(self):
         return len(self.keys())
 
+    def page_ownership(self):
+        """
+        List the pages held by this memory, and whether this memory is their only holder. Pages that this memory has not
+        written to since it was last branched are shared copy-on-write with other memories.
+
+        :return:    A list of (page number, page, owned) tuples.
+        """
+        cowed = self._cowed
+        return [ (n, page, n in cowed) for n, page in self._pages.items() ]
+
     def changed_bytes(self, other):
         return self.__changed_bytes(other)
 
@@ -1076,6 +1265,36 @@ class SimPagedMemory:
             del self._pages[base_page_num + page]
             del self._symbolic_addrs[base_page_num + page]
 
+    def map_segments(self, segments):
+        """
+        Lay segments of a buffer over the memory backer, so that the pages they cover are initialized from them from now
+        on. Pages of this memory that the segments cover and that were already initialized are discarded, along with
+        anything that was stored in them. Other memories this one was branched from or into are not affected.
+
+        :param segments:    An iterable of (address, buffer, offset, size, permissions) tuples, as for SimMappedSegments.
+        """
+        self._memory_backer = SimMappedSegments(self._memory_backer, segments)
+
+        ranges = sorted((addr // self._page_size, (addr + size - 1) // self._page_size)
+                        for addr, size, _ in self._memory_backer.segments)
+        starts = [ lo for lo, _ in ranges ]
+        max_pages = max([ hi - lo for lo, hi in ranges ] + [ 0 ])
+
+        def _covered(n):
+            for i in range(bisect.bisect_right(starts, n) - 1, -1, -1):
+                lo, hi = ranges[i]
+                if lo + max_pages < n:
+                    break
+                if n <= hi:
+                    return True
+            return False
+
+        for n in [ n for n in self._pages if _covered(n) ]:
+            del self._pages[n]
+            self._symbolic_addrs.pop(n, None)
+            self._cowed.discard(n)
+        self._initialized = { n for n in self._initialized if not _covered(n) }
+
     def flush_pages(self, white_list):
         """
             :param white_list: white list of page number to exclude from the flush
@@ -0,0 +1,71 @@
+import sys
+import os
+import time
+
+import angr
+
+test_location = str(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../'))
+
+
+def _args_without_plans(cc, state, count):
+    # how arguments were located before the locations were cached: a new session for every argument
+    args = [ ]
+    for index in range(count):
+        session = cc.arg_session
+        loc = [ session.next_arg(False) for _ in range(index + 1) ][-1]
+        args.append(loc.get_value(state))
+    return args
+
+
+def perf_arg_fetch():
+    p = angr.Project(os.path.join(test_location, 'binaries', 'tests', 'x86_64', 'fauxware'), auto_load_libs=False)
+    state = p.factory.entry_state()
+    cc = p.factory.cc()
+
+    n = 20000
+    for count in (2, 6, 10):
+        start = time.time()
+        for _ in range(n):
+            _args_without_plans(cc, state, count)
+        before = time.time() - start
+
+        start = time.time()
+        for _ in range(n):
+            cc.arg_values(state, count)
+        after = time.time() - start
+
+        print("%2d args: %6.1f us/call without plans, %6.1f us/call with plans" % (
+            count, before / n * 1e6, after / n * 1e6))
+
+    n = 100000
+    start = time.time()
+    for _ in range(n):
+        cc.arg_locs([False, True, False, True])
+    print("arg_locs: %.1f us/call" % ((time.time() - start) / n * 1e6))
+
+
+def perf_libc_calls():
+    p = angr.Project(os.path.join(test_location, 'binaries', 'tests', 'x86_64', 'sprintf_test'), auto_load_libs=False)
+    sm = p.factory.simulation_manager(p.factory.entry_state())
+    profiler = sm.use_technique(angr.exploration_techniques.Profiler())
+
+    start = time.time()
+    sm.run()
+    elapsed = time.time() - start
+
+    procedures = profiler.report()['engines'].get('SimEngineProcedure', {'count': 0, 'time': 0.0})
+    print("%d steps in %f sec, %d SimProcedure calls taking %f sec" % (
+        profiler.steps, elapsed, procedures['count'], procedures['time']))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for arg in sys.argv[1:]:
+            print('perf_' + arg)
+            globals()['perf_' + arg]()
+
+    else:
+        for fk, fv in list(globals().items()):
+            if fk.startswith('perf_') and callable(fv):
+                print(fk)
+                res = fv()
@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+import timeit
+
+import angr
+
+test_location = str(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../'))
+
+
+def perf_plugin_access():
+    p = angr.Project(os.path.join(test_location, 'binaries', 'tests', 'x86_64', 'fauxware'), auto_load_libs=False)
+    state = p.factory.entry_state()
+    # make sure that every plugin we time is active
+    for name in ('memory', 'registers', 'regs', 'solver', 'history', 'inspect'):
+        state.get_plugin(name)
+
+    n = 1000000
+    for stmt in ('state.memory', 'state.regs', 'state.solver', 'state.history', 'state.inspect', 'state.arch',
+                 'state.has_plugin("inspect")', 'state.get_plugin("memory")'):
+        elapsed = timeit.timeit(stmt, globals={'state': state}, number=n)
+        print("%-30s %7.1f ns/access" % (stmt, elapsed / n * 1e9))
+
+    # first access to a default plugin on a fresh copy goes through the preset
+    n = 10000
+    copies = [ state.copy() for _ in range(n) ]
+    start = time.time()
+    for s in copies:
+        _ = s.callstack
+    elapsed = time.time() - start
+    print("%-30s %7.1f us/access" % ('lazy default plugin', elapsed / n * 1e6))
+
+    start = time.time()
+    for _ in range(n):
+        state.copy()
+    elapsed = time.time() - start
+    print("%-30s %7.1f us/copy" % ('state.copy()', elapsed / n * 1e6))
+
+
+def perf_step_throughput():
+    p = angr.Project(os.path.join(test_location, 'binaries', 'tests', 'x86_64', 'fauxware'), auto_load_libs=False)
+    sm = p.factory.simulation_manager(p.factory.entry_state())
+
+    steps = 0
+    start = time.time()
+    while sm.active and steps < 200:
+        sm.step()
+        steps += 1
+    elapsed = time.time() - start
+
+    print("%d steps in %f sec, %.1f steps/sec" % (steps, elapsed, steps / elapsed))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for arg in sys.argv[1:]:
+            print('perf_' + arg)
+            globals()['perf_' + arg]()
+
+    else:
+        for fk, fv in list(globals().items()):
+            if fk.startswith('perf_') and callable(fv):
+                print(fk)
+                res = fv()
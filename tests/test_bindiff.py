@@ -36,6 +36,31 @@ def test_bindiff_x86_64():
     nose.tools.assert_in((0x400616, 0x400616), block_matches)
     nose.tools.assert_in((0x40061e, 0x40061e), block_matches)
 
+def test_bindiff_workers():
+    binary_path_1 = test_location + "/x86_64/bindiff_a"
+    binary_path_2 = test_location + "/x86_64/bindiff_b"
+    b = angr.Project(binary_path_1, load_options={"auto_load_libs": False})
+    b2 = angr.Project(binary_path_2, load_options={"auto_load_libs": False})
+    serial = b.analyses.BinDiff(b2)
+    parallel = b.analyses.BinDiff(b2, cfg_a=serial.cfg_a, cfg_b=serial.cfg_b, workers=2)
+
+    nose.tools.assert_equal(serial.function_matches, parallel.function_matches)
+    nose.tools.assert_equal(set(serial.identical_functions), set(parallel.identical_functions))
+    for func_a, func_b in serial.function_matches:
+        matches_serial = { (x.addr, y.addr) for x, y in serial.get_function_diff(func_a, func_b).block_matches }
+        matches_parallel = { (x.addr, y.addr) for x, y in parallel.get_function_diff(func_a, func_b).block_matches }
+        nose.tools.assert_equal(matches_serial, matches_parallel)
+
+def test_closest_matches():
+    from angr.analyses.bindiff import _get_closest_matches
+    a = {'a1': (1, 2, 0), 'a2': (5, 5, 1), 'a3': (1, 2, 0)}
+    b = {'b1': (1, 2, 1), 'b2': (6, 5, 1), 'b3': (4, 5, 1), 'b4': (1, 3, 0)}
+    closest = _get_closest_matches(a, b)
+    nose.tools.assert_equal(sorted(closest['a1']), ['b1', 'b4'])
+    nose.tools.assert_equal(sorted(closest['a2']), ['b2', 'b3'])
+    nose.tools.assert_equal(closest['a1'], closest['a3'])
+    nose.tools.assert_equal(_get_closest_matches(a, {}), {'a1': [], 'a2': [], 'a3': []})
+
 def run_all():
     functions = globals()
     all_functions = dict(filter((lambda kv: kv[0].startswith('test_')), functions.items()))
@@ -15,5 +15,20 @@ def test_block_cache():
     b = p.factory.block(p.entry)
     assert p.factory.block(p.entry).vex is not b.vex
 
+def test_plan_cache():
+    p = angr.Project(os.path.join(test_location, "x86_64", "fauxware"), translation_cache=True)
+    engine = p.engines.vex
+    irsb = p.factory.block(p.entry).vex
+    plan = engine.get_plan(irsb)
+    assert engine.get_plan(p.factory.block(p.entry).vex) is plan
+    assert len(plan.stmts) == len(irsb.statements)
+    assert plan.insn_addrs == p.factory.block(p.entry).instruction_addrs
+
+    # stepping through the block must give the same result as before
+    state = p.factory.entry_state()
+    succ = p.factory.successors(state)
+    assert succ.artifacts['insn_addrs'] == plan.insn_addrs
+
 if __name__ == "__main__":
     test_block_cache()
+    test_plan_cache()
@@ -74,6 +74,20 @@ def run_callable_c_manysum(arch):
     nose.tools.assert_false(result.symbolic)
     nose.tools.assert_equal(result._model_concrete.value, sum(range(12)))
 
+def run_call_batch(arch):
+    addr = addresses_manysum[arch]
+    p = angr.Project(os.path.join(location, arch, 'manysum'))
+    cc = p.factory.cc(func_ty="int f(int, int, int, int, int, int, int, int, int, int, int)")
+    sumlots = p.factory.callable(addr, cc=cc)
+    arg_tuples = [tuple(range(i, i + 11)) for i in range(8)]
+
+    expected = [sumlots(*args)._model_concrete.value for args in arg_tuples]
+    results = sumlots.call_batch(iter(arg_tuples))
+    nose.tools.assert_equal([r._model_concrete.value for r in results], expected)
+
+    results = sumlots.call_batch(arg_tuples, unicorn=False, workers=2, chunksize=3)
+    nose.tools.assert_equal([r._model_concrete.value for r in results], expected)
+
 type_cache = None
 
 def run_manyfloatsum(arch):
@@ -147,6 +161,11 @@ def test_callable_c_manyfloatsum():
         yield run_callable_c_manysum, arch
 
 
+def test_call_batch():
+    for arch in ('i386', 'x86_64'):
+        yield run_call_batch, arch
+
+
 if __name__ == "__main__":
     print('testing manyfloatsum with symbolic arguments')
     for func, march in test_manyfloatsum_symbolic():
@@ -171,3 +190,7 @@ if __name__ == "__main__":
     for func, march in test_callable_c_manyfloatsum():
         print('* testing ' + march)
         func(march)
+    print('testing batched calls')
+    for func, march in test_call_batch():
+        print('* testing ' + march)
+        func(march)
@@ -41,5 +41,35 @@ def test_calling_conventions():
         for index, arg in enumerate(args):
             nose.tools.assert_true(s.solver.is_true(manyargs.arg(index) == arg))
 
+def test_arg_plans():
+    from angr.calling_conventions import SimCCSystemVAMD64, SimRegArg, SimStackArg
+
+    s = SimState(arch='AMD64')
+    cc = SimCCSystemVAMD64(s.arch)
+
+    locs = cc.arg_locs([False, True, False])
+    nose.tools.assert_equal(locs, [SimRegArg('rdi', 8), SimRegArg('xmm0', 16), SimRegArg('rsi', 8)])
+    # the locations are computed once, but callers get a list of their own
+    again = cc.arg_locs([False, True, False])
+    nose.tools.assert_equal(again, locs)
+    nose.tools.assert_is_not(again, locs)
+    nose.tools.assert_is(again[0], locs[0])
+
+    # all arguments at once, in the same locations as one at a time
+    for i, reg in enumerate(('rdi', 'rsi', 'rdx', 'rcx', 'r8', 'r9')):
+        s.registers.store(reg, i + 1)
+    s.memory.store(s.regs.sp + 8, s.solver.BVV(7, 64), endness=s.arch.memory_endness)
+    values = cc.arg_values(s, 7)
+    nose.tools.assert_equal(len(values), 7)
+    for i, value in enumerate(values):
+        nose.tools.assert_true(s.solver.is_true(value == i + 1))
+        nose.tools.assert_true(s.solver.is_true(cc.arg(s, i) == value))
+
+    # customizing the CC discards the cached locations
+    cc.args = [ SimStackArg(8, 8) ]
+    nose.tools.assert_equal(cc.arg_locs([False]), [SimStackArg(8, 8)])
+    nose.tools.assert_true(s.solver.is_true(cc.arg(s, 0) == 7))
+
 if __name__ == '__main__':
     test_calling_conventions()
+    test_arg_plans()
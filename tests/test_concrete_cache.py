@@ -0,0 +1,136 @@
+import nose
+
+from angr import ConcreteTargetCache
+from angr.errors import SimConcreteMemoryError, SimConcreteRegisterError
+
+
+class _FakeTarget(object):
+    """
+    An in-process stand-in for a concrete target, counting the requests made to it.
+    """
+
+    def __init__(self, regions, registers):
+        self.regions = { start: bytearray(data) for start, data in regions.items() }
+        self.registers = dict(registers)
+        self.memory_requests = [ ]
+        self.register_requests = [ ]
+        self.runs = 0
+
+    def read_memory(self, address, nbytes, **kwargs):
+        self.memory_requests.append((address, nbytes))
+        for start, data in self.regions.items():
+            if start <= address and address + nbytes <= start + len(data):
+                return bytes(data[address - start:address - start + nbytes])
+        raise SimConcreteMemoryError("%#x is not mapped" % address)
+
+    def write_memory(self, address, value, **kwargs):
+        for start, data in self.regions.items():
+            if start <= address < start + len(data):
+                data[address - start:address - start + len(value)] = value
+
+    def read_register(self, register, **kwargs):
+        self.register_requests.append([register])
+        try:
+            return self.registers[register]
+        except KeyError:
+            raise SimConcreteRegisterError("Unknown register %s" % register)
+
+    def read_registers(self, registers):
+        self.register_requests.append(list(registers))
+        try:
+            return [ self.registers[r] for r in registers ]
+        except KeyError:
+            raise SimConcreteRegisterError("Unknown register")
+
+    def run(self):
+        self.runs += 1
+        self.regions[0x10000][0] ^= 0xff
+        self.registers['pc'] += 4
+
+
+def _target():
+    return _FakeTarget({ 0x10000: bytes(range(256)) * 0x80, 0x20000: b'\x41' * 0x1000 },
+                       { 'pc': 0x10000, 'rsp': 0x20800, 'rax': 0 })
+
+
+def test_read_ahead():
+    target = _target()
+    cache = ConcreteTargetCache(target, page_size=0x1000, read_ahead=3)
+
+    # the first miss reads the page and the three after it
+    nose.tools.assert_equal(cache.read_memory(0x10010, 4), bytes(range(0x10, 0x14)))
+    nose.tools.assert_equal(target.memory_requests, [ (0x10000, 0x4000) ])
+    for addr in range(0x10000, 0x14000, 0x1000):
+        cache.read_memory(addr, 0x10)
+    nose.tools.assert_equal(len(target.memory_requests), 1)
+    nose.tools.assert_equal(cache.hits, 4)
+
+    # reads spanning pages are served in one piece
+    nose.tools.assert_equal(cache.read_memory(0x10ffe, 4), bytes([ 0xfe, 0xff, 0, 1 ]))
+
+    # a window running into unmapped memory falls back to single pages
+    cache.read_memory(0x16000, 4)
+    nose.tools.assert_equal(target.memory_requests[1], (0x16000, 0x4000))
+    nose.tools.assert_equal(target.memory_requests[2:], [ (0x16000, 0x1000), (0x17000, 0x1000), (0x18000, 0x1000),
+                                                         (0x19000, 0x1000) ])
+    requests = len(target.memory_requests)
+    nose.tools.assert_raises(SimConcreteMemoryError, cache.read_memory, 0x18000, 4)
+    nose.tools.assert_equal(len(target.memory_requests), requests)
+
+
+def test_prefetch():
+    target = _target()
+    cache = ConcreteTargetCache(target, page_size=0x1000, read_ahead=0, max_batch=2)
+
+    cache.prefetch([ (0x10008, 0x10010), (0x11000, 0x13000), (0x20000, 0x20010) ])
+    nose.tools.assert_equal(target.memory_requests, [ (0x10000, 0x2000), (0x12000, 0x1000), (0x20000, 0x1000) ])
+    cache.read_memory(0x12fe0, 0x20)
+    cache.read_memory(0x20000, 0x10)
+    nose.tools.assert_equal(len(target.memory_requests), 3)
+
+
+def test_epochs():
+    target = _target()
+    cache = ConcreteTargetCache(target, page_size=0x1000)
+
+    nose.tools.assert_equal(cache.read_memory(0x10000, 1), b'\x00')
+    nose.tools.assert_equal(cache.read_register('pc'), 0x10000)
+
+    # writes drop the pages they cover
+    cache.write_memory(0x10000, b'\x01')
+    nose.tools.assert_equal(cache.read_memory(0x10000, 1), b'\x01')
+
+    # resuming the process forgets everything
+    cache.run()
+    nose.tools.assert_equal(target.runs, 1)
+    nose.tools.assert_equal(cache.epoch, 1)
+    nose.tools.assert_equal(cache.read_memory(0x10000, 1), b'\xfe')
+    nose.tools.assert_equal(cache.read_register('pc'), 0x10004)
+
+    # anything else goes to the target
+    nose.tools.assert_equal(cache.runs, 1)
+
+
+def test_registers():
+    target = _target()
+    cache = ConcreteTargetCache(target)
+
+    values = cache.read_registers([ 'pc', 'rsp', 'rax' ])
+    nose.tools.assert_equal(values, { 'pc': 0x10000, 'rsp': 0x20800, 'rax': 0 })
+    nose.tools.assert_equal(target.register_requests, [ [ 'pc', 'rsp', 'rax' ] ])
+    nose.tools.assert_equal(cache.read_register('rsp'), 0x20800)
+    nose.tools.assert_equal(len(target.register_requests), 1)
+
+    # a batch with a register that cannot be read falls back to single reads
+    values = cache.read_registers([ 'rax', 'fs', 'gs' ])
+    nose.tools.assert_equal(values, { 'rax': 0 })
+    nose.tools.assert_equal(target.register_requests[1:], [ [ 'fs', 'gs' ], [ 'fs' ], [ 'gs' ] ])
+    nose.tools.assert_raises(SimConcreteRegisterError, cache.read_register, 'fs')
+    nose.tools.assert_equal(len(target.register_requests), 4)
+
+
+if __name__ == '__main__':
+    test_read_ahead()
+    test_prefetch()
+    test_epochs()
+    test_registers()
@@ -73,6 +73,37 @@ def test_ddg_0():
     binary_path = os.path.join(test_location, 'x86_64', 'datadep_test')
     perform_one(binary_path)
 
+def test_live_definitions():
+    from angr.analyses.ddg import LiveDefinitions
+    from angr.analyses.code_location import CodeLocation
+    from angr.sim_variable import SimRegisterVariable, SimMemoryVariable
+
+    loc0, loc1, loc2 = CodeLocation(0x400000, 1), CodeLocation(0x400000, 2), CodeLocation(0x400010, 0)
+
+    ld = LiveDefinitions()
+    nose.tools.assert_true(ld.add_def(SimMemoryVariable(0x1000, 8), loc0))
+    nose.tools.assert_false(ld.add_def(SimMemoryVariable(0x1002, 4), loc0))
+    nose.tools.assert_true(ld.add_def(SimRegisterVariable(16, 8), loc0))
+
+    branch = ld.copy()
+    branch.kill_def(SimMemoryVariable(0x1004, 4), loc1)
+    branch.kill_def(SimRegisterVariable(16, 4), loc2)
+
+    # partial overwrites only affect the overwritten bytes, and only in the branch
+    nose.tools.assert_equal(branch.lookup_defs(SimMemoryVariable(0x1000, 4)), {loc0})
+    nose.tools.assert_equal(branch.lookup_defs(SimMemoryVariable(0x1004, 4)), {loc1})
+    nose.tools.assert_equal(branch.lookup_defs(SimMemoryVariable(0x1000, 8)), {loc0, loc1})
+    nose.tools.assert_equal(branch.lookup_defs(SimRegisterVariable(16, 8)), {loc0, loc2})
+    nose.tools.assert_equal(ld.lookup_defs(SimMemoryVariable(0x1000, 8)), {loc0})
+    nose.tools.assert_equal(ld.lookup_defs(SimRegisterVariable(20, 4)), {loc0})
+    nose.tools.assert_not_in(SimMemoryVariable(0x1004, 4), ld)
+    nose.tools.assert_in(SimMemoryVariable(0x1004, 4), branch)
+
+    nose.tools.assert_true(ld.add_def(SimMemoryVariable(0xffc, 8), loc1))
+    nose.tools.assert_equal(ld.lookup_defs(SimMemoryVariable(0xffc, 4)), {loc1})
+    nose.tools.assert_equal(ld.lookup_defs(SimMemoryVariable(0x1000, 4)), {loc0, loc1})
+    nose.tools.assert_equal(branch.lookup_defs(SimMemoryVariable(0xffc, 4)), set())
+
 def run_all():
     functions = globals()
     all_functions = dict(filter((lambda kv: kv[0].startswith('test_') and hasattr(kv[1], '__call__')), functions.items()))
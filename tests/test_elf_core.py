@@ -0,0 +1,116 @@
+import os
+import struct
+import tempfile
+
+import nose
+
+import angr
+from angr.storage.elf_core import SimElfCore
+from angr.storage.paged_memory import SimMappedSegments
+
+location = str(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../binaries/tests'))
+
+_REGS_AMD64 = ('r15', 'r14', 'r13', 'r12', 'rbp', 'rbx', 'r11', 'r10', 'r9', 'r8', 'rax', 'rcx', 'rdx', 'rsi', 'rdi',
+               'orig_rax', 'rip', 'cs', 'eflags', 'rsp', 'ss', 'fs_base', 'gs_base', 'ds', 'es', 'fs', 'gs')
+
+
+def _prstatus(pid, regs):
+    desc = bytearray(112 + 27 * 8 + 8)
+    struct.pack_into('<i', desc, 32, pid)
+    struct.pack_into('<27Q', desc, 112, *[ regs.get(name, 0) for name in _REGS_AMD64 ])
+    return struct.pack('<III', 5, len(desc), 1) + b'CORE\x00\x00\x00\x00' + bytes(desc)
+
+
+def _write_core(path, loads, threads):
+    """
+    Write a minimal x86_64 ELF core file with the given PT_LOAD segments, as (vaddr, data, memsz, flags) tuples, and
+    NT_PRSTATUS notes, as (pid, registers) tuples.
+    """
+    notes = b''.join(_prstatus(pid, regs) for pid, regs in threads)
+    phnum = len(loads) + 1
+    offset = 64 + phnum * 56
+
+    phdrs = struct.pack('<IIQQQQQQ', 4, 0, offset, 0, 0, len(notes), len(notes), 4)
+    body = notes
+    offset += len(notes)
+    for vaddr, data, memsz, flags in loads:
+        phdrs += struct.pack('<IIQQQQQQ', 1, flags, offset, vaddr, 0, len(data), memsz, 0x1000)
+        body += data
+        offset += len(data)
+
+    ehdr = b'\x7fELF\x02\x01\x01' + b'\x00' * 9 + struct.pack('<HHIQQQIHHHHHH', 4, 62, 1, 0, 64, 0, 0, 64, 56, phnum,
+                                                             0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(ehdr + phdrs + body)
+
+
+def test_elf_core():
+    p = angr.Project(os.path.join(location, 'x86_64', 'fauxware'), auto_load_libs=False)
+    code = p.factory.blank_state().memory.load(p.entry, 16)
+
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        stack = b'\x00' * 0xff8 + struct.pack('<Q', 0x4141414142424242)
+        heap = b'\x11' * 0x2000 + b'\x22' * 0x1000
+        _write_core(path, [
+            (0x7ffffffde000, stack, 0x1000, 6),
+            (0x1000000, heap, 0x4000, 6),
+            # the code segment was not dumped
+            (p.entry & ~0xfff, b'', 0x1000, 5),
+        ], [
+            (1234, { 'rip': p.entry, 'rsp': 0x7ffffffdeff8, 'rax': 0x1337, 'fs_base': 0x7ffff7fd0700 }),
+            (1235, { 'rip': p.entry + 4, 'rsp': 0x7ffffffdeff8 }),
+        ])
+
+        core = SimElfCore(path)
+        nose.tools.assert_equal([ pid for pid, _ in core.threads ], [ 1234, 1235 ])
+        nose.tools.assert_equal(len(core.memory_segments()), 2)
+
+        state = p.factory.blank_state()
+        state.memory.store(0x1001000, b'gone')
+        state.memory.store(0x2000000, b'kept')
+        state.gdb.set_core(path)
+
+        nose.tools.assert_equal(state.solver.eval(state.regs.rip), p.entry)
+        nose.tools.assert_equal(state.solver.eval(state.regs.rax), 0x1337)
+        nose.tools.assert_equal(state.solver.eval(state.regs.fs), 0x7ffff7fd0700)
+
+        # nothing is read from the core file before it is touched
+        mem = state.memory.mem
+        nose.tools.assert_not_in(0x1001, mem._initialized)
+
+        top = state.memory.load(state.regs.rsp, 8, endness='Iend_LE')
+        nose.tools.assert_equal(state.solver.eval(top), 0x4141414142424242)
+        nose.tools.assert_equal(state.solver.eval(state.memory.load(0x1001ffe, 4), cast_to=bytes), b'\x11\x11\x22\x22')
+        nose.tools.assert_equal(state.solver.eval(state.memory.load(0x2000000, 4), cast_to=bytes), b'kept')
+        nose.tools.assert_true(state.solver.is_true(state.memory.load(p.entry, 16) == code))
+        nose.tools.assert_not_in(0x1000, mem._initialized)
+
+        # copies share the mapping
+        copy = state.copy()
+        nose.tools.assert_equal(copy.solver.eval(copy.memory.load(0x1000000, 1), cast_to=bytes), b'\x11')
+
+        state2 = p.factory.blank_state()
+        state2.gdb.set_core(path, thread=1)
+        nose.tools.assert_equal(state2.solver.eval(state2.regs.rip), p.entry + 4)
+        nose.tools.assert_raises(angr.SimStateError, state2.gdb.set_core, path, thread=2)
+    finally:
+        os.remove(path)
+
+
+def test_mapped_segments():
+    data = bytes(range(256)) * 4
+    segments = SimMappedSegments(None, [ (0x1000, data, 0, 0x100, None), (0x1080, data, 0x200, 0x100, 1) ])
+    nose.tools.assert_equal(segments.segments, [ (0x1000, 0x100, None), (0x1080, 0x100, 1) ])
+
+    # the segment added last wins where they overlap
+    chunks = segments.segments_in(0x1070, 0x1090)
+    nose.tools.assert_equal(chunks, [ (0x1070, data[0x70:0x90], None), (0x1080, data[0x200:0x210], 1) ])
+    nose.tools.assert_equal(segments.segments_in(0x1180, 0x2000), [ ])
+    nose.tools.assert_equal(len(segments.keys()), 0x180)
+
+
+if __name__ == '__main__':
+    test_elf_core()
+    test_mapped_segments()
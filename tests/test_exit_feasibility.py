@@ -0,0 +1,38 @@
+import os
+
+import nose
+
+import angr
+from angr import sim_options as o
+
+location = str(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../binaries/tests'))
+
+
+def _explore(p, add_options=None):
+    state = p.factory.entry_state(add_options=add_options)
+    simgr = p.factory.simulation_manager(state, save_unsat=True)
+    simgr.run()
+    return simgr
+
+
+def test_batch_exit_feasibility():
+    p = angr.Project(os.path.join(location, 'x86_64', 'fauxware'), auto_load_libs=False)
+
+    plain = _explore(p)
+    batched = _explore(p, add_options={ o.BATCH_EXIT_FEASIBILITY })
+
+    # checking the guards against a shared solver must not change which successors are feasible
+    nose.tools.assert_equal(len(batched.deadended), len(plain.deadended))
+    nose.tools.assert_equal(len(batched.unsat), len(plain.unsat))
+
+    # successors of a symbolic branch carry the result of the check
+    state = p.factory.entry_state(add_options={ o.BATCH_EXIT_FEASIBILITY })
+    simgr = p.factory.simulation_manager(state)
+    simgr.run(until=lambda sm: len(sm.active) > 1)
+    for s in simgr.active:
+        nose.tools.assert_true(s.history._satisfiable)
+        nose.tools.assert_true(s.history.reachable())
+
+
+if __name__ == '__main__':
+    test_batch_exit_feasibility()
@@ -1,3 +1,8 @@
+import os
+import pickle
+import shutil
+import tempfile
+
 import angr
 
 def test_files():
@@ -11,5 +16,43 @@ def test_files():
     s.posix.get_fd(1).write_data(b"A"*0x1000, 0x800)
     assert s.posix.dumps(1) == b"A"*0x800
 
+def test_host_files():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        content = bytes(i & 0xff for i in range(0x2345))
+        with open(os.path.join(tmpdir, 'data'), 'wb') as fp:
+            fp.write(content)
+        open(os.path.join(tmpdir, 'empty'), 'wb').close()
+
+        s = angr.SimState(arch='AMD64')
+        s.fs.mount(b'/host', angr.state_plugins.SimHostFilesystem(tmpdir))
+
+        f = s.fs.get(b'/host/data')
+        assert f.concrete
+        assert s.solver.eval(f.size) == len(content)
+        # nothing is paged in until the file is accessed
+        assert len(f.mem._pages) == 0
+
+        data, _, _ = f.read(0x1ff0, 0x20)
+        assert s.solver.eval(data, cast_to=bytes) == content[0x1ff0:0x2010]
+        assert len(f.mem._pages) == 2
+        assert f.concretize() == content
+
+        # writes only affect the state they happen in
+        s2 = s.copy()
+        f2 = s2.fs.get(b'/host/data')
+        f2.write(0x10, b'HELLO')
+        assert s2.solver.eval(f2.load(0x10, 5), cast_to=bytes) == b'HELLO'
+        assert s.solver.eval(f.load(0x10, 5), cast_to=bytes) == content[0x10:0x15]
+
+        s3 = pickle.loads(pickle.dumps(s, -1))
+        assert s3.fs.get(b'/host/data').concretize() == content
+
+        assert s.fs.get(b'/host/empty').concretize() == b''
+        assert s.fs.get(b'/host/missing') is None
+    finally:
+        shutil.rmtree(tmpdir)
+
 if __name__ == '__main__':
     test_files()
+    test_host_files()
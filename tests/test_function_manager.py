@@ -1,6 +1,9 @@
 import nose
 import angr
 from archinfo import ArchAMD64
+from archinfo.arch_soot import SootAddressDescriptor, SootMethodDescriptor
+from angr.codenode import SootBlockNode
+from angr.knowledge_plugins.functions.soot_function import SootFunction
 
 import logging
 l = logging.getLogger("angr.tests")
@@ -77,8 +80,54 @@ def test_call_to():
     nose.tools.assert_in(0x400000, project.kb.functions.keys())
     nose.tools.assert_in(0x400420, project.kb.functions.keys())
 
+def test_cached_properties():
+    project = angr.Project(test_location + "/x86_64/fauxware", auto_load_libs=False)
+    cfg = project.analyses.CFGFast()
+    main = cfg.kb.functions.function(name='main')
+
+    code_constants = main.code_constants
+    operations = main.operations
+    string_references = main.string_references(vex_only=True)
+    graph = main.graph
+    nose.tools.assert_in('code_constants', main._cache)
+    nose.tools.assert_in('operations', main._cache)
+
+    # cached results are returned as copies
+    code_constants.append(None)
+    nose.tools.assert_not_in(None, main.code_constants)
+    nose.tools.assert_equal(main.operations, operations)
+    nose.tools.assert_equal(main.string_references(vex_only=True), string_references)
+    nose.tools.assert_is(main.graph, graph)
+
+    # modifying the function drops the cache
+    version = cfg.kb.functions.graph_version
+    main._register_nodes(True, main.startpoint)
+    nose.tools.assert_equal(len(main._cache), 0)
+    nose.tools.assert_is_not(main.graph, graph)
+    nose.tools.assert_greater(cfg.kb.functions.graph_version, version)
+
+    # string references also depend on the graphs of other functions
+    main.string_references(vex_only=True)
+    authenticate = cfg.kb.functions.function(name='authenticate')
+    authenticate._register_nodes(True, authenticate.startpoint)
+    nose.tools.assert_not_equal(main._cache[('string_references', 2, True)][0], cfg.kb.functions.graph_version)
+    nose.tools.assert_equal(main.string_references(vex_only=True), string_references)
+
+def test_soot_function_transition():
+    project = angr.Project(test_location + "/x86_64/fauxware")
+    method = SootMethodDescriptor('Class1', 'main', ())
+    func = SootFunction(project.kb.functions, method)
+    project.kb.functions._function_map[method] = func
+
+    src = SootBlockNode(SootAddressDescriptor(method, 0, 0), 0, None)
+    dst = SootBlockNode(SootAddressDescriptor(method, 1, 0), 0, None)
+    project.kb.functions._add_transition_to(method, src, dst)
+    nose.tools.assert_equal(list(func.transition_graph.edges()), [ (src, dst) ])
+
 if __name__ == "__main__":
     logging.getLogger('angr.analyses.cfg').setLevel(logging.DEBUG)
 
     test_call_to()
     test_amd64()
+    test_cached_properties()
+    test_soot_function_transition()
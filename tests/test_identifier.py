@@ -19,6 +19,36 @@ def test_comparison_identification():
     for addr, symbol in true_symbols.items():
         nose.tools.assert_equal(true_symbols[addr], seen[addr])
 
+def test_parallel_identification():
+    true_symbols = {0x804a3d0: 'strncmp', 0x804a0f0: 'strcmp', 0x8048e60: 'memcmp', 0x8049f40: 'strcasecmp'}
+
+    p = angr.Project(os.path.join(bin_location, "tests", "i386", "identifiable"))
+    idfer = p.analyses.Identifier(require_predecessors=False, only_find=set(true_symbols.values()), workers=2)
+
+    seen = dict(idfer.run())
+    for addr, symbol in true_symbols.items():
+        nose.tools.assert_equal(true_symbols[addr], seen[addr])
+
+def test_parallel_matches_serial():
+    # matches such as atoi and int2str record what they found out about the function on the match object
+    p = angr.Project(os.path.join(bin_location, "tests", "i386", "identifiable"))
+    cfg = p.analyses.CFGFast(resolve_indirect_jumps=True)
+
+    serial = p.analyses.Identifier(cfg=cfg, require_predecessors=False)
+    serial_names = dict(serial.run())
+    parallel = p.analyses.Identifier(cfg=cfg, require_predecessors=False, workers=2)
+    parallel_names = dict(parallel.run())
+
+    nose.tools.assert_equal(parallel_names, serial_names)
+    nose.tools.assert_true(any(name.startswith(('atoi', 'int2str', 'uint2str', 'based_atoi'))
+                               for name in serial_names.values()))
+
+    serial_matches = { f.addr: (name, type(match), { k: v for k, v in vars(match).items() if k != '_runner' })
+                       for f, (name, match) in serial.matches.items() }
+    parallel_matches = { f.addr: (name, type(match), { k: v for k, v in vars(match).items() if k != '_runner' })
+                         for f, (name, match) in parallel.matches.items() }
+    nose.tools.assert_equal(parallel_matches, serial_matches)
+
 def run_all():
     functions = globals()
     all_functions = dict(filter((lambda kv: kv[0].startswith('test_')), functions.items()))
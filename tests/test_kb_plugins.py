@@ -3,6 +3,7 @@ import angr
 import networkx
 
 import os
+import tempfile
 location = str(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../binaries/tests'))
 
 
@@ -20,5 +21,62 @@ def test_kb_plugins():
     nose.tools.assert_is_instance(p.kb.unresolved_indirect_jumps, set)
 
 
+def test_kb_store():
+    p = angr.Project(location + "/x86_64/fauxware", auto_load_libs=False)
+    cfg = p.analyses.CFGFast()
+    p.kb.comments[p.entry] = "entry point"
+
+    fd, path = tempfile.mkstemp(suffix='.sqlite')
+    os.close(fd)
+    try:
+        with angr.knowledge_plugins.KnowledgeBaseStore(path) as store:
+            store.save(p.kb)
+            kb = store.load(p)
+            functions = kb.functions
+
+            # nothing is loaded until it is used
+            nose.tools.assert_equal(len(list(functions._function_map.loaded_items())), 0)
+            nose.tools.assert_equal(len(functions), len(cfg.kb.functions))
+            nose.tools.assert_equal(list(functions), list(cfg.kb.functions))
+            nose.tools.assert_equal(functions.floor_func(0x4007ff).addr, cfg.kb.functions.floor_func(0x4007ff).addr)
+            nose.tools.assert_equal(functions.ceiling_func(0x4007ff).addr,
+                                    cfg.kb.functions.ceiling_func(0x4007ff).addr)
+            nose.tools.assert_equal(len(list(functions._function_map.loaded_items())), 2)
+
+            main = functions['main']
+            nose.tools.assert_equal(main.addr, cfg.kb.functions['main'].addr)
+            nose.tools.assert_equal(set(b.addr for b in main.blocks), set(b.addr for b in cfg.kb.functions['main'].blocks))
+            callees = [ n for n in main.transition_graph if isinstance(n, angr.knowledge_plugins.Function) ]
+            nose.tools.assert_equal(sorted(f.addr for f in callees),
+                                    sorted(n.addr for n in cfg.kb.functions['main'].transition_graph
+                                           if isinstance(n, angr.knowledge_plugins.Function)))
+            # functions referenced by main are loaded on access, and are the same objects as in the function manager
+            nose.tools.assert_is(functions[callees[0].addr], callees[0])
+            nose.tools.assert_is_instance(callees[0].name, str)
+            nose.tools.assert_equal(kb.comments[p.entry], "entry point")
+            nose.tools.assert_equal(kb.labels[main.addr], 'main')
+
+            # modifications are written back incrementally
+            main.name = 'renamed_main'
+            del functions[p.entry]
+            store.commit(kb, release=True)
+            nose.tools.assert_equal(len(list(functions._function_map.loaded_items())), 0)
+
+            kb = store.load(p)
+            nose.tools.assert_equal(kb.functions['renamed_main'].addr, main.addr)
+            nose.tools.assert_not_in(p.entry, kb.functions)
+            nose.tools.assert_equal(len(kb.functions), len(cfg.kb.functions) - 1)
+
+            # placeholders of removed functions have no attributes
+            ref = kb.functions._function_map.function_ref(main.addr)
+            del kb.functions[main.addr]
+            nose.tools.assert_false(hasattr(ref, 'name'))
+            kb.functions.function(p.entry, create=True)
+            nose.tools.assert_equal(len(kb.functions), len(cfg.kb.functions) - 1)
+    finally:
+        os.remove(path)
+
+
 if __name__ == '__main__':
     test_kb_plugins()
+    test_kb_store()
@@ -0,0 +1,39 @@
+import nose
+
+from angr.keyed_region import KeyedRegion
+from angr.sim_variable import SimStackVariable
+
+
+def test_copy_on_write():
+
+    v0 = SimStackVariable(-8, 8, ident='v0')
+    v1 = SimStackVariable(-16, 8, ident='v1')
+    v2 = SimStackVariable(-8, 8, ident='v2')
+
+    kr = KeyedRegion()
+    kr.add_variable(-8, v0)
+    kr.add_variable(-16, v1)
+
+    kr_copy = kr.copy()
+    # the copy shares everything with the original until one of them is modified
+    nose.tools.assert_is(kr_copy._storage, kr._storage)
+    nose.tools.assert_equal(kr_copy, kr)
+
+    kr_copy.set_variable(-8, v2)
+    nose.tools.assert_equal(kr.get_variables_by_offset(-8), {v0})
+    nose.tools.assert_equal(kr_copy.get_variables_by_offset(-8), {v2})
+    # region objects that were not modified are still shared
+    nose.tools.assert_is(kr_copy._storage[-16], kr._storage[-16])
+
+    kr.merge(kr_copy)
+    nose.tools.assert_equal(kr.get_variables_by_offset(-8), {v0, v2})
+    nose.tools.assert_equal(kr.get_variables_by_offset(-16), {v1})
+    nose.tools.assert_equal(kr_copy.get_variables_by_offset(-8), {v2})
+
+    kr_copy.replace({v2: v0})
+    nose.tools.assert_equal(kr_copy.get_variables_by_offset(-8), {v0})
+    nose.tools.assert_equal(kr.get_variables_by_offset(-8), {v0, v2})
+
+
+if __name__ == "__main__":
+    test_copy_on_write()
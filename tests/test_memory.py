@@ -7,6 +7,7 @@ import nose
 from angr.storage.paged_memory import SimPagedMemory
 from angr import SimState, SIM_PROCEDURES
 from angr import options as o
+from angr import concretization_strategies
 from angr.state_plugins import SimSystemPosix
 from angr.storage.file import SimFile
 
@@ -646,7 +647,57 @@ def test_crosspage_read():
     assert bytes.fromhex("77665544") in state.solver.eval(r, cast_to=bytes)
     #assert s.solver.eval(r, 2) == ( 0xffeeddccbbaa998877665544, )
 
+def test_load_concrete():
+    s = SimState(arch='AMD64')
+    s.memory.store(0x4000, b'ABCDEFGH')
+    s.memory.store(0x4008, s.solver.BVS('sym', 32))
+    s.memory.store(0x4ffe, b'\x01\x02\x03\x04')
+
+    assert s.memory.load_concrete(0x4000, 8) == b'ABCDEFGH'
+    assert s.memory.load_concrete(0x4002, 3) == b'CDE'
+    assert s.memory.load_concrete(s.solver.BVV(0x4001, 64), 2) == b'BC'
+    assert s.memory.load_concrete(0x4ffe, 4) == b'\x01\x02\x03\x04'
+
+    # symbolic and missing bytes
+    assert s.memory.load_concrete(0x4004, 8) is None
+    assert s.memory.load_concrete(0x4004, 8, allow_partial=True) == b'EFGH'
+    assert s.memory.load_concrete(0x9000, 4) is None
+    assert s.memory.load_concrete(s.solver.BVS('addr', 64), 4) is None
+
+    # overwriting part of an object
+    s.memory.store(0x4003, b'x')
+    assert s.memory.load_concrete(0x4000, 8) == b'ABCxEFGH'
+
+def test_memoized_concretization():
+    s = SimState(arch='AMD64', add_options={o.MEMOIZE_ADDRESS_CONCRETIZATION})
+    x = s.solver.BVS('x', 64)
+    s.add_constraints(x >= 0x1000, x < 0x1010)
+    s.add_constraints(s.solver.BVS('unrelated', 64) == 5)
+
+    addrs = s.memory.concretize_read_addr(x)
+    assert sorted(addrs) == list(range(0x1000, 0x1010))
+    assert len(s.memory._concretization_memo) == 1
+
+    # copies share the memo, and constraints on unrelated variables do not affect the lookup
+    s2 = s.copy()
+    s2.add_constraints(s2.solver.BVS('other', 64) == 6)
+    assert sorted(s2.memory.concretize_read_addr(x)) == sorted(addrs)
+    assert len(s2.memory._concretization_memo) == 1
+
+    # but related constraints do
+    s2.add_constraints(x < 0x1004)
+    assert sorted(s2.memory.concretize_read_addr(x)) == list(range(0x1000, 0x1004))
+    assert len(s.memory._concretization_memo) == 2
+
+    # the interval bound is computed without the solver
+    y = s.solver.BVS('y', 64)
+    bounds = concretization_strategies.SimConcretizationStrategyRange(16)._vsa_range(0x1000 + (y & 0xf))
+    assert bounds == (0x1000, 0x100f)
+    assert concretization_strategies.SimConcretizationStrategyRange(16)._vsa_range(y) is None
+
 if __name__ == '__main__':
+    test_memoized_concretization()
+    test_load_concrete()
     test_crosspage_read()
     test_fast_memory()
     test_load_bytes()
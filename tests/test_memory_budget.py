@@ -0,0 +1,79 @@
+import os
+
+import nose
+
+import angr
+from angr.state_footprint import estimate_footprint
+
+location = str(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../binaries/tests'))
+
+
+def test_state_footprint():
+    p = angr.Project(os.path.join(location, 'x86_64', 'fauxware'), auto_load_libs=False)
+    s1 = p.factory.entry_state()
+    s1.memory.store(0x600000, s1.solver.BVV(0x41414141, 32))
+    s2 = s1.copy()
+
+    # right after branching, every page is shared copy-on-write
+    fp = estimate_footprint([s1, s2])
+    nose.tools.assert_equal(fp.states[0].owned_pages, 0)
+    nose.tools.assert_equal(fp.states[1].owned_pages, 0)
+    nose.tools.assert_equal(fp.states[0].memory, 0)
+    nose.tools.assert_greater(fp.shared, 0)
+    nose.tools.assert_equal(fp.total, fp.shared + fp.states[0].exclusive + fp.states[1].exclusive)
+
+    # writing to a page gives the writer a page of its own
+    s2.memory.store(0x600000, s2.solver.BVV(0x42424242, 32))
+    fp2 = estimate_footprint([s1, s2])
+    nose.tools.assert_equal(fp2.states[0].owned_pages, 1)
+    nose.tools.assert_equal(fp2.states[1].owned_pages, 1)
+    nose.tools.assert_greater(fp2.total, fp.total)
+
+    # a state alone owns everything it references
+    fp3 = estimate_footprint([s1])
+    nose.tools.assert_equal(fp3.shared, 0)
+    nose.tools.assert_equal(fp3.states[0].owned_pages, fp3.states[0].pages)
+
+    # new constraints belong to the state that made them
+    s3 = s1.copy()
+    s3.add_constraints(s3.solver.BVS('x', 32) == 1)
+    fp4 = estimate_footprint([s1, s3])
+    nose.tools.assert_equal(fp4.states[0].constraints, 0)
+    nose.tools.assert_equal(fp4.states[1].constraints, 1)
+
+    # states that forked from each other share their ancestry
+    simgr = p.factory.simulation_manager(s1)
+    simgr.run(until=lambda sm: len(sm.active) > 1)
+    fp5 = estimate_footprint(simgr.active)
+    for state_fp in fp5.states:
+        nose.tools.assert_equal(state_fp.history_nodes, 1)
+    nose.tools.assert_greater(fp5.shared, 0)
+
+
+def test_memory_budget():
+    p = angr.Project(os.path.join(location, 'x86_64', 'fauxware'), auto_load_libs=False)
+    deadended = len(p.factory.simulation_manager().run().deadended)
+
+    # with no budget at all, everything that can be spilled is, and states are reloaded to keep the run going
+    simgr = p.factory.simulation_manager()
+    budget = simgr.use_technique(angr.exploration_techniques.MemoryBudget(0, policy=('spill',),
+                                                                          vault=angr.vaults.VaultDict()))
+    simgr.run()
+    nose.tools.assert_greater(budget.spilled, 0)
+    nose.tools.assert_equal(budget.reloaded, budget.spilled)
+    nose.tools.assert_equal(len(simgr.deadended), deadended)
+
+    # dropping states ends the run early
+    simgr = p.factory.simulation_manager()
+    budget = simgr.use_technique(angr.exploration_techniques.MemoryBudget(0, policy=('downsize', 'drop')))
+    simgr.run()
+    nose.tools.assert_greater(budget.dropped, 0)
+    nose.tools.assert_less(len(simgr.deadended), deadended)
+
+    nose.tools.assert_raises(angr.AngrExplorationTechniqueError, angr.exploration_techniques.MemoryBudget, 100,
+                             policy=('compress',))
+
+
+if __name__ == '__main__':
+    test_state_footprint()
+    test_memory_budget()
@@ -0,0 +1,53 @@
+import os
+import json
+import tempfile
+
+import nose
+
+import angr
+from angr.misc import profiling
+from angr.state_plugins.solver import SimSolver
+
+location = str(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../binaries/tests'))
+
+
+def test_profiler():
+    proj = angr.Project(os.path.join(location, 'x86_64', 'fauxware'), auto_load_libs=False)
+    simgr = proj.factory.simulation_manager()
+    unprofiled_eval = SimSolver.__dict__['_eval']
+
+    profiler = simgr.use_technique(angr.exploration_techniques.Profiler(top_blocks=5))
+    simgr.run(until=lambda sm: len(sm.active) > 1)
+
+    # profiling only happens while the technique steps
+    nose.tools.assert_is_none(profiling.counters)
+    nose.tools.assert_is(SimSolver.__dict__['_eval'], unprofiled_eval)
+
+    report = profiler.report()
+    nose.tools.assert_greater(report['steps'], 0)
+    nose.tools.assert_greater_equal(report['states_stepped'], report['steps'])
+    nose.tools.assert_greater(report['forks'], 0)
+    nose.tools.assert_greater(report['states_per_second'], 0)
+    nose.tools.assert_in('SimEngineVEX', report['engines'])
+    nose.tools.assert_in('SimEngineProcedure', report['engines'])
+    nose.tools.assert_in('eval', report['solver'])
+    nose.tools.assert_equal(len(report['blocks']), 5)
+    nose.tools.assert_equal(report['blocks'], sorted(report['blocks'], key=lambda b: b['time'], reverse=True))
+
+    # nothing forked before the last step, so every block that was executed is in the history of the active states
+    stepped = len(simgr.active[0].history.bbl_addrs)
+    nose.tools.assert_equal(sum(e['count'] for e in report['engines'].values()), stepped)
+    nose.tools.assert_equal(sum(c for c, _ in profiler.counters.blocks.values()), stepped)
+
+    with tempfile.NamedTemporaryFile(suffix='.json') as f:
+        profiler.to_json(f.name)
+        with open(f.name) as g:
+            nose.tools.assert_equal(json.load(g)['steps'], report['steps'])
+
+    profiler.reset()
+    nose.tools.assert_equal(profiler.report()['steps'], 0)
+    nose.tools.assert_equal(profiler.report()['engines'], { })
+
+
+if __name__ == '__main__':
+    test_profiler()
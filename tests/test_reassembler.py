@@ -5,8 +5,11 @@ import os
 import tempfile
 import subprocess
 import shutil
+import io
+import random
 
 import angr
+from angr.analyses.reassembler import RegionIndex
 
 
 test_location = str(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'binaries', 'tests'))
@@ -110,7 +113,73 @@ def test_ex_gpp():
         shutil.rmtree(tempdir)
 
 
+def _sorted_assembly(r, comments, symbolized):
+    # the sort-and-join write_assembly() replaces
+    addr_and_assembly = [ ]
+    for proc in r.procedures:
+        addr_and_assembly.extend(proc.assembly(comments=comments, symbolized=symbolized))
+    addr_and_assembly = sorted(addr_and_assembly, key=lambda x: x[0] if x[0] is not None else -1)
+    all_assembly_lines = [ line for _, line in addr_and_assembly ]
+
+    last_section = None
+    if r._cgc_attachments_removed:
+        all_data = r.data + r.extra_rodata + r.extra_data
+    else:
+        all_data = r.extra_data + r.data + r.extra_rodata
+    for data in all_data:
+        if last_section is None or data.section_name != last_section:
+            last_section = data.section_name
+            all_assembly_lines.append("\t.section {section}\n\t.align {alignment}".format(
+                section=(last_section if last_section != '.init_array' else '.data'),
+                alignment=r.section_alignment(last_section)
+            ))
+        all_assembly_lines.append(data.assembly(comments=comments, symbolized=symbolized))
+
+    return "\n".join(all_assembly_lines)
+
+
+def test_write_assembly():
+
+    p = angr.Project(os.path.join(test_location, "x86_64", "ln_gcc_-O2"), auto_load_libs=False)
+    r = p.analyses.Reassembler(syntax="at&t")
+    r.symbolize()
+    r.remove_unnecessary_stuff()
+
+    output = io.StringIO()
+    r.write_assembly(output, comments=True, symbolized=True)
+    # labels have all been created by now, so the old algorithm renders the same labels
+    assert output.getvalue() == _sorted_assembly(r, comments=True, symbolized=True)
+
+
+def test_region_index():
+
+    def limbos_contain(regions, addr, tolerance_before, tolerance_after):
+        # the linear scan RegionIndex replaces
+        closest_region, least_limbo = (False, None), None
+        for start, end in regions:
+            if start - tolerance_before <= addr < start and (least_limbo is None or start - addr < least_limbo):
+                closest_region, least_limbo = (True, start), start - addr
+            if end <= addr < end + tolerance_after and (least_limbo is None or addr - end < least_limbo):
+                closest_region, least_limbo = (True, end), addr - end
+        return closest_region
+
+    rand = random.Random(0)
+    for _ in range(200):
+        regions = [ ]
+        for _ in range(rand.randint(0, 6)):
+            start = rand.randint(0, 400)
+            regions.append((start, start + rand.randint(1, 100)))
+        index = RegionIndex(regions)
+
+        for addr in range(-80, 600, 7):
+            assert index.contains(addr) == any(start <= addr < end for start, end in regions)
+            assert index.limbos_contain(addr, 64, 64) == limbos_contain(regions, addr, 64, 64)
+            assert index.limbos_contain(addr, 8, 32) == limbos_contain(regions, addr, 8, 32)
+
+
 if __name__ == "__main__":
     test_ln_gcc_O2()
     test_chmod_gcc_O1()
     test_ex_gpp()
+    test_write_assembly()
+    test_region_index()
@@ -86,6 +86,49 @@ def test_analyses():
     assert cfg.kb is not None
     assert len(p.kb.functions) > 0
 
+def _worker_block_size(project, addr):
+    if project.is_hooked(addr):
+        return None
+    return project.factory.block(addr).size
+
+def test_project_template():
+    p = angr.Project(os.path.join(internaltest_location, 'x86_64/fauxware'), load_options={'auto_load_libs': False})
+    p.analyses.CFGFast()
+
+    fd, tpath = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        p.save_template(tpath)
+        nose.tools.assert_greater(len(p.kb.functions), 0)
+
+        t = angr.Project.load_template(tpath)
+        nose.tools.assert_equal(len(t.kb.functions), 0)
+        nose.tools.assert_equal(t.entry, p.entry)
+        nose.tools.assert_equal(set(t._sim_procedures), set(p._sim_procedures))
+        nose.tools.assert_equal(t.factory.block(p.entry).bytes, p.factory.block(p.entry).bytes)
+    finally:
+        os.remove(tpath)
+
+def test_project_worker_pool():
+    p = angr.Project(os.path.join(internaltest_location, 'x86_64/fauxware'), load_options={'auto_load_libs': False})
+    cfg = p.analyses.CFGFast()
+    nose.tools.assert_greater(p.warm_up(), 0)
+
+    addrs = sorted(cfg.kb.functions)
+    expected = [ _worker_block_size(p, addr) for addr in addrs ]
+    with p.worker_pool(workers=2) as pool:
+        nose.tools.assert_equal(list(pool.map(_worker_block_size, addrs)), expected)
+
+def _worker_scaled(shared, item):
+    return shared['scale'](item)
+
+def test_fork_pool():
+    # the shared object is inherited by the workers, so it does not have to be picklable
+    shared = { 'scale': lambda x: x * 3 }
+    with angr.misc.fork_pool.ForkPool(shared, workers=2) as pool:
+        nose.tools.assert_equal(list(pool.map(_worker_scaled, range(20), chunksize=4)), [ x * 3 for x in range(20) ])
+    nose.tools.assert_false(pool.parallel)
+
 def test_serialization():
     test_analyses()
 
@@ -103,3 +146,6 @@ def test_serialization():
 
 if __name__ == '__main__':
     test_serialization()
+    test_project_template()
+    test_project_worker_pool()
+    test_fork_pool()
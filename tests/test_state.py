@@ -214,6 +214,33 @@ def test_state_pickle():
     s = pickle.loads(sp)
     nose.tools.assert_equal(s.solver.eval(s.memory.load(100, 10), cast_to=bytes), b"AAABAABABC")
 
+def test_state_plugin_access():
+    s = SimState(arch="AMD64")
+
+    # default plugins are created lazily, and become plain attributes once they are active
+    nose.tools.assert_false(s.has_plugin('callstack'))
+    callstack = s.callstack
+    nose.tools.assert_true(s.has_plugin('callstack'))
+    nose.tools.assert_is(s.__dict__['callstack'], callstack)
+    nose.tools.assert_is(s.get_plugin('callstack'), callstack)
+
+    # registering a plugin replaces the active one
+    new_callstack = callstack.copy({})
+    s.register_plugin('callstack', new_callstack)
+    nose.tools.assert_is(s.callstack, new_callstack)
+
+    # releasing it brings back lazy initialization from the preset
+    s.release_plugin('callstack')
+    nose.tools.assert_false(s.has_plugin('callstack'))
+    nose.tools.assert_is_not(s.callstack, new_callstack)
+
+    # special method lookups never create plugins
+    nose.tools.assert_false(hasattr(s, '__no_such_method__'))
+    nose.tools.assert_raises(AttributeError, getattr, s, 'no_such_plugin')
+
+    nose.tools.assert_false(s._is_java_project)
+    nose.tools.assert_false(pickle.loads(pickle.dumps(s))._is_java_jni_project)
+
 def test_global_condition():
     s = SimState(arch="AMD64")
 
@@ -257,4 +284,5 @@ if __name__ == '__main__':
     test_state_merge_optimal_nostrongrefstate()
     test_state_merge_static()
     test_state_pickle()
+    test_state_plugin_access()
     test_global_condition()
@@ -0,0 +1,78 @@
+import nose
+
+from angr import StateHierarchy
+from angr.state_plugins.history import SimStateHistory
+
+
+class _Holder(object):
+    # most_mergeable only looks at the history of each state
+    def __init__(self, history):
+        self.history = history
+
+
+def _chain(parent, length):
+    h = parent
+    for _ in range(length):
+        h = SimStateHistory(parent=h)
+    return h
+
+
+def test_lowest_common_ancestor():
+    root = SimStateHistory()
+    fork = _chain(root, 5)
+    a = _chain(fork, 7)
+    b = _chain(fork, 3)
+    c = _chain(root, 2)
+    unrelated = _chain(SimStateHistory(), 3)
+
+    hierarchy = StateHierarchy()
+    for h in (a, b, c, unrelated):
+        hist = h
+        path = [ ]
+        while hist is not None:
+            path.append(hist)
+            hist = hist.parent
+        for hist in reversed(path):
+            hierarchy.add_history(hist)
+
+    nose.tools.assert_is(hierarchy.lowest_common_ancestor(a, b), fork)
+    nose.tools.assert_is(hierarchy.lowest_common_ancestor(a, c), root)
+    nose.tools.assert_is(hierarchy.lowest_common_ancestor(a, fork), fork)
+    nose.tools.assert_is(hierarchy.lowest_common_ancestor(a, a), a)
+    nose.tools.assert_is_none(hierarchy.lowest_common_ancestor(a, unrelated))
+    nose.tools.assert_equal(len(hierarchy.lineage(hierarchy.get_ref(a))), 12)
+
+
+def test_most_mergeable():
+    root = SimStateHistory()
+    fork = _chain(root, 4)
+    histories = [ _chain(fork, 6), _chain(fork, 2), _chain(root, 10) ]
+
+    # insert the histories out of order, so that the index has to be rebuilt
+    hierarchy = StateHierarchy()
+    for h in histories:
+        while h is not None:
+            hierarchy.add_history(h)
+            h = h.parent
+
+    states = [ _Holder(h) for h in histories ]
+    states.append(_Holder(SimStateHistory()))
+    mergeable, common, others = hierarchy.most_mergeable(states)
+    nose.tools.assert_equal(mergeable, states[:2])
+    nose.tools.assert_is(common, fork)
+    nose.tools.assert_equal(others, states[2:])
+
+    # once those are merged, the remaining states meet at the root
+    mergeable, common, others = hierarchy.most_mergeable(states[1:])
+    nose.tools.assert_equal(mergeable, states[1:3])
+    nose.tools.assert_is(common, root)
+
+    # nothing to merge
+    mergeable, common, others = hierarchy.most_mergeable(states[2:])
+    nose.tools.assert_equal(len(mergeable), 0)
+    nose.tools.assert_is_none(common)
+
+
+if __name__ == '__main__':
+    test_lowest_common_ancestor()
+    test_most_mergeable()
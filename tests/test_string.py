@@ -928,8 +928,42 @@ def test_strcmp():
     r = strcmp(s, arguments=[a_addr, b_addr])
     nose.tools.assert_equal(s.solver.eval_upto(r, 2), [0])
 
+def test_concrete_buffers():
+    s = SimState(arch="AMD64", mode="symbolic")
+    a_addr = s.solver.BVV(0x10000, 64)
+    b_addr = s.solver.BVV(0x20ff0, 64)
+    c_addr = s.solver.BVV(0x30000, 64)
+
+    # a long string that crosses a page boundary, longer than libc.max_str_len
+    long_str = b"A" * 0x300
+    s.memory.store(a_addr, long_str + b"\x00")
+    s.memory.store(b_addr, long_str + b"\x00")
+    s.memory.store(c_addr, long_str[:-1] + b"B\x00")
+
+    nose.tools.assert_equal(s.solver.eval_upto(strlen(s, arguments=[a_addr]), 2), [0x300])
+    nose.tools.assert_equal(s.solver.eval_upto(strcmp(s, arguments=[a_addr, b_addr]), 2), [0])
+    nose.tools.assert_equal(s.solver.eval_upto(strcmp(s, arguments=[a_addr, c_addr]), 2), [0xffffffffffffffff])
+    nose.tools.assert_equal(s.solver.eval_upto(strcmp(s, arguments=[c_addr, a_addr]), 2), [1])
+
+    # memcpy of a concrete buffer
+    dst_addr = s.solver.BVV(0x40000, 64)
+    memcpy(s, arguments=[dst_addr, c_addr, s.solver.BVV(0x301, 64)])
+    nose.tools.assert_equal(s.solver.eval(s.memory.load(dst_addr, 0x301), cast_to=bytes), long_str[:-1] + b"B\x00")
+
+    # a symbolic byte after the terminator does not get in the way
+    s.memory.store(0x50000, b"abc\x00")
+    s.memory.store(0x50004, s.solver.BVS('sym', 8))
+    nose.tools.assert_equal(s.solver.eval_upto(strlen(s, arguments=[s.solver.BVV(0x50000, 64)]), 2), [3])
+
+    # a symbolic byte before the terminator falls back to the symbolic implementation
+    s.memory.store(0x60000, b"ab")
+    s.memory.store(0x60002, s.solver.BVS('sym', 8))
+    s.memory.store(0x60003, b"d\x00")
+    nose.tools.assert_equal(sorted(s.solver.eval_upto(strlen(s, arguments=[s.solver.BVV(0x60000, 64)]), 3)), [2, 4])
+
 
 if __name__ == '__main__':
+    test_concrete_buffers()
     test_getc()
     test_inline_strcmp()
     test_scanf()
@@ -2,6 +2,7 @@ from __future__ import print_function
 import os
 import sys
 import logging
+import tempfile
 
 import nose
 import angr
@@ -170,6 +171,38 @@ def test_fauxware():
     nose.tools.assert_true('traced' in simgr.stashes)
 
 
+def test_block_trace():
+    addrs = [0x400000, 0x400010, 0x7f0000, 0x400010, 0x400020, 0x400010]
+
+    trace = angr.exploration_techniques.BlockTrace(addrs)
+    nose.tools.assert_equal(len(trace), 6)
+    nose.tools.assert_equal(trace[-1], 0x400010)
+    nose.tools.assert_equal(trace.index(0x400010), 1)
+    nose.tools.assert_equal(trace.index(0x400010, 2), 3)
+    nose.tools.assert_equal(trace.index(0x400010, 4), 5)
+    nose.tools.assert_equal(trace.count(0x400010), 3)
+    nose.tools.assert_raises(ValueError, trace.index, 0x400000, 1)
+    nose.tools.assert_raises(ValueError, trace.index, 0x400010, 2, 3)
+    nose.tools.assert_raises(ValueError, trace.index, 0x1234)
+
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        nose.tools.assert_equal(angr.exploration_techniques.BlockTrace.dump(iter(addrs), path, chunk_size=4), 6)
+        nose.tools.assert_equal(os.path.getsize(path), 6 * 8)
+
+        loaded = angr.exploration_techniques.BlockTrace.load(path)
+        nose.tools.assert_equal(list(loaded), addrs)
+        nose.tools.assert_equal(loaded[-1], 0x400010)
+        nose.tools.assert_equal(loaded.index(0x400020, 1), 4)
+        loaded.close()
+
+        t = angr.exploration_techniques.Tracer(trace=addrs)
+        nose.tools.assert_equal(t._trace.index(0x400020), 4)
+    finally:
+        os.remove(path)
+
+
 def run_all():
     def print_test_name(name):
         print('#' * (len(name) + 8))
@@ -50,6 +50,30 @@ def run_veritesting_b(arch):
         input_str = f.plugins['posix'].dumps(0)
         nose.tools.assert_equal(input_str.count(b'B'), 35)
 
+def test_veritesting_region_cache():
+    proj = angr.Project(os.path.join(location, 'x86_64', "veritesting_a"),
+                        load_options={'auto_load_libs': False},
+                        use_sim_procedures=True
+                        )
+    regions = proj.kb.veritesting_regions
+
+    ex = proj.factory.simulation_manager(veritesting=True)
+    ex.explore(find=addresses_veritesting_a['x86_64'])
+    nose.tools.assert_not_equal(len(ex.found), 0)
+    nose.tools.assert_greater(len(regions), 0)
+    # every region is recovered only once
+    nose.tools.assert_equal(regions.misses, len(regions))
+    misses, hits = regions.misses, regions.hits
+
+    # a second run on the same project reuses all regions
+    ex = proj.factory.simulation_manager(veritesting=True)
+    ex.explore(find=addresses_veritesting_a['x86_64'])
+    nose.tools.assert_not_equal(len(ex.found), 0)
+    nose.tools.assert_equal(regions.misses, misses)
+    nose.tools.assert_greater(regions.hits, hits)
+    for region in regions._regions.values():
+        nose.tools.assert_is_not_none(region.merge_points)
+
 def test_veritesting_a():
     # This is the most basic test
 
@@ -75,3 +99,4 @@ if __name__ == "__main__":
             test_func(arch_name)
         for test_func, arch_name in test_veritesting_b():
             test_func(arch_name)
+        test_veritesting_region_cache()
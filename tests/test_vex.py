@@ -4,6 +4,7 @@ import logging
 import pyvex
 import claripy
 
+import angr
 from angr import SimState, SimEngineVEX
 import angr.engines.vex.ccall as s_ccall
 
@@ -261,6 +262,64 @@ def test_loadg_no_constraint_creation():
     assert not state.solver.constraints
 
 
+def test_concrete_ccalls_match_symbolic():
+    s = SimState(arch="AMD64")
+    s_fast = SimState(arch="AMD64", add_options={angr.options.FAST_CONCRETE_OPS})
+    ops = s_ccall.data['AMD64']['OpTypes']
+    values = [ 0, 1, 2, 0x7f, 0x80, 0xff, 0x7fff, 0x8000, 0x7fffffff, 0x80000000, 0xffffffff, 0xffffffffffffffff ]
+
+    for op_name in ('G_CC_OP_ADDB', 'G_CC_OP_SUBW', 'G_CC_OP_SUBL', 'G_CC_OP_ADCL', 'G_CC_OP_SBBQ', 'G_CC_OP_LOGICQ',
+                    'G_CC_OP_INCB', 'G_CC_OP_DECL', 'G_CC_OP_SHLQ', 'G_CC_OP_SHRL', 'G_CC_OP_ROLW', 'G_CC_OP_RORQ',
+                    'G_CC_OP_UMULL', 'G_CC_OP_SMULB', 'G_CC_OP_COPY'):
+        for dep1 in values:
+            for dep2 in values[::3]:
+                args = (s.solver.BVV(ops[op_name], 64), s.solver.BVV(dep1, 64), s.solver.BVV(dep2, 64),
+                        s.solver.BVV(0x8d5, 64))
+                slow, _ = s_ccall.amd64g_calculate_rflags_all(s, *args)
+                fast, _ = s_ccall.amd64g_calculate_rflags_all(s_fast, *args)
+                nose.tools.assert_equal(fast.op, 'BVV')
+                nose.tools.assert_equal(s.solver.eval(slow), s_fast.solver.eval(fast))
+
+                for cond in range(16):
+                    cond = s.solver.BVV(cond, 64)
+                    slow, _ = s_ccall.amd64g_calculate_condition(s, cond, *args)
+                    fast, _ = s_ccall.amd64g_calculate_condition(s_fast, cond, *args)
+                    nose.tools.assert_equal(s.solver.eval(slow), s_fast.solver.eval(fast))
+
+    # symbolic operands fall back to the symbolic implementation
+    sym = s_fast.solver.BVS('dep1', 64)
+    r, _ = s_ccall.amd64g_calculate_rflags_all(s_fast, s.solver.BVV(ops['G_CC_OP_ADDQ'], 64), sym,
+                                               s.solver.BVV(1, 64), s.solver.BVV(0, 64))
+    nose.tools.assert_true(r.symbolic)
+
+def test_concrete_irops_match_symbolic():
+    from angr.engines.vex.irop import operations
+
+    values = [ 0, 1, 3, 0x7f, 0x80, 0xff, 0x1234, 0x8000, 0xffff, 0x7fffffff, 0x80000000, 0xffffffff,
+               0xffffffffffffffff ]
+    arg_sizes = {
+        'Iop_Add32': (32, 32), 'Iop_Sub64': (64, 64), 'Iop_Mul16': (16, 16), 'Iop_And8': (8, 8),
+        'Iop_Or64': (64, 64), 'Iop_Xor32': (32, 32), 'Iop_Not32': (32,), 'Iop_Shl64': (64, 8),
+        'Iop_Shr32': (32, 8), 'Iop_Sar32': (32, 8), 'Iop_Sar64': (64, 8), 'Iop_CmpEQ32': (32, 32),
+        'Iop_CmpNE64': (64, 64), 'Iop_CmpLT32S': (32, 32), 'Iop_CmpLE64U': (64, 64), 'Iop_8Uto32': (8,),
+        'Iop_16Sto64': (16,), 'Iop_64to32': (64,), 'Iop_64HIto32': (64,), 'Iop_32HLto64': (32, 32),
+        'Iop_1Uto64': (1,), 'Iop_CmpNEZ8': (8,),
+    }
+
+    for name, sizes in arg_sizes.items():
+        irop = operations[name]
+        nose.tools.assert_is_not_none(irop._concrete_calculate, name)
+        for a in values:
+            for b in values[::2]:
+                args = [ claripy.BVV(v & ((1 << size) - 1), size) for v, size in zip((a, b), sizes) ]
+                expected = irop.calculate(*args)
+                actual = irop.calculate_concrete(*args)
+                nose.tools.assert_equal(actual.size(), expected.size(), name)
+                nose.tools.assert_equal(actual.args[0], claripy.Solver().eval(expected, 1)[0], name)
+
+    # vector ops have no concrete implementation
+    nose.tools.assert_is_none(operations['Iop_Add32x4']._concrete_calculate)
+
 if __name__ == '__main__':
     g = globals().copy()
     for func_name, func in g.items():
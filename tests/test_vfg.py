@@ -159,6 +159,55 @@ def test_vfg_1():
     for arch in vfg_1_addresses:
         yield run_vfg_1, arch
 
+def run_vfg_function_summaries(arch):
+    proj = angr.Project(
+        os.path.join(os.path.join(test_location, arch), "fauxware"),
+        use_sim_procedures=True,
+    )
+
+    cfg = proj.analyses.CFGEmulated()
+    summaries = angr.analyses.vfg.FunctionSummaryCache()
+
+    vfg = proj.analyses.VFG(cfg, start=0x40071d, context_sensitivity_level=10, interfunction_level=10,
+                            record_function_final_states=True, function_summaries=summaries
+                            )
+    nose.tools.assert_greater(len(summaries), 0)
+    main_block_addresses = set(addr for addr in vfg_1_addresses[arch] if addr >= 0x40071d)
+    nose.tools.assert_true(main_block_addresses.issubset(set(n.addr for n in vfg.graph.nodes())))
+    final_states = set(vfg.function_final_states)
+
+    # the second analysis reuses the summaries of the first one, and still reaches the end of main
+    hits = summaries.hits
+    vfg = proj.analyses.VFG(cfg, start=0x40071d, context_sensitivity_level=10, interfunction_level=10,
+                            record_function_final_states=True, function_summaries=summaries
+                            )
+    nose.tools.assert_greater(summaries.hits, hits)
+    nose.tools.assert_true(main_block_addresses.issubset(set(n.addr for n in vfg.graph.nodes())))
+    # summarized calls still record the final states of their callees
+    nose.tools.assert_equal(set(vfg.function_final_states), final_states)
+
+def run_function_summary_keys(arch):
+    proj = angr.Project(os.path.join(os.path.join(test_location, arch), "fauxware"))
+    summaries = angr.analyses.vfg.FunctionSummaryCache()
+    state = proj.factory.blank_state()
+    state.regs.sp = 0x7fff0000
+    summaries.store(0x400664, state, state.copy())
+
+    # only summaries of the same function with the same stack pointer are tried
+    nose.tools.assert_is_not_none(summaries.lookup(0x400664, state.copy()))
+    nose.tools.assert_is_none(summaries.lookup(0x4006ed, state.copy()))
+    other = state.copy()
+    other.regs.sp = 0x7ffe0000
+    nose.tools.assert_is_none(summaries.lookup(0x400664, other))
+    nose.tools.assert_equal((summaries.hits, summaries.misses), (1, 2))
+
+def test_function_summary_keys():
+    yield run_function_summary_keys, "x86_64"
+
+def test_vfg_function_summaries():
+    for arch in vfg_1_addresses:
+        yield run_vfg_function_summaries, arch
+
 if __name__ == "__main__":
     # logging.getLogger("angr.state_plugins.abstract_memory").setLevel(logging.DEBUG)
     # logging.getLogger("angr.state_plugins.symbolic_memory").setLevel(logging.DEBUG)